@@ -3,7 +3,16 @@
 
 """ AVLWrapper
 """
-from .core import Case, Parameter, Session
+from .cache import ResultCache
+from .core import Case, CaseTable, Parameter, Session
+from .linear import LinearAeroModel
+from .modes import EigenmodeBatch, EigenmodeSession
+from .parallel import ParallelSession
+from .planner import AdaptiveAlphaSession
+from .results import ElementForces, ElementTable, ForceTable, StripForces
+from .vlm import VortexLatticeSession
+from .worker import Worker
+from .workspace import WorkspacePool
 from .geometry import Body, Control, DataAirfoil, Design, FileWrapper, FileAirfoil, Geometry, NacaAirfoil,\
     Point, ProfileDrag, Section, Symmetry, Spacing, Surface, Vector
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper content-addressed result cache
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+class ResultCache(object):
+    """Disk-backed cache of Session results. Entries are addressed by a hash of everything that determines the AVL
+    output: the solver and its executable, the result layout, the geometry input, the contents of external airfoil
+    files, the case inputs and the requested outputs. The total size of the cache is bounded, least recently used
+    entries are evicted first. A cache may be shared by sessions running in several threads."""
+    EXTENSION = '.pkl'
+
+    def __init__(self, directory=None, max_size=100 * 1024 ** 2):
+        if directory is None:
+            directory = os.path.join(tempfile.gettempdir(), 'avlwrapper_cache')
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.directory = directory
+        self.max_size = max_size  # in bytes
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # the lock cannot be pickled (e.g. to pool processes), every copy gets its own
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def get_key(session):
+        key = hashlib.sha1()
+        key.update("{0}\n".format(session.SOLVER).encode('utf-8'))
+
+        # results of different executables (e.g. AVL and the fakeavl.py stand-in) are never mixed up
+        executable = getattr(session, 'config', {}).get('avl_bin')
+        if executable is not None:
+            try:
+                modified = os.path.getmtime(executable)
+            except OSError:
+                modified = None
+            key.update("{0}:{1}\n".format(os.path.abspath(executable), modified).encode('utf-8'))
+        if getattr(session, 'as_arrays', False):
+            key.update("arrays\n".encode('utf-8'))  # columnar strip and element forces
+        key.update(session.geometry.create_input().encode('utf-8'))
+
+        current_dir = os.getcwd()
+        for airfoil in sorted(session.geometry.get_external_airfoil_names()):
+            with open(os.path.join(current_dir, airfoil), 'rb') as airfoil_file:
+                key.update(airfoil_file.read())
+
+        for case, case_input in zip(session.cases, session._get_case_inputs()):
+            key.update(case_input.encode('utf-8'))
+            for output, file_name in session._get_output_files(case):
+                key.update("{0}:{1}\n".format(output, file_name).encode('utf-8'))
+
+        return key.hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    @staticmethod
+    def _remove(path):
+        # an entry which is already gone (e.g. removed by another process) needs no removal
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        path = self._get_path(key)
+        with self._lock:
+            try:
+                with open(path, 'rb') as cache_file:
+                    results = pickle.load(cache_file)
+            except Exception:
+                # missing, truncated or foreign entries (any unpickling error) are a miss
+                self.misses += 1
+                return None
+
+            # mark entry as recently used, unless it was evicted in the mean time
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            self.hits += 1
+            return results
+
+    def put(self, key, results):
+        path = self._get_path(key)
+
+        # write to a temporary file first, so an interrupted write never leaves a corrupt entry behind
+        file_handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(file_handle, 'wb') as cache_file:
+            pickle.dump(results, cache_file, protocol=2)
+
+        with self._lock:
+            self._remove(path)
+            try:
+                os.rename(temp_path, path)
+            except OSError:
+                # another process stored the same entry in between (Windows does not replace on rename)
+                self._remove(temp_path)
+            self._evict()
+
+    def _get_entries(self):
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(self.EXTENSION):
+                path = os.path.join(self.directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # removed since the listing
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = sorted(self._get_entries())
+            total_size = sum(size for _, size, _ in entries)
+
+            # remove least recently used entries until the cache fits
+            for _, size, path in entries:
+                if total_size <= self.max_size:
+                    break
+                self._remove(path)
+                total_size -= size
+
+    @property
+    def size(self):
+        return sum(size for _, size, _ in self._get_entries())
+
+    @property
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._get_entries()), 'size': self.size}
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._get_entries():
+                self._remove(path)
+            self.hits = 0
+            self.misses = 0
@@ -8,7 +8,12 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
+import numpy as np
 from directories import DIRS
+from .results import ElementForces, ElementTable, ForceTable, StripForces
+from .workspace import get_workspace_pool, link_file
 
 try:
     import tkinter as tk  # Python 3
@@ -54,6 +59,9 @@ class Input(object):
 
 class Parameter(Input):
     """Parameter used in the case definition"""
+    # input line, shared with CaseTable
+    FORMAT = " {0:<12} -> {1:<12} = {2}\n"
+
     def __init__(self, name, value, constraint=None):
 
         self.name = name
@@ -66,18 +74,21 @@ class Parameter(Input):
             self.constraint = constraint
 
     def create_input(self):
-        return " {0:<12} -> {1:<12} = {2}\n".format(self.name, self.constraint, self.value)
+        return self.FORMAT.format(self.name, self.constraint, self.value)
 
 
 class State(Input):
     """State used in the case definition"""
+    # input line, shared with CaseTable
+    FORMAT = " {0:<10} = {1:<10} {2}\n"
+
     def __init__(self, name, value, unit=''):
         self.name = name
         self.value = value
         self.unit = unit
 
     def create_input(self):
-        return " {0:<10} = {1:<10} {2}\n".format(self.name, self.value, self.unit)
+        return self.FORMAT.format(self.name, self.value, self.unit)
 
 
 class Case(Input):
@@ -100,10 +111,12 @@ class Case(Input):
                    'Ixy': (0.0, 'kg-m^2'), 'Iyz': (0.0, 'kg-m^2'), 'Izx': (0.0, 'kg-m^2'),
                    'visc CL_a': (0.0, ''), 'visc CL_u': (0.0, ''), 'visc CM_a': (0.0, ''), 'visc CM_u': (0.0, '')}
 
-    def __init__(self, name, **kwargs):
+    def __init__(self, name, outputs=None, **kwargs):
 
         self.name = name
         self.number = 1
+        # outputs to write for this case (e.g. ['Totals']), None falls back to the outputs of the session
+        self.outputs = outputs
         self.parameters = self._set_default_parameters()
         self.states = self._set_default_states()
 
@@ -144,6 +157,11 @@ class Case(Input):
             if state.name not in self.CASE_STATES.keys():
                 raise InputError("Invalid state variable: {0}".format(state.name))
 
+        if self.outputs is not None:
+            for output in self.outputs:
+                if output not in Session.OUTPUTS.keys():
+                    raise InputError("Invalid output: {0}".format(output))
+
     def create_input(self):
         self._check()
 
@@ -160,39 +178,255 @@ class Case(Input):
         return case_str
 
 
+class CaseTable(object):
+    """Array-backed collection of run cases for large sweeps, a replacement of a list of Case objects. Only the
+    non-default values are stored, as one column per case parameter or state in a structured array. Keyword arguments
+    are those of Case (scalars are applied to every case), parameters can be constrained with constraints:
+
+        table = CaseTable(alpha=[0.0, 2.0, 4.0], velocity=12.0, elevator=[0.0, 0.0, 0.0],
+                          constraints={'elevator': 'Cm'})
+        table = CaseTable.from_grid(alpha=np.linspace(-5, 10, 16), beta=[0.0, 5.0], outputs=['Totals'])
+        session = ParallelSession(geometry=geometry, cases=table)
+
+    The case input of all cases is formatted in bulk. Integer indices return light-weight row views with the
+    attributes of a Case used by the sessions, slices return a new table which shares the data."""
+
+    SEPARATOR = " " + "-"*45
+
+    def __init__(self, names=None, outputs=None, constraints=None, **columns):
+        if not columns:
+            raise InputError("A case table needs at least one column.")
+
+        keys = list(columns.keys())
+        values = np.broadcast_arrays(*[np.atleast_1d(self._get_column(columns[key])) for key in keys])
+        if values[0].ndim != 1:
+            raise InputError("Case table columns should be scalars or 1D sequences.")
+
+        self.data = np.zeros(len(values[0]), dtype=[(key, column.dtype) for key, column in zip(keys, values)])
+        for key, column in zip(keys, values):
+            self.data[key] = column
+
+        self.names = list(names) if names is not None else ['case{0}'.format(idx) for idx in range(len(self.data))]
+        self.outputs = outputs
+        self.constraints = dict(constraints) if constraints is not None else dict()
+        self._check()
+
+    @classmethod
+    def from_grid(cls, outputs=None, constraints=None, **axes):
+        """Full factorial sweep: one case for every combination of the values of the axes, the last axis (in
+        alphabetical order) varies fastest"""
+        keys = sorted(axes.keys())
+        grids = np.meshgrid(*[np.atleast_1d(cls._get_column(axes[key])) for key in keys], indexing='ij')
+        return cls(outputs=outputs, constraints=constraints,
+                   **{key: grid.ravel() for key, grid in zip(keys, grids)})
+
+    @staticmethod
+    def _get_column(values):
+        # integer columns stay integer, such that their input is that of a Case with the same values (5, not 5.0)
+        values = np.asarray(values)
+        return values if values.dtype.kind in 'iu' else values.astype(float)
+
+    @classmethod
+    def _from_data(cls, data, names, outputs, constraints):
+        table = cls.__new__(cls)
+        table.data = data
+        table.names = names
+        table.outputs = outputs
+        table.constraints = constraints
+        return table
+
+    @property
+    def columns(self):
+        return list(self.data.dtype.names)
+
+    @property
+    def controls(self):
+        return [key for key in self.columns
+                if key not in Case.CASE_PARAMETERS.keys() and key not in Case.CASE_STATES.keys()]
+
+    def _check(self):
+        if len(self.names) != len(self.data):
+            raise InputError("Number of case names ({0}) does not match the number of cases ({1}).".format(
+                len(self.names), len(self.data)))
+
+        parameters = [Case.CASE_PARAMETERS.get(key, key) for key in self.columns
+                      if key in Case.CASE_PARAMETERS.keys() or key in self.controls]
+        for key, constraint in self.constraints.items():
+            if Case.CASE_PARAMETERS.get(key, key) not in parameters:
+                raise InputError("Constraint on a parameter which is not in the table: {0}.".format(key))
+            if constraint not in Case.VALID_CONSTRAINTS and constraint not in self.controls:
+                raise InputError("Invalid constraint on parameter: {0}.".format(key))
+
+        if self.outputs is not None:
+            for output in self.outputs:
+                if output not in Session.OUTPUTS.keys():
+                    raise InputError("Invalid output: {0}".format(output))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return (TableCase(self, idx) for idx in range(len(self.data)))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.data[key]
+        if isinstance(key, (int, np.integer)):
+            return TableCase(self, int(key) % len(self.data))
+        if isinstance(key, slice):
+            names = self.names[key]
+        else:
+            names = [self.names[idx] for idx in np.arange(len(self.data))[key]]
+        return self._from_data(self.data[key], names, self.outputs, self.constraints)
+
+    def _get_parameter_lines(self):
+        # (parameter name, constraint, column or None) in the order of Case.create_input()
+        parameter_keys = {name: key for key, name in Case.CASE_PARAMETERS.items() if key in self.columns}
+        lines = []
+        for _, name in Case.CASE_PARAMETERS.items():
+            key = parameter_keys.get(name)
+            lines.append((name, self.constraints.get(key, name) if key is not None else name, key))
+        for key in self.controls:
+            lines.append((key, self.constraints.get(key, key), key))
+        return lines
+
+    def create_inputs(self, start=1):
+        """Case inputs of all cases (numbered from start), in the format of Case.create_input()"""
+        n_cases = len(self.data)
+        columns = self.columns
+
+        # every case consists of the same lines, constant lines (default values) are formatted once
+        blocks = [["{0}\n Run case {1:<2}:  {2}\n\n".format(self.SEPARATOR, start + idx, name)
+                   for idx, name in enumerate(self.names)]]
+        constant = ""
+        for name, constraint, key in self._get_parameter_lines():
+            if key is None:
+                constant += Parameter(name=name, value=0.0, constraint=constraint).create_input()
+            else:
+                blocks.extend([[constant] * n_cases] if constant else [])
+                constant = ""
+                blocks.append([Parameter.FORMAT.format(name, constraint, value) for value in self.data[key].tolist()])
+        constant += "\n"
+        for name, (value, unit) in Case.CASE_STATES.items():
+            # as for a Case with a constrained Parameter, the state of a constrained column keeps its default
+            if name not in columns or name in self.constraints:
+                constant += State(name=name, value=value, unit=unit).create_input()
+            else:
+                blocks.extend([[constant] * n_cases] if constant else [])
+                constant = ""
+                blocks.append([State.FORMAT.format(name, value, unit) for value in self.data[name].tolist()])
+        if constant:
+            blocks.append([constant] * n_cases)
+
+        return [''.join(lines) for lines in zip(*blocks)]
+
+    def create_input(self, start=1):
+        return ''.join(self.create_inputs(start))
+
+    def to_cases(self):
+        """Equivalent list of Case objects"""
+        return [case.to_case() for case in self]
+
+
+class TableCase(object):
+    """Row view of a CaseTable, offers the attributes of a Case which are used by the sessions"""
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+        self.number = index + 1  # renumbered by the session, as a Case
+
+    @property
+    def name(self):
+        return self.table.names[self.index]
+
+    @property
+    def outputs(self):
+        return self.table.outputs
+
+    def create_input(self):
+        return self.table[self.index:self.index + 1].create_input(start=self.number)
+
+    def to_case(self):
+        kwargs = dict()
+        for key, value in zip(self.table.columns, self.table.data[self.index].tolist()):
+            if key in self.table.constraints:
+                name = Case.CASE_PARAMETERS.get(key, key)
+                kwargs[name] = Parameter(name=name, value=value, constraint=self.table.constraints[key])
+            else:
+                kwargs[key] = value
+        return Case(name=self.name, outputs=self.outputs, **kwargs)
+
+
 class Session(object):
     """Main class which handles AVL runs and input/output"""
     OUTPUTS = {'Totals': 'ft', 'SurfaceForces': 'fn', 'StripForces': 'fs', 'ElementForces': 'fe',
                'StabilityDerivatives': 'st', 'BodyAxisDerivatives': 'sb', 'HingeMoments': 'hm'}
 
-    def __init__(self, geometry, cases=None, run_keys=None):
+    # AVL is limited to 25 cases per case file
+    MAX_CASES = 25
+
+    # identifies the solver which produced the results, e.g. in cache keys
+    SOLVER = 'avl'
+
+    # interval [s] at which iter_results() checks for completed output files
+    POLL_INTERVAL = 0.002
+
+    def __init__(self, geometry, cases=None, run_keys=None, worker=None, cache=None, outputs=None, as_arrays=False):
         self._temp_dir = None
 
         # either run cases or an AVL command listing should be given
         if (cases is None) and (run_keys is None):
             raise InputError("Either cases or run keys should be provided.")
 
+        # a persistent worker only knows how to run cases
+        if (worker is not None) and (run_keys is not None):
+            raise InputError("Run keys cannot be used in combination with a worker.")
+
         self.config = self._read_config(os.path.join(__MODULE_DIR__, CONFIG_FILE))
 
+        # explicitly requested outputs (e.g. ['Totals']) overrule the outputs enabled in the config file
+        if outputs is not None:
+            for output in outputs:
+                if output not in self.OUTPUTS.keys():
+                    raise InputError("Invalid output: {0}".format(output))
+            self.config['output'] = list(outputs)
+
         self.geometry = geometry
         self.base_name = geometry.name
         self.cases = cases
         self.run_keys = run_keys
+        self.worker = worker
+        self.cache = cache
+        # strip and element forces as columnar StripForces and ElementForces containers instead of dicts of lists
+        self.as_arrays = as_arrays
 
         self._calculated = False
         self._results = None
 
+        self._init_background()
+
+    def _init_background(self):
+        # background analysis started by submit()
+        self._thread = None
+        self._finished = threading.Event()
+        self._error = None
+
     def __del__(self):
         if self._temp_dir is not None:
             self._temp_dir.cleanup()
 
     @property
     def temp_dir(self):
+        # a worker owns the directory in which its AVL process runs
+        if self.worker is not None:
+            return self.worker.temp_dir
         if self._temp_dir is None:
             self._create_temp_dir()
         return self._temp_dir
 
-    def _read_config(self, file):
+    @classmethod
+    def _read_config(cls, file):
         if __IS_PYTHON_3__:
             config = ConfigParser()
             config.read(file)
@@ -208,10 +442,13 @@ class Session(object):
                                    for key, value in parser.items(section)}
 
         settings = dict()
-        if config['environment']['executable'] != 'avl':
-            settings['avl_bin'] = self._check_bin(config['environment']['executable'])
+        if os.environ.get('AVL_EXECUTABLE'):
+            # e.g. to run the wrapper with a stand-in of AVL (fakeavl.py) without touching the config file
+            settings['avl_bin'] = cls._check_bin(os.environ['AVL_EXECUTABLE'])
+        elif config['environment']['executable'] != 'avl':
+            settings['avl_bin'] = cls._check_bin(config['environment']['executable'])
         else:
-            settings['avl_bin'] = self._check_bin(__EXE_DIR__)
+            settings['avl_bin'] = cls._check_bin(__EXE_DIR__)
 
         # show stdout of avl
         if config['environment']['printoutput'] == 'yes':
@@ -221,7 +458,7 @@ class Session(object):
 
         # Output files
         settings['output'] = []
-        for output in self.OUTPUTS.keys():
+        for output in cls.OUTPUTS.keys():
             if config['output'][output.lower()] == 'yes':
                 settings['output'].append(output)
 
@@ -251,7 +488,8 @@ class Session(object):
             raise FileNotFoundError('AVL not found or not executable, check {}'.format(__MODULE_DIR__ + os.sep + CONFIG_FILE))
 
     def _create_temp_dir(self):
-        self._temp_dir = TemporaryDirectory(prefix='avl_')
+        # borrow a (RAM-backed when available) scratch directory, cleanup() hands it back to the pool
+        self._temp_dir = get_workspace_pool().acquire()
 
     def _clean_temp_dir(self):
         self.temp_dir.cleanup()
@@ -265,55 +503,73 @@ class Session(object):
         airfoil_names = self.geometry.get_external_airfoil_names()
         current_dir = os.getcwd()
         for airfoil in airfoil_names:
-            shutil.copy(os.path.join(current_dir, airfoil), self.temp_dir.name)
+            link_file(os.path.join(current_dir, airfoil), self.temp_dir.name)
 
     def _write_cases(self):
         # AVL is limited to 25 cases
-        if len(self.cases) > 25:
-            raise InputError('Number of cases is larger than the supported maximum of 25.')
+        if len(self.cases) > self.MAX_CASES:
+            raise InputError('Number of cases is larger than the supported maximum of {0}, '
+                             'use a ParallelSession instead.'.format(self.MAX_CASES))
 
         self.case_file = self.base_name + '.case'
         with open(os.path.join(self.temp_dir.name, self.case_file), 'w') as case_file:
-            for idx, case in enumerate(self.cases):
-                case.number = idx + 1  # Case numbers start at 1
-                case_file.write(case.create_input())
+            case_file.write(''.join(self._get_case_inputs()))
+
+    def _get_case_inputs(self):
+        # input of every case, numbered as in the case file
+        if isinstance(self.cases, CaseTable):
+            return self.cases.create_inputs()
+
+        inputs = []
+        for idx, case in enumerate(self.cases):
+            case.number = idx + 1  # Case numbers start at 1
+            inputs.append(case.create_input())
+        return inputs
+
+    def _get_output_files(self, case):
+        # (output, file name) tuples in the order in which AVL writes them, only the outputs requested for the case
+        outputs = case.outputs if getattr(case, 'outputs', None) is not None else self.config['output']
+        return [(output, '{base}-{case}.{out}'.format(out=self.OUTPUTS[output],
+                                                      base=self.base_name,
+                                                      case=case.number))
+                for output in outputs]
+
+    def _get_case_run_keys(self):
+        # run and write the outputs of all cases from within the OPER menu
+        run = "oper\n"
+
+        for case in self.cases:
+            run += "{0}\nx\n".format(case.number)
+            for output, file_name in self._get_output_files(case):
+                run += "{out}\n{file}\n".format(out=self.OUTPUTS[output], file=file_name)
+
+        return run
 
     def _get_default_run_keys(self):
 
         run = "load {0}\n".format(self.model_file)
         run += "case {0}\n".format(self.case_file)
-        run += "oper\n"
-
-        for idx, _ in enumerate(self.cases):
-            case_id = idx + 1  # cases start at 1
-            run += "{0}\nx\n".format(case_id)
-            for output in self.config['output']:
-                ext = self.OUTPUTS[output]
-                run += "{out}\n{base}-{case}.{out}\n".format(out=ext,
-                                                             base=self.base_name,
-                                                             case=case_id)
-
+        run += self._get_case_run_keys()
         run += "\nquit\n"
 
         return run
 
-    def _read_results(self):
-
+    def _read_case_results(self, case):
         results = dict()
-        for case in self.cases:
-            results[case.name] = dict()
-            for output in self.config['output']:
-                ext = self.OUTPUTS[output]
-                file_name = '{base}-{case}.{out}'.format(out=ext,
-                                                         base=self.base_name,
-                                                         case=case.number)
-                reader = OutputReader(file_path=os.path.join(self.temp_dir.name, file_name))
-                results[case.name][output] = reader.get_content()
-
+        for output, file_name in self._get_output_files(case):
+            reader = OutputReader(file_path=os.path.join(self.temp_dir.name, file_name))
+            results[output] = reader.get_content(as_arrays=self.as_arrays)
         return results
 
+    def _read_results(self):
+        return {case.name: self._read_case_results(case) for case in self.cases}
+
     def _run_analysis(self):
 
+        if not self._calculated and self.worker is not None:
+            self.worker.run(self)
+            self._calculated = True
+
         if not self._calculated:
             self._write_geometry()
             self._copy_airfoils()
@@ -337,15 +593,165 @@ class Session(object):
                                     bufsize=0,  # Buffer size required for direct stdin/stdout access
                                     cwd=self.temp_dir.name)
 
+    def _compute_results(self):
+        if self.worker is not None:
+            # keep other sessions out of the shared worker directory until the results are read
+            with self.worker.lock:
+                self._run_analysis()
+                return self._read_results()
+
+        self._run_analysis()
+        return self._read_results()
+
+    def _get_results(self):
+        # results of sessions with run keys cannot be cached, their outputs are unknown
+        if self.cache is not None and self.cases is not None:
+            key = self.cache.get_key(self)
+            results = self.cache.get(key)
+            if results is None:
+                results = self._compute_results()
+                self.cache.put(key, results)
+        else:
+            results = self._compute_results()
+        return results
+
     def get_results(self):
+        if self._thread is not None:
+            return self.result()
+
         if self._results is None:
-            self._run_analysis()
-            self._results = self._read_results()
+            self._results = self._get_results()
+
+        return self._results
+
+    def iter_results(self):
+        """Generator which yields (case name, results) tuples in the order of the cases, every case as soon as AVL has
+        written its output files. Closing the generator early (e.g. breaking out of the loop) stops AVL. Once all
+        cases are read, the results are stored (and cached) as for get_results():
+
+            for name, results in session.iter_results():
+                if results['Totals']['CLtot'] > 1.0:
+                    break  # the remaining cases are not run
+        """
+        if self.run_keys is not None:
+            raise InputError("Results of sessions with run keys cannot be streamed.")
+
+        results = self._results
+        if results is None and self._thread is not None:
+            results = self.result()
+
+        key = None
+        if results is None and self.cache is not None and self.cases is not None:
+            key = self.cache.get_key(self)
+            results = self.cache.get(key)
+
+        if results is not None:
+            self._results = results
+            for name in self._get_case_names(results):
+                yield name, results[name]
+            return
+
+        results = dict()
+        for name, case_results in self._stream_results():
+            results[name] = case_results
+            yield name, case_results
+
+        self._results = results
+        if key is not None:
+            self.cache.put(key, results)
+
+    def _get_case_names(self, results):
+        return [case.name for case in self.cases]
+
+    def _stream_results(self):
+        # a worker runs all cases at once, as do sessions which have run already
+        if self.worker is not None or self._calculated:
+            results = self._compute_results()
+            for case in self.cases:
+                yield case.name, results[case.name]
+            return
+
+        self._write_geometry()
+        self._copy_airfoils()
+        self._write_cases()
+
+        # AVL writes the output files one after the other: the files of a case are complete once the first file of a
+        # later case exists, or once AVL has quit
+        output_files = [[os.path.join(self.temp_dir.name, file_name) for _, file_name in self._get_output_files(case)]
+                        for case in self.cases]
+        next_files = [next((files[0] for files in output_files[idx + 1:] if files), None)
+                      for idx in range(len(self.cases))]
+
+        process = self._get_avl_process()
+        try:
+            process.stdin.write(self._get_default_run_keys().encode())
+            process.stdin.close()
+
+            for case, next_file in zip(self.cases, next_files):
+                while process.poll() is None and not (next_file is not None and os.path.exists(next_file)):
+                    time.sleep(self.POLL_INTERVAL)
+                yield case.name, self._read_case_results(case)
+
+            process.wait()
+            self._calculated = True
+        finally:
+            # stopped early, or failed
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    def _run_in_background(self):
+        try:
+            self._results = self._get_results()
+        except Exception as error:
+            self._error = error
+        finally:
+            self._finished.set()
+
+    def submit(self):
+        """Starts the analysis in the background and returns immediately. The results are obtained with result(),
+        which waits for the analysis to finish. Returns the session itself, such that calls can be chained:
+
+            session = Session(geometry=geometry, cases=cases).submit()
+            ...  # do other work while AVL is running
+            results = session.result()
+        """
+        if self._thread is None and self._results is None:
+            self._finished.clear()
+            self._error = None
+            self._thread = threading.Thread(target=self._run_in_background)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def done(self):
+        if self._thread is None:
+            return self._results is not None
+        return self._finished.is_set()
+
+    def result(self, timeout=None):
+        """Waits at most timeout seconds (forever when None) for the results of a submitted analysis. Sessions which
+        were not submitted are submitted first."""
+        if self._thread is None and self._results is None:
+            self.submit()
+
+        if self._thread is not None:
+            if not self._finished.wait(timeout):
+                raise ResultTimeoutError("AVL analysis did not finish within {0} seconds.".format(timeout))
+            if self._error is not None:
+                raise self._error
 
         return self._results
 
     def reset(self):
-        self._temp_dir.cleanup()
+        # never remove the directory underneath a running analysis
+        if self._thread is not None:
+            self._finished.wait()
+        self._thread = None
+        self._error = None
+
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
         self._temp_dir = None
         self._results = None
         self._calculated = False
@@ -367,13 +773,35 @@ class Session(object):
 
 
 class OutputReader(object):
-    """Reads AVL output files. Filetype is determined based on file extension"""
+    """Reads AVL output files. Filetype is determined based on file extension. Table blocks (surface, strip and element
+    forces) are converted to NumPy arrays in one bulk conversion per table. By default the content is returned in the
+    dict-of-lists layout, use get_content(as_arrays=True) to obtain the table columns as NumPy arrays instead. Strip and
+    element forces are then returned as columnar StripForces and ElementForces containers, which are indexed in the
+    same way as the dict layout."""
+
+    # Patterns are compiled once and shared between all readers
+    VARS_PATTERN = re.compile(r'(\S+)\s+=\s+([-\dE.]+)')
+    VALUE_PATTERN = re.compile(r'([-\dE.]+)')
+    HEADER_SPLIT_PATTERN = re.compile(r'\s{2,}')
+    SURFACE_PATTERN = re.compile(r'Surface\s+#\s*\d+\s+(.*)')
+    STRIP_PATTERN = re.compile(r'Strip\s+#\s+(\d+)\s+')
+    SURFACE_HEADER_PATTERN = re.compile(r'(n\s+Area\s+CL)')
+    STRIP_HEADER_PATTERN = re.compile(r'(j\s+Yle\s+Chord)')
+    ELEMENT_HEADER_PATTERN = re.compile(r'(I\s+X\s+Y\s+Z)')
+    NAME_PATTERN = re.compile(r'(\D+)(?=\n)')
+    YDUP_PATTERN = re.compile(r'\(YDUP\)')
+    CONTROL_PATTERN = re.compile(r'(\S+)\s+(d\d+)')
+    CONTROL_KEY_PATTERN = re.compile(r'd\d+')
+    HINGE_PATTERN = re.compile(r'(\w+)\s+([-\dE.]+)')
+
     def __init__(self, file_path):
 
         self.path = file_path
         _, self.extension = os.path.splitext(file_path)
+        self._as_arrays = False
 
-    def get_content(self):
+    def get_content(self, as_arrays=False):
+        self._as_arrays = as_arrays
         with open(self.path, 'r') as file:
             content = file.readlines()
         if self.extension == '.ft':
@@ -395,25 +823,47 @@ class OutputReader(object):
             result = []
         return result
 
-    @staticmethod
-    def _get_vars(content):
+    @classmethod
+    def _get_vars(cls, content):
         # Search for "key = value" tuples in the content lines and store in a dictionary
         result = dict()
-        for name, value in re.findall('(\S+)\s+=\s+([-\dE.]+)',
-                                      ''.join(content)):
+        for name, value in cls.VARS_PATTERN.findall(''.join(content)):
             result[name] = float(value)
         return result
 
-    @staticmethod
-    def _extract_header(table_content):
+    @classmethod
+    def _extract_header(cls, table_content):
         # Get headers (might contain spaces, but no double spaces)
-        header = re.split('\s{2,}', table_content[0])
+        header = cls.HEADER_SPLIT_PATTERN.split(table_content[0])
         # remove starting and trailing spaces, empty strings and EOL
         header = list(filter(None, [s.strip() for s in header]))
         # ignore first column
         header = header[1:]
         return header
 
+    @classmethod
+    def _get_table(cls, data_lines):
+        # Convert all data lines of a table to a 2D array at once, the first (index) column is dropped
+        if len(data_lines) == 0:
+            return np.zeros((0, 0))
+        tokens = ' '.join(data_lines).split()
+        n_columns = len(data_lines[0].split())
+        try:
+            if n_columns * len(data_lines) != len(tokens):
+                raise ValueError
+            table = np.array(tokens, dtype=float).reshape(len(data_lines), n_columns)
+        except ValueError:
+            # irregular table (e.g. overflowing fields), fall back to parsing line by line, short rows are padded
+            rows = [cls._get_line_values(line) for line in data_lines]
+            table = np.full((len(rows), max(n_columns, max(len(row) for row in rows))), np.nan)
+            for idx, row in enumerate(rows):
+                table[idx, :len(row)] = row
+        return table[:, 1:]
+
+    def _get_surface_results(self, results):
+        # Columnar container, or its dict-of-lists view
+        return results if self._as_arrays else results.as_dict()
+
     def _read_totals(self, content):
         return self._get_vars(content)
 
@@ -422,7 +872,7 @@ class OutputReader(object):
         start_line, end_line = None, None
         for line_nr, line in enumerate(content):
             # Find start of table based on header
-            if re.search('(n\s+Area\s+CL)', line) is not None:
+            if self.SURFACE_HEADER_PATTERN.search(line) is not None:
                 start_line = line_nr
 
             # Find end of table based on the empty line
@@ -444,7 +894,7 @@ class OutputReader(object):
             # ignore first column
             line_data = line_data[1:]
 
-            name = re.findall('(\D+)(?=\n)', line)[0].strip()
+            name = self.NAME_PATTERN.findall(line)[0].strip()
 
             if len(line_data) != len(header):
                 raise ParseError("Incorrect table format in file {0}".format(self.path))
@@ -452,7 +902,7 @@ class OutputReader(object):
             # Create results dictionary
             # Combine surfaces labeled with (YDUP)
             if '(YDUP)' in name:
-                base_name = re.sub('\(YDUP\)', '', name).strip()
+                base_name = self.YDUP_PATTERN.sub('', name).strip()
                 base_data = surface_data[base_name]
                 surface_data[base_name] = {key: base_value + value
                                            for key, base_value, value in zip(header,
@@ -464,119 +914,120 @@ class OutputReader(object):
 
         return surface_data
 
-    def _read_strip_forces(self, content):
-
-        table_content = dict()
-        start_line, end_line, surface_name = None, None, None
+    def _find_tables(self, content, header_pattern, header_marker, reset_surface=True):
+        # Yields (surface name, strip number, table lines) for every table, the table ends at an empty line. Every
+        # table belongs to its own surface header, unless reset_surface is False (several tables per surface)
+        start_line, surface_name, strip_nr = None, None, None
         for line_nr, line in enumerate(content):
 
-            # Find surface name
-            match = re.search('Surface\s+#\s*\d+\s+(.*)', line)
-            if match is not None:
-                surface_name = match.group(1).strip()
+            # Cheap string checks first, the regular expressions only run on candidate lines
+            if 'Surface' in line:
+                match = self.SURFACE_PATTERN.search(line)
+                if match is not None:
+                    surface_name = match.group(1).strip()
+
+            if 'Strip' in line:
+                match = self.STRIP_PATTERN.search(line)
+                if match is not None:
+                    strip_nr = int(match.group(1).strip())
 
             # Find start of table based on header
-            if re.search('(j\s+Yle\s+Chord)', line) is not None:
+            if header_marker in line and header_pattern.search(line) is not None:
                 start_line = line_nr
 
             # Find end of table based on the empty line
             if start_line is not None and line.strip() == '':
-                end_line = line_nr
-
-                # Check if surface name is defined
-                if surface_name is None:
-                    raise ParseError("Unexpected file structure {0}".format(self.path))
+                yield surface_name, strip_nr, content[start_line:line_nr]
 
-                table_content[surface_name] = content[start_line:end_line]
+                # Reset start_line and number
+                start_line, strip_nr = None, None
+                if reset_surface:
+                    surface_name = None
 
-                # Reset start_line, end_line and name
-                start_line, end_line, surface_name = None, None, None
+    def _read_strip_forces(self, content):
 
-        strip_results = dict()
+        table_content = dict()
+        for surface_name, _, table in self._find_tables(content, self.STRIP_HEADER_PATTERN, 'Yle'):
+            # Check if surface name is defined
+            if surface_name is None:
+                raise ParseError("Unexpected file structure {0}".format(self.path))
+            table_content[surface_name] = table
 
+        strip_tables = dict()
         for name in sorted(table_content.keys()):  # sort so (YDUP) surfaces are always behind the main surface
             header = self._extract_header(table_content[name])
 
             # check for YDUP
             if '(YDUP)' in name:
-                result_name = re.sub('\(YDUP\)', '', name).strip()
+                result_name = self.YDUP_PATTERN.sub('', name).strip()
             else:
                 result_name = name
-                strip_results[result_name] = {key: [] for key in header}
+                strip_tables[result_name] = (header, [])
 
-            for data_line in table_content[name][1:-1]:
-                # Convert to floats
-                values = self._get_line_values(data_line)
-                # ignore first column
-                values = values[1:]
-                for key, value in zip(header, values):
-                    strip_results[result_name][key].append(value)
+            strip_tables[result_name][1].append(self._get_table(table_content[name][1:-1]))
 
-        return strip_results
+        strip_results = StripForces()
+        for name, (header, tables) in strip_tables.items():
+            tables = [table for table in tables if table.size > 0]
+            strip_results.surfaces[name] = ForceTable.from_rows(header, np.concatenate(tables, axis=0) if tables
+                                                                else np.zeros((0, len(header))))
 
-    @staticmethod
-    def _get_line_values(data_line):
-        values = [float(s) for s in re.findall('([-\dE.]+)', data_line)]
+        return self._get_surface_results(strip_results)
+
+    @classmethod
+    def _get_line_values(cls, data_line):
+        values = [float(s) for s in cls.VALUE_PATTERN.findall(data_line)]
         return values
 
     def _read_element_forces(self, content):
 
         data_tables = dict()
-        start_line, end_line, surface_name, strip_nr = None, None, None, None
-        for line_nr, line in enumerate(content):
-
-            # Find surface name
-            match = re.search('Surface\s+#\s*\d+\s+(.*)', line)
-            if match is not None:
-                surface_name = match.group(1).strip()
-                data_tables[surface_name] = dict()
-
-            # Find strip number
-            match = re.search('Strip\s+#\s+(\d+)\s+', line)
-            if match is not None:
-                strip_nr = int(match.group(1).strip())
-
-            # Find start of table based on header
-            if re.search('(I\s+X\s+Y\s+Z)', line) is not None:
-                start_line = line_nr
-
-            # Find end of table based on the empty line
-            if start_line is not None and line.strip() == '':
-                end_line = line_nr
-
-                # Check if surface name is defined
-                if surface_name is None:
-                    raise ParseError("Unexpected file structure {0}".format(self.path))
-                # Check if strip number is defined
-                if strip_nr is None:
-                    raise ParseError("Unexpected file structure {0}".format(self.path))
-
-                data_tables[surface_name][strip_nr] = content[start_line:end_line]
-
-                # Reset start_line, end_line and number
-                start_line, end_line, strip_nr = None, None, None
-
-        element_results = dict()
-        for name in sorted(data_tables.keys()): # sort so (YDUP) surfaces are always behind the main surface
+        for surface_name, strip_nr, table in self._find_tables(content, self.ELEMENT_HEADER_PATTERN, 'I',
+                                                                 reset_surface=False):
+            # Check if surface name is defined
+            if surface_name is None:
+                raise ParseError("Unexpected file structure {0}".format(self.path))
+            # Check if strip number is defined
+            if strip_nr is None:
+                raise ParseError("Unexpected file structure {0}".format(self.path))
+
+            data_tables.setdefault(surface_name, dict())[strip_nr] = table
+
+        # All element tables share the same columns, convert them in a single conversion and split afterwards
+        blocks = [(name, strip, data_tables[name][strip]) for name in sorted(data_tables.keys())
+                  for strip in sorted(data_tables[name].keys())]
+        try:
+            all_values = self._get_table([line for _, _, table in blocks for line in table[1:]])
+        except ValueError:
+            all_values = np.zeros((0, 0))
+
+        strip_tables = dict()
+        row = 0
+        for name, strip, table in blocks:  # sorted so (YDUP) surfaces are always behind the main surface
 
             # check for YDUP
             if '(YDUP)' in name:
-                result_name = re.sub('\(YDUP\)', '', name).strip()
+                result_name = self.YDUP_PATTERN.sub('', name).strip()
             else:
                 result_name = name
-                element_results[result_name] = dict()
+                strip_tables.setdefault(result_name, (self._extract_header(table), []))
 
-            for strip in data_tables[name].keys():
-                header = self._extract_header(data_tables[name][strip])
-                element_results[result_name][strip] = {key: [] for key in header}
-                for data_line in data_tables[name][strip][1:]:
-                    values = self._get_line_values(data_line)
-                    # ignore first column
-                    values = values[1:]
-                    for key, value in zip(header, values):
-                        element_results[result_name][strip][key].append(value)
+            header = strip_tables[result_name][0]
+            n_rows = len(table) - 1
+            if all_values.ndim == 2 and all_values.shape[1] == len(header) and len(all_values) >= row + n_rows:
+                values = all_values[row:row + n_rows]
+            else:
+                values = self._get_table(table[1:])
+            if values.size == 0:
+                values = np.zeros((0, len(header)))
+            row += n_rows
+            strip_tables[result_name][1].append((strip, values))
 
-        return element_results
+        # the elements of a surface are stored contiguously, ordered by strip
+        element_results = ElementForces({name: ElementTable.from_strips(header, tables)
+                                         for name, (header, tables) in strip_tables.items()})
+
+        return self._get_surface_results(element_results)
 
     def _read_stability_derivatives(self, content):
 
@@ -590,16 +1041,16 @@ class OutputReader(object):
 
         return all_vars
 
-    @staticmethod
-    def _get_controls(content):
-        return {number: name for (name, number) in re.findall('(\S+)\s+(d\d+)', ''.join(content))}
+    @classmethod
+    def _get_controls(cls, content):
+        return {number: name for (name, number) in cls.CONTROL_PATTERN.findall(''.join(content))}
 
-    @staticmethod
-    def _replace_controls(var_dict, controls):
+    @classmethod
+    def _replace_controls(cls, var_dict, controls):
         # replace d# with control name
         new_dict = var_dict.copy()
         for key in var_dict.keys():
-            match = re.search('d\d+', key)
+            match = cls.CONTROL_KEY_PATTERN.search(key)
             if match is not None:
                 d = match.group(0)
                 name = controls[d]
@@ -618,11 +1069,11 @@ class OutputReader(object):
 
         return all_vars
 
-    @staticmethod
-    def _read_hinge_moments(content):
+    @classmethod
+    def _read_hinge_moments(cls, content):
         results = dict()
         for line in content:
-            match = re.search('(\w+)\s+([-\dE.]+)', line)
+            match = cls.HINGE_PATTERN.search(line)
             if match is not None:
                 results[match.group(1)] = float(match.group(2))
         return results
@@ -660,3 +1111,7 @@ class InputError(Exception):
 
 class ParseError(Exception):
     pass
+
+
+class ResultTimeoutError(Exception):
+    pass
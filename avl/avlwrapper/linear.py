@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper linearized aerodynamic model
+"""
+import numpy as np
+
+from .core import Case, InputError, Session
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+class LinearAeroModel(object):
+    """First-order model of the stability-axis force and moment coefficients, built from the totals and stability
+    derivatives of one or a few AVL cases (the reference points). A query is evaluated about the reference point
+    with the nearest angle of attack:
+
+        C = C_ref + dC/dalpha * (alpha - alpha_ref) + ... + dC/d(control) * (control - control_ref)
+
+        model = LinearAeroModel.from_geometry(geometry, alphas=[0.0, 5.0], velocity=12.0, X_cg=0.1)
+        model.predict(alpha=np.linspace(-2, 8, 1000), elevator=-1.0)  # {'CL': array, 'Cm': array, ...}
+
+    Angles and control deflections are in degrees, the rates are the non-dimensional stability-axis rates. Queries
+    are evaluated in bulk with array operations, without running AVL."""
+
+    COEFFICIENTS = ('CL', 'CY', 'Cl', 'Cm', 'Cn')
+    # state variables, with the suffix of the derivative names and the scale to the derivative unit
+    STATES = (('alpha', 'a', np.pi / 180.0), ('beta', 'b', np.pi / 180.0),
+              ('pb/2V', 'p', 1.0), ('qc/2V', 'q', 1.0), ('rb/2V', 'r', 1.0))
+    # names in the Totals output, the stability-axis values first
+    TOTALS = {'CL': ('CLtot',), 'CY': ('CYtot',), 'Cl': ("Cl'tot", 'Cltot'), 'Cm': ('Cmtot',),
+              'Cn': ("Cn'tot", 'Cntot'), 'alpha': ('Alpha',), 'beta': ('Beta',),
+              'pb/2V': ("p'b/2V", 'pb/2V'), 'qc/2V': ('qc/2V',), 'rb/2V': ("r'b/2V", 'rb/2V')}
+    OUTPUTS = ['Totals', 'StabilityDerivatives']
+
+    def __init__(self, variables, references, values, derivatives):
+        self.variables = list(variables)
+        self.references = np.atleast_2d(np.asarray(references, dtype=float))  # (points x variables)
+        self.values = np.atleast_2d(np.asarray(values, dtype=float))  # (points x coefficients)
+        self.derivatives = np.asarray(derivatives, dtype=float).reshape(
+            len(self.references), len(self.COEFFICIENTS), len(self.variables))  # per variable unit
+        self._index = {variable: idx for idx, variable in enumerate(self.variables)}
+
+        # sorted by angle of attack, to look up the nearest reference point by bisection
+        order = np.argsort(self.references[:, 0])
+        self.references = self.references[order]
+        self.values = self.values[order]
+        self.derivatives = self.derivatives[order]
+
+    @staticmethod
+    def _get_value(results, names):
+        for name in names:
+            if name in results:
+                return results[name]
+        raise InputError("The AVL results do not contain {0}.".format(" or ".join(names)))
+
+    @classmethod
+    def from_results(cls, results, controls=None):
+        """Builds the model from the results of one or more cases ({case name: {output: values}}), which should
+        contain the 'Totals' and 'StabilityDerivatives' outputs. Controls which are not given are taken from the
+        derivatives of the first case."""
+        cases = [results[name] for name in sorted(results)]
+        if not cases or any(output not in case for case in cases for output in cls.OUTPUTS):
+            raise InputError("The linear model requires the {0} outputs of at least one case.".format(cls.OUTPUTS))
+
+        # derivative names without the primes of the stability axes, e.g. "Cl'a" -> "Cla"
+        derivatives = [{key.replace("'", ''): value for key, value in case['StabilityDerivatives'].items()}
+                       for case in cases]
+        if controls is None:
+            controls = sorted(key[2:] for key in derivatives[0] if key.startswith('CL') and
+                              key[2:] not in ('a', 'b', 'p', 'q', 'r', 'tot', 'ff') and key[2:] in cases[0]['Totals'])
+        states = list(cls.STATES) + [(control, control, 1.0) for control in controls]
+
+        references, values, gradients = [], [], []
+        for case, case_derivatives in zip(cases, derivatives):
+            totals = case['Totals']
+            references.append([cls._get_value(totals, cls.TOTALS.get(name, (name,))) for name, _, _ in states])
+            values.append([cls._get_value(totals, cls.TOTALS[coefficient]) for coefficient in cls.COEFFICIENTS])
+            # missing derivatives (e.g. rates which are not written) are taken as zero
+            gradients.append([[case_derivatives.get(coefficient + suffix, 0.0) * scale for _, suffix, scale in states]
+                              for coefficient in cls.COEFFICIENTS])
+
+        return cls([name for name, _, _ in states], references, values, gradients)
+
+    @classmethod
+    def from_geometry(cls, geometry, alphas=(0.0,), session_class=Session, cache=None, **states):
+        """Runs AVL at the reference angles of attack and builds the model. Other keyword arguments are applied to
+        every case (e.g. velocity, X_cg or control deflections)."""
+        cases = [Case(name='reference%s' % idx, alpha=float(alpha), outputs=cls.OUTPUTS, **states)
+                 for idx, alpha in enumerate(alphas)]
+        session = session_class(geometry=geometry, cases=cases, cache=cache)
+        try:
+            results = session.get_results()
+        finally:
+            session.reset()
+        return cls.from_results(results)
+
+    @property
+    def controls(self):
+        return self.variables[len(self.STATES):]
+
+    def _get_reference(self, alpha):
+        # index of the reference point with the nearest angle of attack
+        alphas = self.references[:, 0]
+        if len(alphas) == 1:
+            return np.zeros(np.shape(alpha), dtype=int)
+        midpoints = 0.5 * (alphas[1:] + alphas[:-1])
+        return np.searchsorted(midpoints, alpha)
+
+    def predict(self, **queries):
+        """Evaluates the coefficients at the query points, given as keyword arguments with scalar or array values
+        (which are broadcast against each other). Variables which are not given are at their reference value.
+
+        :return: Dictionary with an array per coefficient in COEFFICIENTS
+        :rtype: dict
+        """
+        unknown = set(queries) - set(self.variables)
+        if unknown:
+            raise InputError("Unknown variables: {0}, available: {1}.".format(sorted(unknown), self.variables))
+
+        arrays = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in queries.values()]) \
+            if queries else []
+        shape = arrays[0].shape if arrays else ()
+        columns = dict(zip(queries.keys(), [array.ravel() for array in arrays]))
+
+        size = int(np.prod(shape))
+        points = self._get_reference(columns['alpha']) if 'alpha' in columns else np.zeros(size, dtype=int)
+        references = self.references[points]  # (queries x variables)
+        deltas = np.zeros_like(references)
+        for name, column in columns.items():
+            idx = self._index[name]
+            deltas[:, idx] = column - references[:, idx]
+
+        coefficients = self.values[points] + np.einsum('ncv,nv->nc', self.derivatives[points], deltas)
+        return {name: coefficients[:, idx].reshape(shape) for idx, name in enumerate(self.COEFFICIENTS)}
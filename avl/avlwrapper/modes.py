@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper eigenmode (dynamic stability) analyses
+"""
+import multiprocessing
+import os
+
+import numpy as np
+
+from .core import CaseTable, InputError, ParseError, Session
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+class EigenmodeSession(Session):
+    """Session which, after running the cases in the OPER menu, computes the eigenmodes of every case in the MODE menu
+    of AVL and writes the eigenvalues to a file. The eigenmodes follow from the mass, inertia and C.G. states of the
+    cases (which default to unity), these should thus be given:
+
+        case = Case(name='cruise', alpha=Parameter(name='alpha', constraint='CL', value=0.6), velocity=14.0,
+                    mass=5.0, X_cg=0.1, Ixx=0.8, Iyy=0.6, Izz=1.3)
+        session = EigenmodeSession(geometry=geometry, cases=[case])
+        results = session.get_results()  # {'cruise': {'Totals': {...}, 'Eigenvalues': complex array}}
+
+    The eigenvalues [1/s] of every case are sorted by imaginary and then real part."""
+
+    SOLVER = 'avl-modes'
+    EIGENVALUE_FILE = 'eigenvalues.eig'
+
+    def __init__(self, geometry, cases, cache=None, outputs=None, as_arrays=False):
+        super(EigenmodeSession, self).__init__(geometry=geometry, cases=cases, cache=cache,
+                                               outputs=outputs if outputs is not None else ['Totals'],
+                                               as_arrays=as_arrays)
+
+    def _get_case_run_keys(self):
+        # select and solve every case in the MODE menu, then write the eigenvalues of all cases at once
+        run = super(EigenmodeSession, self)._get_case_run_keys()
+        run += "\nmode\n"
+        for case in self.cases:
+            run += "{0}\nn\n".format(case.number)
+        run += "w\n{0}\n\n".format(self.EIGENVALUE_FILE)
+        return run
+
+    def _read_eigenvalues(self):
+        # eigenvalue file lines: case number, real part, imaginary part; comment lines start with '#'
+        eigenvalues = {case.number: [] for case in self.cases}
+        file_path = os.path.join(self.temp_dir.name, self.EIGENVALUE_FILE)
+        try:
+            with open(file_path, 'r') as eigenvalue_file:
+                for line in eigenvalue_file:
+                    values = line.split()
+                    if not values or line.lstrip().startswith('#'):
+                        continue
+                    eigenvalues.setdefault(int(values[0]), []).append(complex(float(values[1]), float(values[2])))
+        except (IOError, OSError, ValueError, IndexError):
+            raise ParseError("Unable to read the eigenvalues in {0}".format(file_path))
+        return {number: np.array(sorted(values, key=lambda value: (value.imag, value.real)), dtype=complex)
+                for number, values in eigenvalues.items()}
+
+    def _read_results(self):
+        eigenvalues = self._read_eigenvalues()
+        results = dict()
+        for case in self.cases:
+            results[case.name] = self._read_case_results(case)
+            results[case.name]['Eigenvalues'] = eigenvalues[case.number]
+        return results
+
+    def _stream_results(self):
+        # the eigenvalues are written after all cases are run
+        results = self._compute_results()
+        for case in self.cases:
+            yield case.name, results[case.name]
+
+
+def _run_modes(arguments):
+    # Module level function, such that it can be pickled and send to the pool processes
+    geometry, cases, outputs, as_arrays = arguments
+    session = EigenmodeSession(geometry=geometry, cases=cases, outputs=outputs, as_arrays=as_arrays)
+    try:
+        return session.get_results()
+    finally:
+        session.reset()
+
+
+class EigenmodeBatch(object):
+    """Eigenmode analyses of many configurations (e.g. every design of a sweep), every configuration is a
+    (geometry, cases) tuple with at most 25 cases. The configurations are solved by separate AVL processes on a process
+    pool. Results are looked up in and stored to the cache per configuration, i.e. by the hash of the geometry and
+    cases, such that only new configurations are solved:
+
+        batch = EigenmodeBatch([(geometry_a, cases), (geometry_b, cases)], cache=ResultCache())
+        eigenvalues = batch.get_eigenvalues()  # (configurations x cases x modes) complex array
+        stable = batch.is_stable()  # (configurations x cases) boolean array
+    """
+
+    def __init__(self, configurations, processes=None, cache=None, outputs=None, as_arrays=False):
+        self.configurations = [(geometry, cases.to_cases() if isinstance(cases, CaseTable) else list(cases))
+                               for geometry, cases in configurations]
+        if any(len(cases) > Session.MAX_CASES for _, cases in self.configurations):
+            raise InputError("Configurations are limited to {0} cases.".format(Session.MAX_CASES))
+
+        self.processes = processes if processes is not None else multiprocessing.cpu_count()
+        self.cache = cache
+        self.outputs = outputs
+        self.as_arrays = as_arrays
+        self._results = None
+
+    def _get_session(self, geometry, cases):
+        return EigenmodeSession(geometry=geometry, cases=cases, outputs=self.outputs, as_arrays=self.as_arrays)
+
+    def _compute_results(self):
+        results = [None] * len(self.configurations)
+        keys = [None] * len(self.configurations)
+        if self.cache is not None:
+            for idx, (geometry, cases) in enumerate(self.configurations):
+                keys[idx] = self.cache.get_key(self._get_session(geometry, cases))
+                results[idx] = self.cache.get(keys[idx])
+
+        missing = [idx for idx, result in enumerate(results) if result is None]
+        arguments = [self.configurations[idx] + (self.outputs, self.as_arrays) for idx in missing]
+
+        if len(arguments) <= 1 or self.processes == 1:
+            computed = [_run_modes(argument) for argument in arguments]
+        else:
+            pool = multiprocessing.Pool(processes=min(self.processes, len(arguments)))
+            try:
+                computed = pool.map(_run_modes, arguments)
+            finally:
+                pool.close()
+                pool.join()
+
+        for idx, result in zip(missing, computed):
+            results[idx] = result
+            if self.cache is not None:
+                self.cache.put(keys[idx], result)
+        return results
+
+    def get_results(self):
+        """Results per configuration, each in the layout of EigenmodeSession.get_results()
+
+        :rtype: list
+        """
+        if self._results is None:
+            self._results = self._compute_results()
+        return self._results
+
+    def get_eigenvalues(self):
+        """Eigenvalues of all configurations and cases as one complex array, padded with NaN where a case has fewer
+        modes than the largest number of modes
+
+        :rtype: numpy.ndarray
+        """
+        eigenvalues = [[results[case.name]['Eigenvalues'] for case in cases]
+                       for results, (_, cases) in zip(self.get_results(), self.configurations)]
+        n_cases = max([len(cases) for cases in eigenvalues] + [0])
+        n_modes = max([len(values) for cases in eigenvalues for values in cases] + [0])
+
+        array = np.full((len(eigenvalues), n_cases, n_modes), np.nan, dtype=complex)
+        for i, cases in enumerate(eigenvalues):
+            for j, values in enumerate(cases):
+                array[i, j, :len(values)] = values
+        return array
+
+    def is_stable(self):
+        """Dynamically stable when all eigenvalues have a negative real part, False for missing cases
+
+        :rtype: numpy.ndarray
+        """
+        eigenvalues = self.get_eigenvalues()
+        real = np.where(np.isnan(eigenvalues.real), -np.inf, eigenvalues.real)
+        return np.all(real < 0.0, axis=2) & np.any(~np.isnan(eigenvalues.real), axis=2)
+
+    def reset(self):
+        self._results = None
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper parallel case sharding
+"""
+import math
+import multiprocessing
+
+from .core import InputError, Session
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+def _run_chunk(arguments):
+    # Module level function, such that it can be pickled and send to the pool processes
+    geometry, cases, config, as_arrays = arguments
+    session = Session(geometry=geometry, cases=cases, as_arrays=as_arrays)
+    session.config = config
+    try:
+        return session.get_results()
+    finally:
+        session.reset()
+
+
+class ParallelSession(Session):
+    """Session which splits any number of cases in chunks of at most 25 cases (the AVL limit), runs every chunk in a
+    separate AVL process and temporary directory on a process pool and merges the results. The merged results have the
+    same layout as those of Session.get_results()."""
+
+    def __init__(self, geometry, cases, processes=None, chunk_size=None, cache=None, outputs=None, as_arrays=False):
+        super(ParallelSession, self).__init__(geometry=geometry, cases=cases, cache=cache, outputs=outputs,
+                                              as_arrays=as_arrays)
+
+        names = [case.name for case in cases]
+        if len(set(names)) != len(names):
+            raise InputError("Case names should be unique to be able to merge the results.")
+
+        self.processes = processes if processes is not None else multiprocessing.cpu_count()
+
+        # by default, spread the cases evenly over the available processes
+        if chunk_size is None:
+            chunk_size = int(math.ceil(len(cases) / float(self.processes)))
+        self.chunk_size = max(1, min(chunk_size, self.MAX_CASES))
+
+    def get_chunks(self):
+        return [self.cases[idx:idx + self.chunk_size] for idx in range(0, len(self.cases), self.chunk_size)]
+
+    def _compute_results(self):
+        arguments = [(self.geometry, chunk, self.config, self.as_arrays) for chunk in self.get_chunks()]
+
+        if len(arguments) == 1 or self.processes == 1:
+            chunk_results = [_run_chunk(argument) for argument in arguments]
+        else:
+            pool = multiprocessing.Pool(processes=min(self.processes, len(arguments)))
+            try:
+                chunk_results = pool.map(_run_chunk, arguments)
+            finally:
+                pool.close()
+                pool.join()
+
+        results = dict()
+        for chunk_result in chunk_results:
+            results.update(chunk_result)
+        return results
+
+    def _stream_results(self):
+        # the results of every chunk are yielded as soon as the chunk (and the chunks before it) are done
+        chunks = self.get_chunks()
+        arguments = [(self.geometry, chunk, self.config, self.as_arrays) for chunk in chunks]
+
+        if len(arguments) == 1 or self.processes == 1:
+            for chunk, argument in zip(chunks, arguments):
+                chunk_result = _run_chunk(argument)
+                for case in chunk:
+                    yield case.name, chunk_result[case.name]
+            return
+
+        pool = multiprocessing.Pool(processes=min(self.processes, len(arguments)))
+        try:
+            for chunk, chunk_result in zip(chunks, pool.imap(_run_chunk, arguments)):
+                for case in chunk:
+                    yield case.name, chunk_result[case.name]
+        finally:
+            # stopped early, or failed
+            pool.terminate()
+            pool.join()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper adaptive angle of attack sweeps
+"""
+from .core import Case, InputError, Session
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+class AdaptiveAlphaSession(Session):
+    """Session which plans its own angle of attack cases for the linear aerodynamic quantities (lift curve slope and
+    the moment at a target lift coefficient). Instead of a fixed sweep, the ends and the middle of the alpha range are
+    solved first. Intervals are bisected where the lift curve bends, and cases are added near the alpha of the target
+    lift coefficient until it is met within cl_tolerance. Every round is solved by one inner session (of session_class,
+    e.g. VortexLatticeSession), all inner sessions share the cache.
+
+        session = AdaptiveAlphaSession(geometry=geometry, target_cl=0.8, velocity=12.0, X_cg=0.1)
+        results = session.get_results()  # {'alpha0': {'Totals': {...}}, ...}, ordered by angle of attack
+
+    Only the 'Totals' output is needed to plan the cases, other outputs are written when requested with outputs.
+    Keyword arguments other than those below are applied to every case (e.g. velocity and X_cg)."""
+
+    def __init__(self, geometry, target_cl=None, alpha_range=(-10.0, 20.0), tolerance=0.05, cl_tolerance=0.005,
+                 min_step=0.5, max_cases=Session.MAX_CASES, session_class=Session, cache=None, outputs=('Totals',),
+                 **case_states):
+        if alpha_range[0] >= alpha_range[1]:
+            raise InputError("Invalid alpha range: {0}.".format(alpha_range))
+        if max_cases < 3:
+            raise InputError("At least 3 cases are required to check the linearity of the lift curve.")
+
+        # the configuration and scratch directories are those of the inner sessions
+        self._temp_dir = None
+        self.config = {'output': list(outputs) if outputs is not None else ['Totals']}
+        self.geometry = geometry
+        self.base_name = geometry.name
+        self.cases = None
+        self.run_keys = None
+        self.worker = None
+        self.cache = cache
+
+        self.target_cl = target_cl
+        self.alpha_range = (float(alpha_range[0]), float(alpha_range[1]))
+        self.tolerance = tolerance  # absolute deviation of the lift coefficient from a straight line
+        self.cl_tolerance = cl_tolerance  # absolute difference to the target lift coefficient
+        self.min_step = min_step  # smallest interval [deg] which is bisected
+        self.max_cases = max_cases
+        self.session_class = session_class
+        self.outputs = list(outputs) if outputs is not None else None  # None writes the outputs of config.cfg
+        self.case_states = case_states
+
+        # planning statistics, e.g. to compare with a fixed sweep
+        self.alphas = []
+        self.rounds = 0
+
+        self._calculated = False
+        self._results = None
+
+        self._init_background()
+
+    def _get_cases(self, alphas):
+        return [Case(name='alpha%s' % idx, alpha=alpha, outputs=self.outputs, **self.case_states)
+                for idx, alpha in enumerate(alphas)]
+
+    def _solve(self, alphas, solved):
+        # one inner session per round, the results are stored by angle of attack
+        cases = self._get_cases(alphas)
+        session = self.session_class(geometry=self.geometry, cases=cases, cache=self.cache)
+        try:
+            results = session.get_results()
+        finally:
+            session.reset()
+
+        for alpha, case in zip(alphas, cases):
+            solved[alpha] = results[case.name]
+        self.rounds += 1
+
+    @staticmethod
+    def _lift(results):
+        return results['Totals']['CLtot']
+
+    def _get_bends(self, alphas, lifts):
+        # alphas halfway the intervals on either side of a point which deviates from the line through its neighbours
+        intervals = set()
+        for i in range(1, len(alphas) - 1):
+            fraction = (alphas[i] - alphas[i - 1]) / (alphas[i + 1] - alphas[i - 1])
+            interpolated = lifts[i - 1] + fraction * (lifts[i + 1] - lifts[i - 1])
+            if abs(lifts[i] - interpolated) > self.tolerance:
+                intervals.update([i - 1, i])
+        return [0.5 * (alphas[i] + alphas[i + 1]) for i in sorted(intervals)
+                if alphas[i + 1] - alphas[i] > self.min_step]
+
+    def _get_target_alpha(self, alphas, lifts):
+        # secant estimate of the alpha of the target lift coefficient, None when it is met already
+        errors = [abs(lift - self.target_cl) for lift in lifts]
+        if min(errors) <= self.cl_tolerance:
+            return None
+
+        # bracketing interval, or the interval at the end of the range which is closest to the target
+        idx = None
+        for i in range(len(alphas) - 1):
+            if (lifts[i] - self.target_cl) * (lifts[i + 1] - self.target_cl) <= 0.0:
+                idx = i
+                break
+        if idx is None:
+            idx = 0 if abs(lifts[0] - self.target_cl) < abs(lifts[-1] - self.target_cl) else len(alphas) - 2
+
+        slope = (lifts[idx + 1] - lifts[idx]) / (alphas[idx + 1] - alphas[idx])
+        if slope == 0.0:
+            return None
+        alpha = alphas[idx] + (self.target_cl - lifts[idx]) / slope
+        alpha = min(max(alpha, self.alpha_range[0]), self.alpha_range[1])
+        if min(abs(alpha - other) for other in alphas) < 1e-6:
+            return None  # e.g. the target lies outside the alpha range
+        return alpha
+
+    def _compute_results(self):
+        lower, upper = self.alpha_range
+        solved = dict()
+        self.rounds = 0
+        planned = [lower, 0.5 * (lower + upper), upper]
+
+        while planned:
+            self._solve(planned, solved)
+
+            alphas = sorted(solved)
+            lifts = [self._lift(solved[alpha]) for alpha in alphas]
+            planned = self._get_bends(alphas, lifts)
+            if self.target_cl is not None:
+                target_alpha = self._get_target_alpha(alphas, lifts)
+                if target_alpha is not None:
+                    planned.append(target_alpha)
+
+            planned = sorted(set(planned) - set(solved))[:self.max_cases - len(solved)]
+
+        self.alphas = sorted(solved)
+        return {'alpha%s' % idx: solved[alpha] for idx, alpha in enumerate(self.alphas)}
+
+    def _get_case_names(self, results):
+        return ['alpha%s' % idx for idx in range(len(results))]
+
+    def _stream_results(self):
+        # the cases are only numbered by angle of attack once the plan is complete
+        results = self._compute_results()
+        for name in self._get_case_names(results):
+            yield name, results[name]
+
+    def _get_results(self):
+        # the plan depends on the results of the inner sessions, these are cached instead
+        return self._compute_results()
+
+    def show_geometry(self):
+        session = self.session_class(geometry=self.geometry, cases=self._get_cases([self.alpha_range[0]]))
+        session.show_geometry()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper columnar result containers
+"""
+import numpy as np
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+try:
+    string_types = basestring  # Python 2
+except NameError:
+    string_types = str  # Python 3
+
+
+class ForceTable(object):
+    """Columnar force table, e.g. the strips of one surface. The values are stored as one contiguous array per column
+    (a columns x rows array). Indexing with a column name returns the column, an integer returns a row as a dict and a
+    slice or index array returns a new table. Column and slice results are views, nothing is copied:
+
+        table['cl']          # 1D array of all rows
+        table[4:8]['cl']     # rows 4 to 7
+        table.as_dict()      # {column: list of floats}, the layout of OutputReader.get_content()
+    """
+
+    def __init__(self, columns, values):
+        self.columns = list(columns)
+        self.values = values
+        self._index = {column: idx for idx, column in enumerate(self.columns)}
+
+    @classmethod
+    def from_rows(cls, columns, table):
+        # tables are parsed row by row (rows x columns), the transpose is stored such that the columns are contiguous
+        if table.size == 0:
+            return cls(columns, np.zeros((len(columns), 0)))
+        return cls(columns, np.ascontiguousarray(table.T))
+
+    def __getitem__(self, key):
+        if isinstance(key, string_types):
+            return self.values[self._index[key]]
+        if isinstance(key, (int, np.integer)):
+            return {column: float(value) for column, value in zip(self.columns, self.values[:, key])}
+        return ForceTable(self.columns, self.values[:, key])
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __contains__(self, column):
+        return column in self._index
+
+    def keys(self):
+        return list(self.columns)
+
+    def items(self):
+        return [(column, self.values[idx]) for idx, column in enumerate(self.columns)]
+
+    def as_dict(self):
+        return {column: self.values[idx].tolist() for idx, column in enumerate(self.columns)}
+
+
+class ElementTable(object):
+    """Element forces of one surface. All elements are stored in a single ForceTable, ordered by strip. Indexing with
+    a strip number returns the (view on the) elements of that strip, as in the {strip: {column: values}} layout of
+    OutputReader.get_content()."""
+
+    def __init__(self, table, strips, offsets):
+        self.table = table
+        self.strips = np.asarray(strips, dtype=int)  # strip numbers
+        self.offsets = np.asarray(offsets, dtype=int)  # first row of every strip, followed by the number of rows
+        self._index = {int(strip): idx for idx, strip in enumerate(self.strips)}
+
+    @classmethod
+    def from_strips(cls, columns, strip_tables):
+        # strip_tables: list of (strip number, rows x columns array)
+        strips = [strip for strip, _ in strip_tables]
+        lengths = [len(values) for _, values in strip_tables]
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(int)
+        tables = [values for _, values in strip_tables if values.size > 0]
+        values = np.concatenate(tables, axis=0) if tables else np.zeros((0, len(columns)))
+        return cls(ForceTable.from_rows(columns, values), strips, offsets)
+
+    @property
+    def columns(self):
+        return self.table.columns
+
+    def __getitem__(self, strip):
+        idx = self._index[int(strip)]
+        return self.table[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def __len__(self):
+        return len(self.strips)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, strip):
+        return strip in self._index
+
+    def keys(self):
+        return [int(strip) for strip in self.strips]
+
+    def items(self):
+        return [(strip, self[strip]) for strip in self.keys()]
+
+    def as_dict(self):
+        return {strip: table.as_dict() for strip, table in self.items()}
+
+
+class SurfaceResults(object):
+    """Results of all surfaces of one output file, accessed by surface name. Saved to and loaded from .npz files
+    without pickling."""
+
+    def __init__(self, surfaces=None):
+        self.surfaces = surfaces if surfaces is not None else dict()
+
+    def __getitem__(self, name):
+        return self.surfaces[name]
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def __iter__(self):
+        return iter(self.surfaces)
+
+    def __contains__(self, name):
+        return name in self.surfaces
+
+    def keys(self):
+        return list(self.surfaces.keys())
+
+    def items(self):
+        return list(self.surfaces.items())
+
+    def as_dict(self):
+        return {name: surface.as_dict() for name, surface in self.surfaces.items()}
+
+    def _get_arrays(self, prefix, surface):
+        raise NotImplementedError
+
+    @classmethod
+    def _from_arrays(cls, prefix, data):
+        raise NotImplementedError
+
+    def save(self, file_path):
+        names = sorted(self.surfaces.keys())
+        arrays = {'surfaces': np.array(names, dtype=np.str_)}
+        for idx, name in enumerate(names):
+            arrays.update(self._get_arrays('s{0}_'.format(idx), self.surfaces[name]))
+        np.savez(file_path, **arrays)
+
+    @classmethod
+    def load(cls, file_path):
+        data = np.load(file_path)
+        return cls({str(name): cls._from_arrays('s{0}_'.format(idx), data)
+                    for idx, name in enumerate(data['surfaces'])})
+
+
+class StripForces(SurfaceResults):
+    """Strip forces ('fs' output) as {surface name: ForceTable}"""
+
+    def _get_arrays(self, prefix, surface):
+        return {prefix + 'columns': np.array(surface.columns, dtype=np.str_), prefix + 'values': surface.values}
+
+    @classmethod
+    def _from_arrays(cls, prefix, data):
+        return ForceTable([str(column) for column in data[prefix + 'columns']], data[prefix + 'values'])
+
+
+class ElementForces(SurfaceResults):
+    """Element forces ('fe' output) as {surface name: ElementTable}"""
+
+    def _get_arrays(self, prefix, surface):
+        return {prefix + 'columns': np.array(surface.columns, dtype=np.str_), prefix + 'values': surface.table.values,
+                prefix + 'strips': surface.strips, prefix + 'offsets': surface.offsets}
+
+    @classmethod
+    def _from_arrays(cls, prefix, data):
+        table = ForceTable([str(column) for column in data[prefix + 'columns']], data[prefix + 'values'])
+        return ElementTable(table, data[prefix + 'strips'], data[prefix + 'offsets'])
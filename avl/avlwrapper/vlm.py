@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper native vortex-lattice solver
+"""
+import os
+import numpy as np
+
+from .core import CaseTable, InputError, Session
+from .geometry import DataAirfoil, FileAirfoil, NacaAirfoil, Symmetry
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+def get_spacing(n, spacing):
+    """Node fractions (n + 1 values from 0 to 1) for the AVL spacing parameter. Like AVL, the parameter blends the
+    equal, cosine and sine distributions continuously: 0 = equal, 1 = cosine, 2 = sine (bunched at the start) and
+    3 = equal, negative values use the -sine (bunched at the end), e.g. 1.5 is half cosine and half sine"""
+    t = np.linspace(0.0, 1.0, int(n) + 1)
+    spacing = float(spacing) if spacing is not None else 0.0
+    magnitude = abs(spacing)
+    if magnitude > 3.0:
+        raise InputError("AVL spacing parameters range from -3 to 3, got {0}.".format(spacing))
+
+    # weights of the equal, cosine and sine distributions
+    if magnitude < 1.0:
+        equal, cosine, sine = 1.0 - magnitude, magnitude, 0.0
+    elif magnitude < 2.0:
+        equal, cosine, sine = 0.0, 2.0 - magnitude, magnitude - 1.0
+    else:
+        equal, cosine, sine = magnitude - 2.0, 0.0, 3.0 - magnitude
+
+    sine_nodes = 1.0 - np.cos(0.5 * np.pi * t) if spacing >= 0.0 else np.sin(0.5 * np.pi * t)
+    return equal * t + cosine * 0.5 * (1.0 - np.cos(np.pi * t)) + sine * sine_nodes
+
+
+def _read_coordinates(file_name):
+    # airfoil files in Selig format, an optional name line (or any other non-numeric line) is skipped
+    coordinates = []
+    with open(file_name) as airfoil_file:
+        for line in airfoil_file:
+            values = line.split()
+            if len(values) != 2:
+                continue
+            try:
+                coordinates.append([float(values[0]), float(values[1])])
+            except ValueError:
+                continue
+    return np.array(coordinates)
+
+
+def get_camber_slope(airfoil, x):
+    """Slope of the mean camber line at the chord fractions x, zero for a flat plate (no airfoil)"""
+    x = np.asarray(x, dtype=float)
+    if airfoil is None:
+        return np.zeros_like(x)
+
+    if isinstance(airfoil, NacaAirfoil):
+        digits = str(airfoil.naca).strip()
+        if len(digits) != 4 or not digits.isdigit():
+            raise InputError("Only 4-digit NACA airfoils are supported by the vortex-lattice solver.")
+        m = int(digits[0]) / 100.0
+        p = int(digits[1]) / 10.0
+        if m == 0.0 or p == 0.0:
+            return np.zeros_like(x)
+        return np.where(x < p, 2.0 * m / p ** 2 * (p - x), 2.0 * m / (1.0 - p) ** 2 * (p - x))
+
+    if isinstance(airfoil, FileAirfoil):
+        coordinates = _read_coordinates(os.path.join(os.getcwd(), airfoil.file_name))
+    elif isinstance(airfoil, DataAirfoil):
+        coordinates = np.column_stack((airfoil.x_data, airfoil.z_data)).astype(float)
+    else:
+        raise InputError("Unsupported airfoil type: {0}".format(type(airfoil).__name__))
+
+    # split the Selig ordered coordinates (TE -> upper -> LE -> lower -> TE) at the leading edge
+    le_index = int(np.argmin(coordinates[:, 0]))
+    upper = coordinates[:le_index + 1][::-1]
+    lower = coordinates[le_index:]
+
+    # normalize to the chord, like AVL does
+    x_le = coordinates[le_index, 0]
+    chord = coordinates[:, 0].max() - x_le
+    x_grid = np.linspace(0.0, 1.0, 201)
+    z_upper = np.interp(x_grid, (upper[:, 0] - x_le) / chord, upper[:, 1] / chord)
+    z_lower = np.interp(x_grid, (lower[:, 0] - x_le) / chord, lower[:, 1] / chord)
+    slope = np.gradient(0.5 * (z_upper + z_lower), x_grid)
+    return np.interp(x, x_grid, slope)
+
+
+def get_induced_velocities(points, a, b):
+    """Velocities induced at points (N x 3) by unit strength horseshoe vortices with bound legs a -> b (M x 3) and
+    trailing legs parallel to the x-axis, returns an N x M x 3 array"""
+    r_a = points[:, np.newaxis, :] - a[np.newaxis, :, :]
+    r_b = points[:, np.newaxis, :] - b[np.newaxis, :, :]
+    len_a = np.sqrt(np.sum(r_a ** 2, axis=2))
+    len_b = np.sqrt(np.sum(r_b ** 2, axis=2))
+    x_hat = np.array([1.0, 0.0, 0.0])
+
+    # a point on (the extension of) a vortex leg gets no contribution of that leg
+    tolerance = 1e-10
+
+    # bound leg
+    denominator = len_a * len_b * (len_a * len_b + np.sum(r_a * r_b, axis=2))
+    factor = np.where(np.abs(denominator) > tolerance, (len_a + len_b) / np.where(denominator == 0, 1.0, denominator),
+                      0.0)
+    velocity = np.cross(r_a, r_b) * factor[:, :, np.newaxis]
+
+    # trailing legs, from infinity to a and from b to infinity
+    for r, length, sign in ((r_a, len_a, 1.0), (r_b, len_b, -1.0)):
+        denominator = length * (length - r[:, :, 0])
+        factor = np.where(np.abs(denominator) > tolerance, sign / np.where(denominator == 0, 1.0, denominator), 0.0)
+        velocity += np.cross(r, x_hat) * factor[:, :, np.newaxis]
+
+    return velocity / (4.0 * np.pi)
+
+
+class Lattice(object):
+    """Horseshoe vortex lattice of a Geometry, the panelling follows the AVL input: n_chordwise panels per strip and
+    n_spanwise strips per surface (or per section), using the AVL spacing parameters. Section incidence and airfoil
+    camber are applied to the normal vectors (flow tangency), like AVL does."""
+
+    def __init__(self, geometry):
+        if geometry.bodies:
+            raise InputError("Bodies are not supported by the vortex-lattice solver.")
+        if geometry.z_symm not in (Symmetry.none, 0):
+            raise InputError("Z-symmetry (ground effect) is not supported by the vortex-lattice solver.")
+        if geometry.y_symm not in (Symmetry.none, Symmetry.symmetric, 0, 1):
+            raise InputError("Only symmetric y-symmetry is supported by the vortex-lattice solver.")
+        if geometry.mach:
+            raise InputError("Compressibility is not supported by the vortex-lattice solver.")
+
+        self.geometry = geometry
+        self.y_symmetric = geometry.y_symm in (Symmetry.symmetric, 1)
+
+        a, b, points, normals = [], [], [], []
+        for surface in geometry.surfaces:
+            for panels in self._get_surface_panels(surface):
+                a.append(panels[0])
+                b.append(panels[1])
+                points.append(panels[2])
+                normals.append(panels[3])
+
+        self.a = np.concatenate(a)  # bound leg start points
+        self.b = np.concatenate(b)  # bound leg end points
+        self.points = np.concatenate(points)  # control points
+        self.normals = np.concatenate(normals)
+        self.midpoints = 0.5 * (self.a + self.b)
+
+    @staticmethod
+    def _get_span_nodes(surface, lengths):
+        # spanwise node fractions per section interval
+        if surface.n_spanwise is not None:
+            total = np.sum(lengths)
+            stations = np.concatenate(([0.0], np.cumsum(lengths))) / total
+            nodes = get_spacing(surface.n_spanwise, surface.span_spacing)
+
+            # every section is a node, drop the surface nodes which are too close to a section
+            tolerance = 0.2 / surface.n_spanwise
+            nodes = [node for node in nodes if np.min(np.abs(stations - node)) > tolerance]
+            nodes = np.unique(np.concatenate((nodes, stations)))
+
+            # intervals without span (e.g. coincident sections) get no strips
+            return [(nodes[(nodes >= start) & (nodes <= end)] - start) / (end - start) if end > start else None
+                    for start, end in zip(stations[:-1], stations[1:])]
+
+        intervals = []
+        for section in surface.sections[:-1]:
+            if section.n_spanwise is None:
+                raise InputError("Either the surface or all sections should define the spanwise panelling.")
+            intervals.append(get_spacing(section.n_spanwise, section.span_spacing))
+        return intervals
+
+    def _get_surface_panels(self, surface):
+        sections = surface.sections
+        scaling = np.array(surface.scaling if surface.scaling is not None else (1.0, 1.0, 1.0), dtype=float)
+        translation = np.array(surface.translation if surface.translation is not None else (0.0, 0.0, 0.0),
+                               dtype=float)
+
+        leading_edges = np.array([section.leading_edge_point for section in sections], dtype=float) * scaling \
+            + translation
+        chords = np.array([section.chord for section in sections], dtype=float) * scaling[0]
+        angles = np.radians(np.array([section.angle for section in sections], dtype=float)
+                            + (surface.angle if surface.angle is not None else 0.0))
+
+        # chordwise bound vortex (1/4 panel) and control point (3/4 panel) locations
+        chord_nodes = get_spacing(surface.n_chordwise, surface.chord_spacing)
+        x_bound = chord_nodes[:-1] + 0.25 * np.diff(chord_nodes)
+        x_control = chord_nodes[:-1] + 0.75 * np.diff(chord_nodes)
+        slopes = [get_camber_slope(section.airfoil, x_control) for section in sections]
+
+        lengths = np.sqrt(np.sum((leading_edges[1:, 1:] - leading_edges[:-1, 1:]) ** 2, axis=1))
+        span_nodes = self._get_span_nodes(surface, lengths)
+
+        a, b, points, normals = [], [], [], []
+        for idx, t in enumerate(span_nodes):
+            if t is None:
+                continue
+
+            # strip edges and centers, linearly interpolated between the two sections
+            t0, t1 = t[:-1, np.newaxis], t[1:, np.newaxis]
+            tc = 0.5 * (t0 + t1)
+            le_0 = leading_edges[idx] + t0 * (leading_edges[idx + 1] - leading_edges[idx])
+            le_1 = leading_edges[idx] + t1 * (leading_edges[idx + 1] - leading_edges[idx])
+            chord_0 = chords[idx] + t0 * (chords[idx + 1] - chords[idx])
+            chord_1 = chords[idx] + t1 * (chords[idx + 1] - chords[idx])
+            angle = angles[idx] + tc * (angles[idx + 1] - angles[idx])
+            slope = slopes[idx] + tc * (slopes[idx + 1] - slopes[idx])
+
+            x_hat = np.array([1.0, 0.0, 0.0])
+            a.append((le_0[:, np.newaxis, :] + (chord_0 * x_bound)[:, :, np.newaxis] * x_hat).reshape(-1, 3))
+            b.append((le_1[:, np.newaxis, :] + (chord_1 * x_bound)[:, :, np.newaxis] * x_hat).reshape(-1, 3))
+            points.append((0.5 * (le_0 + le_1)[:, np.newaxis, :]
+                           + (0.5 * (chord_0 + chord_1) * x_control)[:, :, np.newaxis] * x_hat).reshape(-1, 3))
+
+            # normal of the strip plane, rotated about the spanwise axis by the local camber slope and incidence
+            span_vector = le_1 - le_0
+            span_vector[:, 0] = 0.0
+            span_vector /= np.sqrt(np.sum(span_vector ** 2, axis=1))[:, np.newaxis]
+            strip_normal = np.column_stack((np.zeros(len(span_vector)), -span_vector[:, 2], span_vector[:, 1]))
+            phi = np.arctan(slope) - angle
+            normals.append((np.cos(phi)[:, :, np.newaxis] * strip_normal[:, np.newaxis, :]
+                            - np.sin(phi)[:, :, np.newaxis] * x_hat).reshape(-1, 3))
+
+        a, b, points, normals = np.concatenate(a), np.concatenate(b), np.concatenate(points), np.concatenate(normals)
+        yield a, b, points, normals
+
+        if surface.y_duplicate is not None:
+            # mirrored surface, the bound legs are reversed to keep the same circulation sense
+            mirror = np.array([1.0, -1.0, 1.0])
+            offset = np.array([0.0, 2.0 * surface.y_duplicate, 0.0])
+            yield b * mirror + offset, a * mirror + offset, points * mirror + offset, normals * mirror
+
+    def get_influence(self, points):
+        """Velocities induced at points by all unit strength horseshoes, including the y-symmetry images"""
+        velocity = get_induced_velocities(points, self.a, self.b)
+        if self.y_symmetric:
+            mirror = np.array([1.0, -1.0, 1.0])
+            velocity += get_induced_velocities(points, self.b * mirror, self.a * mirror)
+        return velocity
+
+
+class VortexLatticeSession(Session):
+    """Drop-in replacement of Session which solves the geometry and cases with a native NumPy vortex-lattice method
+    instead of AVL. All cases are solved with a single factorization of the influence matrix. Only 'Totals' results
+    are available, controls deflections and rotation rates are not supported.
+
+        session = VortexLatticeSession(geometry=geometry, cases=cases)
+        results = session.get_results()  # {case name: {'Totals': {...}}}
+    """
+    SOLVER = 'vlm'
+
+    def __init__(self, geometry, cases, cache=None):
+        # no AVL configuration is read, the solver should also work without an AVL binary
+        self._temp_dir = None
+        self.config = {'output': ['Totals']}
+        self.geometry = geometry
+        self.base_name = geometry.name
+        # the solver reads the parameters and states of Case objects
+        self.cases = cases.to_cases() if isinstance(cases, CaseTable) else cases
+        self.run_keys = None
+        self.worker = None
+        self.cache = cache
+
+        self._calculated = False
+        self._results = None
+        self._lattice = None
+
+        self._init_background()
+
+        for case in self.cases:
+            self._check_case(case)
+
+    @staticmethod
+    def _check_case(case):
+        case._check()
+        if case.outputs is not None and list(case.outputs) != ['Totals']:
+            raise InputError("The vortex-lattice solver only provides 'Totals' results.")
+
+        for name, parameter in case.parameters.items():
+            if parameter.constraint != name:
+                raise InputError("Constraints are not supported by the vortex-lattice solver: "
+                                 "{0} -> {1}.".format(name, parameter.constraint))
+            if name in ('pb/2V', 'qc/2V', 'rb/2V') or name in case.controls:
+                if parameter.value != 0.0:
+                    raise InputError("Rotation rates and control deflections are not supported by the "
+                                     "vortex-lattice solver: {0}.".format(name))
+        if case.states['Mach'].value:
+            raise InputError("Compressibility is not supported by the vortex-lattice solver.")
+
+    @property
+    def lattice(self):
+        if self._lattice is None:
+            self._lattice = Lattice(self.geometry)
+        return self._lattice
+
+    def _stream_results(self):
+        # all cases are solved at once
+        results = self._compute_results()
+        for case in self.cases:
+            yield case.name, results[case.name]
+
+    def _compute_results(self):
+        lattice = self.lattice
+        geometry = self.geometry
+
+        alpha = np.radians([case.parameters['alpha'].value for case in self.cases])
+        beta = np.radians([case.parameters['beta'].value for case in self.cases])
+
+        # free stream directions (3 x K), in AVL geometry axes
+        v_inf = np.vstack((np.cos(alpha) * np.cos(beta), -np.sin(beta), np.sin(alpha) * np.cos(beta)))
+
+        # one factorization, K right-hand sides
+        influence = np.einsum('ijk,ik->ij', lattice.get_influence(lattice.points), lattice.normals)
+        circulation = np.linalg.solve(influence, -np.dot(lattice.normals, v_inf))  # N x K
+
+        # Kutta-Joukowski force on the bound legs, with the induced velocity of all other vortices
+        induced = np.einsum('ijk,jl->ikl', lattice.get_influence(lattice.midpoints), circulation)  # N x 3 x K
+        velocity = induced + v_inf[np.newaxis, :, :]
+        leg = (lattice.b - lattice.a)[:, :, np.newaxis]
+        forces = np.cross(velocity, leg, axisa=1, axisb=1, axisc=1) * circulation[:, np.newaxis, :]  # N x 3 x K
+
+        results = dict()
+        for idx, case in enumerate(self.cases):
+            reference = np.array([case.states['X_cg'].value, case.states['Y_cg'].value, case.states['Z_cg'].value])
+            force = 2.0 * np.sum(forces[:, :, idx], axis=0) / geometry.area
+            moment = 2.0 * np.sum(np.cross(lattice.midpoints - reference, forces[:, :, idx]), axis=0) / geometry.area
+
+            if lattice.y_symmetric:
+                force = np.array([2.0 * force[0], 0.0, 2.0 * force[2]])
+                moment = np.array([0.0, 2.0 * moment[1], 0.0])
+
+            cd_ind = np.dot(force, v_inf[:, idx])
+            cd_vis = case.states['CDo'].value or (geometry.cd_p if geometry.cd_p is not None else 0.0)
+
+            totals = {'Sref': geometry.area, 'Cref': geometry.chord, 'Bref': geometry.span,
+                      'Xref': reference[0], 'Yref': reference[1], 'Zref': reference[2],
+                      'Alpha': np.degrees(alpha[idx]), 'Beta': np.degrees(beta[idx]), 'Mach': 0.0,
+                      'pb/2V': 0.0, 'qc/2V': 0.0, 'rb/2V': 0.0,
+                      # body axes: x forward, y right, z down
+                      'CXtot': -force[0], 'CYtot': force[1], 'CZtot': -force[2],
+                      'Cltot': -moment[0] / geometry.span, 'Cmtot': moment[1] / geometry.chord,
+                      'Cntot': -moment[2] / geometry.span,
+                      'CLtot': -force[0] * np.sin(alpha[idx]) + force[2] * np.cos(alpha[idx]),
+                      'CDtot': cd_ind + cd_vis, 'CDvis': cd_vis, 'CDind': cd_ind}
+            results[case.name] = {'Totals': dict((key, float(value)) for key, value in totals.items())}
+
+        self._calculated = True
+        return results
+
+    def show_geometry(self):
+        """Plots the top view of the lattice (including the duplicated surfaces) in a matplotlib window: the bound legs
+        of the horseshoe vortices and the control points"""
+        import matplotlib.pyplot as plt  # only required for the viewer
+
+        lattice = self.lattice
+        figure = plt.figure(self.geometry.name)
+        axes = figure.add_subplot(111)
+        axes.plot(np.vstack((lattice.a[:, 1], lattice.b[:, 1])), np.vstack((lattice.a[:, 0], lattice.b[:, 0])),
+                  color='b', linewidth=0.8)
+        axes.plot(lattice.points[:, 1], lattice.points[:, 0], 'r.', markersize=2)
+        axes.set_xlabel('y')
+        axes.set_ylabel('x')
+        axes.set_aspect('equal')
+        axes.invert_yaxis()  # nose up, like the AVL geometry viewer
+        plt.show()
+        return figure
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper persistent worker process
+"""
+import atexit
+import os
+import re
+import subprocess
+import threading
+import time
+import weakref
+
+from .core import CONFIG_FILE, InputError, Session
+from .workspace import get_workspace_pool
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+__MODULE_DIR__ = os.path.dirname(__file__)
+
+# live workers, closed on exit by a single handler; the set does not keep closed workers (and their processes) alive
+_WORKERS = weakref.WeakSet()
+
+
+def _close_workers():
+    for worker in list(_WORKERS):
+        worker.close()
+
+
+atexit.register(_close_workers)
+
+
+class Worker(object):
+    """Keeps a single AVL process alive over stdin/stdout. The geometry is only re-loaded when the output of
+    Geometry.create_input() changes, new cases are run on request. Use as backend of a Session:
+
+        worker = Worker()
+        session = Session(geometry=geometry, cases=cases, worker=worker)
+        results = session.get_results()
+    """
+    # AVL prints this prompt every time it returns to the top-level menu
+    PROMPT = re.compile(r'AVL\s+c>')
+
+    def __init__(self, avl_bin=None, timeout=None):
+        if avl_bin is None:
+            avl_bin = Session._read_config(os.path.join(__MODULE_DIR__, CONFIG_FILE))['avl_bin']
+
+        self.avl_bin = avl_bin
+        self.timeout = timeout
+
+        self._temp_dir = None
+        self._process = None
+        self._reader = None
+        self._condition = threading.Condition()
+        # serializes sessions submitted from different threads, these share the worker directory
+        self.lock = threading.RLock()
+        self._buffer = ''
+        self._prompts = 0
+
+        self._model_file = None
+        self._geometry_input = None
+
+        _WORKERS.add(self)
+
+    @property
+    def temp_dir(self):
+        if self._temp_dir is None:
+            self._temp_dir = get_workspace_pool().acquire()
+        return self._temp_dir
+
+    @property
+    def is_alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self):
+        if self.is_alive:
+            return
+
+        self._buffer = ''
+        self._prompts = 0
+        self._model_file = None
+        self._geometry_input = None
+
+        self._process = subprocess.Popen(args=[self.avl_bin],
+                                         stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.STDOUT,
+                                         bufsize=0,  # Buffer size required for direct stdin/stdout access
+                                         cwd=self.temp_dir.name)
+
+        self._reader = threading.Thread(target=self._read_stdout, args=(self._process,))
+        self._reader.daemon = True
+        self._reader.start()
+
+        # wait for the start-up banner and the first prompt
+        self._wait_for_prompts(1)
+
+    def _read_stdout(self, process):
+        file_no = process.stdout.fileno()
+        while True:
+            chunk = os.read(file_no, 4096)
+            with self._condition:
+                if not chunk:
+                    self._condition.notify_all()
+                    break
+                self._buffer += chunk.decode('ascii', 'ignore')
+                matches = list(self.PROMPT.finditer(self._buffer))
+                if matches:
+                    self._prompts += len(matches)
+                    self._buffer = self._buffer[matches[-1].end():]
+                    self._condition.notify_all()
+                else:
+                    # keep only enough characters to detect a prompt split over two chunks
+                    self._buffer = self._buffer[-16:]
+
+    def _wait_for_prompts(self, count):
+        deadline = None if self.timeout is None else time.time() + self.timeout
+        with self._condition:
+            while self._prompts < count:
+                if self._process.poll() is not None and not self._reader.is_alive():
+                    raise WorkerError("AVL process exited unexpectedly (code {0}).".format(self._process.returncode))
+                if deadline is not None and time.time() > deadline:
+                    raise WorkerError("AVL did not respond within {0} seconds.".format(self.timeout))
+                self._condition.wait(0.1)
+
+    def _send(self, commands, n_prompts):
+        target = self._prompts + n_prompts
+        self._process.stdin.write(commands.encode())
+        self._process.stdin.flush()
+        self._wait_for_prompts(target)
+
+    def run(self, session):
+        """Runs the cases of a session, results are written to the worker directory"""
+        if session.cases is None:
+            raise InputError("A worker can only run sessions with cases.")
+
+        with self.lock:
+            self._run(session)
+
+    def _run(self, session):
+        self._start()
+
+        geometry_input = session.geometry.create_input()
+        session._write_geometry()
+        session._write_cases()
+
+        commands = ""
+        n_prompts = 0
+        if geometry_input != self._geometry_input or session.model_file != self._model_file:
+            session._copy_airfoils()
+            commands += "load {0}\n".format(session.model_file)
+            n_prompts += 1
+
+        # AVL asks for confirmation when an output file already exists
+        for case in session.cases:
+            for _, file_name in session._get_output_files(case):
+                file_path = os.path.join(self.temp_dir.name, file_name)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
+        commands += "case {0}\n".format(session.case_file)
+        commands += session._get_case_run_keys()
+        commands += "\n"  # return to the top-level menu
+        n_prompts += 2
+
+        try:
+            self._send(commands, n_prompts)
+        except WorkerError:
+            self.close()
+            raise
+
+        self._model_file = session.model_file
+        self._geometry_input = geometry_input
+
+    def close(self):
+        if self.is_alive:
+            try:
+                self._process.stdin.write("\nquit\n".encode())
+                self._process.stdin.close()
+            except (IOError, OSError, ValueError):
+                pass
+            # give AVL a moment to quit by itself before killing it
+            for _ in range(50):
+                if self._process.poll() is not None:
+                    break
+                time.sleep(0.1)
+            else:
+                self._process.kill()
+        self._process = None
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def __del__(self):
+        self.close()
+
+
+class WorkerError(Exception):
+    pass
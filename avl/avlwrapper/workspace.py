@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" AVL Wrapper scratch directory management
+"""
+import atexit
+import errno
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+# RAM-backed file system available on most Linux systems
+SHARED_MEMORY_DIR = '/dev/shm'
+
+
+def link_file(source, directory):
+    """Makes a file available in a directory without copying it when possible: a hard link is tried first, then a
+    symbolic link and finally a plain copy (e.g. when the directory is on another file system)."""
+    destination = os.path.join(directory, os.path.basename(source))
+    if os.path.lexists(destination):
+        os.remove(destination)
+
+    try:
+        os.link(source, destination)
+        return destination
+    except (AttributeError, OSError):
+        pass
+    try:
+        os.symlink(os.path.abspath(source), destination)
+        return destination
+    except (AttributeError, NotImplementedError, OSError):
+        pass
+    shutil.copy(source, destination)
+    return destination
+
+
+class Workspace(object):
+    """Scratch directory borrowed from a WorkspacePool. Offers the same interface as a TemporaryDirectory: the path is
+    available as name, cleanup() empties the directory and hands it back to the pool."""
+
+    def __init__(self, pool, name):
+        self.pool = pool
+        self.name = name
+        self.released = False
+
+    def cleanup(self):
+        # may be called more than once, e.g. by Session.reset() and Session.__del__()
+        if not self.released:
+            self.released = True
+            self.pool.release(self)
+
+
+class WorkspacePool(object):
+    """Pool of reusable scratch directories. Directories are created on a RAM-backed file system when one is available
+    and writable, otherwise in the default temporary directory. Released directories are emptied and kept for the next
+    session, all directories are removed on process exit. Directories left behind by processes which no longer exist
+    are removed when the pool is created."""
+
+    def __init__(self, root=None, prefix='avl_', max_idle=8):
+        if root is None:
+            root = self.get_default_root()
+
+        self.root = root
+        self.prefix = prefix
+        self.max_idle = max_idle  # maximum number of empty directories kept for reuse
+
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._idle = []
+        self._directories = set()
+
+        self._remove_stale()
+        atexit.register(self.close)
+
+    @staticmethod
+    def get_default_root():
+        if os.path.isdir(SHARED_MEMORY_DIR) and os.access(SHARED_MEMORY_DIR, os.W_OK | os.X_OK):
+            return SHARED_MEMORY_DIR
+        return tempfile.gettempdir()
+
+    @property
+    def _is_owner(self):
+        # a forked process (e.g. a multiprocessing pool worker) inherits the pool, but not the directories
+        return os.getpid() == self._pid
+
+    def _remove_stale(self):
+        # only POSIX offers a safe way to check whether a process is still alive
+        if os.name != 'posix':
+            return
+
+        pattern = re.compile(r'^{0}(\d+)_'.format(re.escape(self.prefix)))
+        for name in os.listdir(self.root):
+            match = pattern.match(name)
+            if match is None:
+                continue
+            try:
+                os.kill(int(match.group(1)), 0)
+            except OSError as error:
+                if error.errno == errno.ESRCH:  # no such process
+                    shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def acquire(self):
+        with self._lock:
+            if self._is_owner and self._idle:
+                name = self._idle.pop()
+            else:
+                name = tempfile.mkdtemp(prefix='{0}{1}_'.format(self.prefix, os.getpid()), dir=self.root)
+                # directories of other processes are not kept, these may exit without running atexit handlers
+                if self._is_owner:
+                    self._directories.add(name)
+        return Workspace(self, name)
+
+    @staticmethod
+    def _empty(directory):
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+    def release(self, workspace):
+        with self._lock:
+            if not self._is_owner or workspace.name not in self._directories:
+                shutil.rmtree(workspace.name, ignore_errors=True)
+                return
+
+            try:
+                self._empty(workspace.name)
+            except OSError:
+                shutil.rmtree(workspace.name, ignore_errors=True)
+                self._directories.discard(workspace.name)
+                return
+
+            if len(self._idle) < self.max_idle:
+                self._idle.append(workspace.name)
+            else:
+                shutil.rmtree(workspace.name, ignore_errors=True)
+                self._directories.discard(workspace.name)
+
+    def close(self):
+        with self._lock:
+            if self._is_owner:
+                for name in self._directories:
+                    shutil.rmtree(name, ignore_errors=True)
+            self._idle = []
+            self._directories = set()
+
+
+_DEFAULT_POOL = None
+
+
+def get_workspace_pool():
+    """Returns the process-wide WorkspacePool used by sessions and workers"""
+    global _DEFAULT_POOL
+    if _DEFAULT_POOL is None:
+        _DEFAULT_POOL = WorkspacePool()
+    return _DEFAULT_POOL
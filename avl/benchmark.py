@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+""" Throughput benchmark of the Session input/output path.
+
+Measures, per number of cases, the time spent in session setup (writing the geometry and case files), launching the
+AVL process, running the cases and writing the output files, and parsing the output files with OutputReader. Without
+an AVL installation the stand-in fakeavl.py is used:
+
+    python benchmark.py                       # fakeavl.py, panelling of the geometry below
+    FAKEAVL_SPANWISE=200 python benchmark.py  # larger strip and element tables
+    AVL_EXECUTABLE=/usr/local/bin/avl python benchmark.py
+"""
+import os
+import time
+
+if not os.environ.get('AVL_EXECUTABLE'):
+    os.environ['AVL_EXECUTABLE'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fakeavl.py')
+
+from avlwrapper import Geometry, Surface, Section, NacaAirfoil, Point, Spacing, Session, Case
+from avlwrapper.core import OutputReader
+
+CASE_COUNTS = [1, 5, 10, 25]
+REPEATS = 5
+
+
+def get_geometry():
+    wing_surface = Surface(name="Wing",
+                           n_chordwise=12,
+                           chord_spacing=Spacing.cosine,
+                           n_spanwise=16,
+                           span_spacing=Spacing.neg_sine,
+                           y_duplicate=0.0,
+                           sections=[Section(leading_edge_point=Point(0, 0, 0),
+                                             chord=1.0,
+                                             airfoil=NacaAirfoil(naca='2414')),
+                                     Section(leading_edge_point=Point(0.6, 2.0, 0),
+                                             chord=0.4,
+                                             airfoil=NacaAirfoil(naca='2410'))])
+
+    return Geometry(name="Benchmark wing",
+                    reference_area=2.8,
+                    reference_chord=0.74,
+                    reference_span=4,
+                    reference_point=Point(0.21, 0, 0.0),
+                    surfaces=[wing_surface])
+
+
+def get_cases(n_cases):
+    return [Case(name='alpha%s' % i, alpha=-5.0 + i) for i in range(n_cases)]
+
+
+def best_of(function, repeats=REPEATS):
+    # best of a number of repeats, the least disturbed by other processes
+    timings = []
+    for _ in range(repeats):
+        start = time.time()
+        function()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def benchmark(n_cases):
+    geometry = get_geometry()
+
+    def setup():
+        session = Session(geometry=geometry, cases=get_cases(n_cases))
+        session._write_geometry()
+        session._copy_airfoils()
+        session._write_cases()
+        session.reset()
+
+    session = Session(geometry=geometry, cases=get_cases(n_cases))
+
+    def launch():
+        process = session._get_avl_process()
+        process.communicate(input="quit\n".encode())
+
+    def run():
+        session._calculated = False
+        session._run_analysis()
+
+    def parse():
+        session._read_results()
+
+    run()  # the output files to parse
+    output_files = [os.path.join(session.temp_dir.name, file_name)
+                    for case in session.cases for _, file_name in session._get_output_files(case)]
+    size = sum(os.path.getsize(file_path) for file_path in output_files)
+
+    timings = {'setup': best_of(setup), 'launch': best_of(launch), 'run': best_of(run), 'parse': best_of(parse)}
+    timings['write'] = max(0.0, timings['run'] - timings['launch'])
+    timings['size'] = size
+    session.reset()
+    return timings
+
+
+def parse_throughput(n_cases):
+    # parsing throughput per output type, in MB/s
+    session = Session(geometry=get_geometry(), cases=get_cases(n_cases))
+    session._run_analysis()
+
+    throughput = dict()
+    for output in session.config['output']:
+        file_paths = [os.path.join(session.temp_dir.name, dict(session._get_output_files(case))[output])
+                      for case in session.cases]
+        size = sum(os.path.getsize(file_path) for file_path in file_paths)
+        duration = best_of(lambda: [OutputReader(file_path).get_content() for file_path in file_paths])
+        throughput[output] = size / 1e6 / max(duration, 1e-9)
+    session.reset()
+    return throughput
+
+
+if __name__ == '__main__':
+
+    print("AVL executable: {0}".format(os.environ['AVL_EXECUTABLE']))
+    print("")
+    print("{0:>6} {1:>10} {2:>10} {3:>10} {4:>10} {5:>10} {6:>12} {7:>12}".format(
+        'cases', 'setup [s]', 'launch [s]', 'write [s]', 'parse [s]', 'total [s]', 'output [kB]', 'cases/s'))
+
+    for count in CASE_COUNTS:
+        result = benchmark(count)
+        total = result['setup'] + result['run'] + result['parse']
+        print("{0:>6d} {1:>10.4f} {2:>10.4f} {3:>10.4f} {4:>10.4f} {5:>10.4f} {6:>12.1f} {7:>12.1f}".format(
+            count, result['setup'], result['launch'], result['write'], result['parse'], total,
+            result['size'] / 1e3, count / total))
+
+    print("")
+    print("Parsing throughput ({0} cases):".format(max(CASE_COUNTS)))
+    for output, value in sorted(parse_throughput(max(CASE_COUNTS)).items()):
+        print("  {0:<22} {1:8.2f} MB/s".format(output, value))
@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Stand-in for the AVL executable, used to benchmark and test the wrapper on machines without AVL.
+
+It speaks the subset of the interactive AVL protocol which the wrapper uses (load, case, oper, running cases and writing
+the .ft/.fn/.fs/.fe/.st/.sb/.hm output files, the eigenvalues of the MODE menu, quit) and writes output files in the AVL
+format. The numbers are based on simple lifting-line estimates, they are NOT a replacement of an AVL analysis. By
+default the tables follow the panelling of the loaded geometry; set FAKEAVL_SPANWISE and/or FAKEAVL_CHORDWISE to force
+the number of strips per surface and elements per strip (e.g. to benchmark the parsers with realistic or large file
+sizes).
+
+Use it by pointing the wrapper to this script, either in config.cfg or with an environment variable:
+
+    AVL_EXECUTABLE=/path/to/fakeavl.py python example.py
+"""
+import math
+import os
+import sys
+
+__author__ = "Şan Kılkış"
+__status__ = "Development"
+
+
+TOP_PROMPT = " AVL   c>  "
+OPER_PROMPT = " .OPER (case {0}/{1})   c>  "
+MODE_PROMPT = " .MODE   c>  "
+SEPARATOR = " " + "-" * 63 + "\n"
+
+
+def write(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _strip_comments(file_name):
+    lines = []
+    with open(file_name) as input_file:
+        for line in input_file:
+            line = line.split('#')[0].split('!')[0].strip()
+            if line:
+                lines.append(line)
+    return lines
+
+
+def read_geometry(file_name):
+    """Reads the reference values, surfaces and controls of an AVL geometry file"""
+    lines = _strip_comments(file_name)
+    s_ref, c_ref, b_ref = [float(value) for value in lines[3].split()[:3]]
+    geometry = {'name': lines[0], 'Sref': s_ref, 'Cref': c_ref, 'Bref': b_ref,
+                'ref': [float(value) for value in lines[4].split()[:3]], 'surfaces': [], 'controls': []}
+
+    surface = None
+    for idx, line in enumerate(lines):
+        keyword = line.split()[0].upper()[:4]
+        if keyword == 'SURF':
+            values = lines[idx + 2].split()
+            surface = {'name': lines[idx + 1], 'n_chordwise': int(float(values[0])),
+                       'n_spanwise': int(float(values[2])) if len(values) > 2 else 0, 'y_duplicate': False}
+            geometry['surfaces'].append(surface)
+        elif keyword == 'YDUP' and surface is not None:
+            surface['y_duplicate'] = True
+        elif keyword == 'SECT' and surface is not None:
+            values = lines[idx + 1].split()
+            if len(values) > 5:
+                surface['n_spanwise'] += int(float(values[5]))
+        elif keyword == 'CONT':
+            name = lines[idx + 1].split()[0]
+            if name not in geometry['controls']:
+                geometry['controls'].append(name)
+    return geometry
+
+
+def read_cases(file_name):
+    """Reads the name, parameters and states of all cases in an AVL case file"""
+    cases = []
+    with open(file_name) as case_file:
+        for line in case_file:
+            if 'Run case' in line:
+                cases.append({'name': line.split(':', 1)[1].strip(), 'parameters': {}, 'states': {}})
+            elif '->' in line and cases:
+                name, value = line.split('->')[0].strip(), line.split('=')[-1].strip()
+                cases[-1]['parameters'][name] = float(value)
+            elif '=' in line and cases:
+                name, value = line.split('=', 1)
+                cases[-1]['states'][name.strip()] = float(value.split()[0])
+    return cases
+
+
+class FakeAnalysis(object):
+    """Lifting-line estimates of one case, formatted as the AVL output files"""
+
+    def __init__(self, geometry, case):
+        self.geometry = geometry
+        self.case = case
+
+        n_chordwise = os.environ.get('FAKEAVL_CHORDWISE')
+        n_spanwise = os.environ.get('FAKEAVL_SPANWISE')
+        self.surfaces = []
+        for surface in geometry['surfaces']:
+            surface = dict(surface)
+            surface['n_chordwise'] = int(n_chordwise) if n_chordwise else max(1, surface['n_chordwise'])
+            surface['n_spanwise'] = int(n_spanwise) if n_spanwise else max(1, surface['n_spanwise'])
+            self.surfaces.append(surface)
+            if surface['y_duplicate']:
+                self.surfaces.append(dict(surface, name=surface['name'] + ' (YDUP)'))
+
+        parameters = case['parameters']
+        self.alpha = parameters.get('alpha', 0.0)
+        self.beta = parameters.get('beta', 0.0)
+
+        aspect_ratio = geometry['Bref'] ** 2 / geometry['Sref']
+        cl_alpha = 2 * math.pi * aspect_ratio / (2 + aspect_ratio)
+        self.cl = cl_alpha * math.radians(self.alpha + 2.0)
+        self.cd_ind = self.cl ** 2 / (math.pi * aspect_ratio * 0.95)
+        self.cd = self.cd_ind + case['states'].get('CDo', 0.0)
+        self.cm = -0.05 - 0.1 * self.cl
+
+    @staticmethod
+    def _format_vars(pairs):
+        return "  " + "     ".join("{0:<5} = {1:10.5f}".format(name, value) for name, value in pairs) + "\n"
+
+    def _get_header(self, title):
+        g = self.geometry
+        text = SEPARATOR + " Vortex Lattice Output -- {0}\n\n".format(title)
+        text += " Configuration: {0}\n".format(g['name'])
+        text += "     # Surfaces = {0:3d}\n".format(len(self.surfaces))
+        text += "     # Strips   = {0:3d}\n".format(sum(s['n_spanwise'] for s in self.surfaces))
+        text += "     # Vortices = {0:3d}\n\n".format(sum(s['n_spanwise'] * s['n_chordwise'] for s in self.surfaces))
+        text += self._format_vars([('Sref', g['Sref']), ('Cref', g['Cref']), ('Bref', g['Bref'])])
+        text += self._format_vars([('Xref', g['ref'][0]), ('Yref', g['ref'][1]), ('Zref', g['ref'][2])])
+        return text + "\n Standard axis orientation,  X fwd, Z down\n\n"
+
+    def _get_totals(self):
+        alpha = math.radians(self.alpha)
+        text = " Run case: {0}\n\n".format(self.case['name'])
+        text += self._format_vars([('Alpha', self.alpha), ('pb/2V', 0.0), ("p'b/2V", 0.0)])
+        text += self._format_vars([('Beta', self.beta), ('qc/2V', 0.0)])
+        text += self._format_vars([('Mach', 0.0), ('rb/2V', 0.0), ("r'b/2V", 0.0)])
+        text += "\n"
+        text += self._format_vars([('CXtot', self.cl * math.sin(alpha) - self.cd * math.cos(alpha)), ('Cltot', 0.0),
+                                   ("Cl'tot", 0.0)])
+        text += self._format_vars([('CYtot', 0.0), ('Cmtot', self.cm)])
+        text += self._format_vars([('CZtot', -self.cl * math.cos(alpha) - self.cd * math.sin(alpha)), ('Cntot', 0.0),
+                                   ("Cn'tot", 0.0)])
+        text += "\n"
+        text += self._format_vars([('CLtot', self.cl)])
+        text += self._format_vars([('CDtot', self.cd)])
+        text += self._format_vars([('CDvis', self.cd - self.cd_ind), ('CDind', self.cd_ind)])
+        text += self._format_vars([('CLff', self.cl), ('CDff', self.cd_ind)])
+        text += self._format_vars([('CYff', 0.0), ('e', 0.95)])
+        text += "\n"
+        for control in self.geometry['controls']:
+            text += "   {0:<15} = {1:10.5f}\n".format(control, self.case['parameters'].get(control, 0.0))
+        return text + SEPARATOR
+
+    def get_totals(self):
+        return self._get_header('Total Forces') + self._get_totals()
+
+    def get_surface_forces(self):
+        share = 1.0 / max(1, len(self.surfaces))
+        text = self._get_header('Surface Forces')
+        text += "  n      Area     CL      CD      Cm      CY      Cn      Cl     CDi     CDv\n"
+        for idx, surface in enumerate(self.surfaces):
+            values = [self.geometry['Sref'] * share, self.cl * share, self.cd * share, self.cm * share, 0.0, 0.0, 0.0,
+                      self.cd_ind * share, (self.cd - self.cd_ind) * share]
+            text += "{0:4d}".format(idx + 1) + "".join(" {0:8.4f}".format(value) for value in values)
+            text += "     {0}\n".format(surface['name'])
+        return text + "\n"
+
+    def _get_loading(self, eta):
+        # elliptic spanwise loading, normalized such that the mean equals the total lift coefficient
+        return self.cl * 4.0 / math.pi * math.sqrt(max(0.0, 1.0 - eta ** 2))
+
+    def get_strip_forces(self):
+        g = self.geometry
+        text = self._get_header('Strip Forces')
+        strip = 1
+        for idx, surface in enumerate(self.surfaces):
+            n = surface['n_spanwise']
+            text += "  Surface # {0:<4} {1}\n".format(idx + 1, surface['name'])
+            text += "     # Chordwise = {0:2d}   # Spanwise = {1:2d}     First strip = {2:2d}\n".format(
+                surface['n_chordwise'], n, strip)
+            text += "     Surface area Ssurf = {0:10.4f}     Ave. chord Cave = {1:10.4f}\n\n".format(
+                g['Sref'] / max(1, len(self.surfaces)), g['Cref'])
+            text += " Strip Forces referred to Strip Area, Chord\n"
+            text += "    j     Yle    Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4" \
+                    "    cm_LE  C.P.x/c\n"
+            sign = -1.0 if '(YDUP)' in surface['name'] else 1.0
+            for j in range(n):
+                eta = (j + 0.5) / n
+                cl = self._get_loading(eta)
+                chord = g['Cref'] * (1.2 - 0.4 * eta)
+                values = [sign * eta * g['Bref'] / 2.0, chord, chord * g['Bref'] / 2.0 / n, chord * cl,
+                          -cl / (math.pi * 10.0), cl, cl, 0.0, 0.0, -0.1, -0.1 - 0.25 * cl, 0.25]
+                text += "  {0:3d}".format(strip) + "".join(" {0:8.4f}".format(value) for value in values) + "\n"
+                strip += 1
+            text += SEPARATOR + "\n"
+        return text
+
+    def get_element_forces(self):
+        g = self.geometry
+        text = self._get_header('Element Forces') + " Vortex Strengths (by surface, by strip)\n\n"
+        strip = 1
+        vortex = 1
+        for idx, surface in enumerate(self.surfaces):
+            n, m = surface['n_spanwise'], surface['n_chordwise']
+            text += "  Surface # {0:<4} {1}\n".format(idx + 1, surface['name'])
+            text += "     # Chordwise = {0:2d}   # Spanwise = {1:2d}     First strip = {2:2d}\n\n".format(m, n, strip)
+            sign = -1.0 if '(YDUP)' in surface['name'] else 1.0
+            for j in range(n):
+                eta = (j + 0.5) / n
+                chord = g['Cref'] * (1.2 - 0.4 * eta)
+                text += " Strip # {0:3d}     # Chordwise = {1:2d}   First Vortex = {2:4d}\n".format(strip, m, vortex)
+                text += "    Xle = {0:10.4f}   Ave. Chord = {1:10.4f}\n\n".format(0.0, chord)
+                text += "    I        X           Y           Z           DX        Slope        dCp\n"
+                for i in range(m):
+                    xi = (i + 0.5) / m
+                    d_cp = self._get_loading(eta) * 2.0 / math.pi * math.sqrt((1.0 - xi) / xi)
+                    values = [xi * chord, sign * eta * g['Bref'] / 2.0, 0.0, chord / m, 0.0, d_cp]
+                    text += "  {0:3d}".format(vortex) + "".join(" {0:11.5f}".format(value) for value in values)
+                    text += "\n"
+                    vortex += 1
+                text += "\n"
+                strip += 1
+        return text
+
+    def _get_derivatives(self, title, names, axis_names):
+        controls = self.geometry['controls']
+        aspect_ratio = self.geometry['Bref'] ** 2 / self.geometry['Sref']
+        cl_alpha = 2 * math.pi * aspect_ratio / (2 + aspect_ratio)
+
+        text = " {0}\n\n".format(title)
+        text += "                             alpha                beta\n"
+        text += "                  ----------------     ----------------\n"
+        for force, name in zip(axis_names, names):
+            alpha_value = {'CL': cl_alpha, 'Cm': -0.1 * cl_alpha, 'CX': 0.1, 'CZ': -cl_alpha}.get(name, 0.0)
+            text += " {0:<12}|    {1}a = {2:10.6f}     {1}b = {3:10.6f}\n".format(force, name, alpha_value, 0.0)
+        text += "\n"
+
+        if controls:
+            text += "               " + "".join("{0:>12}     d{1:<3}".format(control, idx + 1)
+                                                for idx, control in enumerate(controls)) + "\n"
+            for force, name in zip(axis_names, names):
+                text += " {0:<12}|".format(force) + "".join(
+                    "   {0}d{1} = {2:10.6f}".format(name, idx + 1, 0.01) for idx in range(len(controls))) + "\n"
+            text += "\n"
+        return text
+
+    def get_stability_derivatives(self):
+        text = self._get_header('Stability Derivatives') + self._get_totals() + "\n"
+        text += self._get_derivatives('Stability-axis derivatives...', ['CL', 'CY', "Cl'", 'Cm', "Cn'"],
+                                      ["z' force CL", 'y  force CY', "x' mom.  Cl'", 'y  mom.  Cm', "z' mom.  Cn'"])
+        text += " Neutral point  Xnp = {0:10.6f}\n\n".format(self.geometry['ref'][0] + 0.1 * self.geometry['Cref'])
+        return text + SEPARATOR
+
+    def get_body_derivatives(self):
+        text = self._get_header('Body-axis Derivatives') + self._get_totals() + "\n"
+        text += self._get_derivatives('Geometry-axis derivatives...', ['CX', 'CY', 'CZ', 'Cl', 'Cm', 'Cn'],
+                                      ['x force CX', 'y force CY', 'z force CZ', 'x mom.  Cl', 'y mom.  Cm',
+                                       'z mom.  Cn'])
+        return text + SEPARATOR
+
+    def get_eigenvalues(self):
+        """Textbook estimates of the short period, phugoid, dutch roll, roll and spiral modes"""
+        states = dict(self.case['states'])
+        g = self.geometry
+        velocity = states.get('velocity', 0.0) or 10.0
+        q_s = 0.5 * states.get('density', 1.225) * velocity ** 2 * g['Sref']
+        aspect_ratio = g['Bref'] ** 2 / g['Sref']
+        cl_alpha = 2 * math.pi * aspect_ratio / (2 + aspect_ratio)
+
+        def pair(frequency, damping):
+            real = -damping * frequency
+            imag = frequency * math.sqrt(1.0 - damping ** 2)
+            return [(real, imag), (real, -imag)]
+
+        short_period = math.sqrt(0.1 * cl_alpha * q_s * g['Cref'] / states.get('Iyy', 1.0))
+        phugoid = math.sqrt(2.0) * states.get('grav.acc.', 9.81) / velocity
+        dutch_roll = math.sqrt(0.05 * q_s * g['Bref'] / states.get('Izz', 1.0))
+        roll = -0.5 * q_s * g['Bref'] ** 2 / (4.0 * velocity * states.get('Ixx', 1.0))
+        return pair(short_period, 0.5) + pair(phugoid, 0.05) + pair(dutch_roll, 0.1) + [(roll, 0.0), (-0.01, 0.0)]
+
+    def get_hinge_moments(self):
+        text = SEPARATOR + " Control Hinge Moments\n"
+        text += " (referred to    Sref = {0:8.4f}       Cref = {1:8.4f}    )\n\n".format(self.geometry['Sref'],
+                                                                                   self.geometry['Cref'])
+        text += " Control          Chinge\n"
+        for control in self.geometry['controls']:
+            text += " {0:<12} {1:11.4E}\n".format(control, -0.01 * self.cl)
+        return text + SEPARATOR
+
+
+OUTPUTS = {'ft': FakeAnalysis.get_totals, 'fn': FakeAnalysis.get_surface_forces,
+           'fs': FakeAnalysis.get_strip_forces, 'fe': FakeAnalysis.get_element_forces,
+           'st': FakeAnalysis.get_stability_derivatives, 'sb': FakeAnalysis.get_body_derivatives,
+           'hm': FakeAnalysis.get_hinge_moments}
+
+
+def main():
+    write(" " + "=" * 63 + "\n Amateur Vortex Lattice Program (stand-in)\n " + "=" * 63 + "\n\n" + TOP_PROMPT)
+
+    lines = iter(sys.stdin.readline, '')
+    geometry, cases = None, []
+    in_oper, in_mode, case_nr = False, False, 1
+    eigenvalues = dict()
+
+    for line in lines:
+        command = line.strip()
+        words = command.split()
+
+        if in_mode:
+            keyword = words[0].lower() if words else ''
+            if command == '':
+                in_mode = False
+                write(TOP_PROMPT)
+                continue
+            elif command.isdigit():
+                case_nr = int(command)
+            elif keyword == 'n':
+                eigenvalues[case_nr] = FakeAnalysis(geometry, cases[case_nr - 1]).get_eigenvalues()
+            elif keyword == 'w':
+                write(" Enter eigenvalue output filename: ")
+                with open(next(lines).strip(), 'w') as output_file:
+                    output_file.write("#\n# " + geometry['name'] + "\n#\n#   run    Re(eigenvalue)   Im(eigenvalue)\n")
+                    for number in sorted(eigenvalues):
+                        for real, imag in eigenvalues[number]:
+                            output_file.write("  {0:4d}  {1:16.7E} {2:16.7E}\n".format(number, real, imag))
+            write(MODE_PROMPT)
+            continue
+
+        if not in_oper:
+            keyword = words[0].lower() if words else ''
+            if keyword == 'quit':
+                break
+            elif keyword == 'load':
+                geometry = read_geometry(command[len(words[0]):].strip())  # file names may contain spaces
+            elif keyword == 'case':
+                cases = read_cases(command[len(words[0]):].strip())
+            elif keyword == 'oper':
+                in_oper = True
+                write(OPER_PROMPT.format(case_nr, max(1, len(cases))))
+                continue
+            elif keyword == 'mode':
+                in_mode = True
+                write(MODE_PROMPT)
+                continue
+            write(TOP_PROMPT)
+            continue
+
+        if command == '':
+            in_oper = False
+            write(TOP_PROMPT)
+        elif command.isdigit():
+            case_nr = int(command)
+            write(OPER_PROMPT.format(case_nr, max(1, len(cases))))
+        elif command.lower() in OUTPUTS:
+            write(" Enter forces output file: ")
+            file_name = next(lines).strip()
+            if os.path.exists(file_name):
+                write(" File exists.  Overwrite?  Y\n")
+                if next(lines).strip().lower().startswith('n'):
+                    write(OPER_PROMPT.format(case_nr, len(cases)))
+                    continue
+            with open(file_name, 'w') as output_file:
+                output_file.write(OUTPUTS[command.lower()](FakeAnalysis(geometry, cases[case_nr - 1])))
+            write(OPER_PROMPT.format(case_nr, len(cases)))
+        else:
+            # e.g. 'x' (execute), the fake analysis is done while writing
+            write(OPER_PROMPT.format(case_nr, max(1, len(cases))))
+
+
+if __name__ == '__main__':
+    main()
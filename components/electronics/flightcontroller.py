@@ -11,6 +11,9 @@ from directories import *
 __author__ = ["Nelson Johnson"]
 __all__ = ["FlightController"]
 
+#: Navio2 flight computer power in SI Watt [W], the average voltage (5V) times the average current (150mA)
+NAVIO_POWER = 0.15 * 5
+
 
 class FlightController(Component):
     """ This class will create the Navio2 flight controller geometry. The dimensions are at https://emlid.com/navio/ .
@@ -86,7 +89,7 @@ class FlightController(Component):
         :return: Flight Computer Power
         :rtype: float
         """
-        return 0.15*5
+        return NAVIO_POWER
 
     @Attribute
     def component_type(self):
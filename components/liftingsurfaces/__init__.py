@@ -3,3 +3,4 @@ from horizontalstab import HorizontalStabilizer
 from scissorplot import ScissorPlot
 from verticalstab import VerticalStabilizer
 from compoundstab import CompoundStabilizer
+from tailaero import TailAerodynamics
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Response-surface surrogate of the wing aerodynamic coefficients. A sweep of AVL (or built-in vortex-lattice)
+analyses over aspect ratio, taper, twist and dihedral is stored for every airfoil, a full cubic polynomial is then
+fitted through the samples. Inside the trust region (the bounding box of the samples) a query costs a few microseconds,
+outside it the caller falls back to a real analysis.
+"""
+
+import itertools
+import numpy as np
+from math import sqrt, tan, radians
+from directories import *
+
+#  Import AVL wrapper written by Reno El Mendorp. https://github.com/renoelmendorp/AVLWrapper
+from avl import Geometry, Surface, Section, Point, Spacing, Session, Case, FileAirfoil, VortexLatticeSession
+
+__author__ = "Şan Kılkış"
+__all__ = ["WingAeroSurrogate", "get_surrogate", "wing_coefficients"]
+
+#: Design variables of the surrogate, in the order of a query point
+VARIABLES = ('aspect_ratio', 'taper', 'twist', 'dihedral')
+
+#: Fitted coefficients: lift curve slope [1/rad], C_L at zero alpha, C_m about the a.c. at zero C_L and dC_m/dC_L
+OUTPUTS = ('cl_alpha', 'cl_0', 'cm_0', 'cm_cl')
+
+#: Sampled ranges of the design variables, within the Input validators of LiftingSurface
+BOUNDS = {'aspect_ratio': (4.0, 20.0), 'taper': (0.2, 1.0), 'twist': (-5.0, 5.0), 'dihedral': (-10.0, 10.0)}
+
+#: Order of the polynomial response surface
+ORDER = 3
+
+#: Coefficients which follow lifting-line behaviour, these are fitted against 1/AR instead of AR
+INVERSE_ASPECT_RATIO = ('cl_alpha', 'cl_0')
+
+#: Maximum leave-one-out RMS error of each coefficient to trust the fit
+MAX_ERRORS = {'cl_alpha': 0.05, 'cl_0': 0.01, 'cm_0': 0.01, 'cm_cl': 0.01}
+
+#: Angles of attack of every sample, inside the linear range of the lift curve
+SAMPLE_ALPHAS = np.linspace(-4.0, 8.0, 5)
+
+#: Directory in which the sweeps are stored, one file per airfoil and solver
+SURROGATE_DIR = os.path.join(DIRS['USER_DIR'], 'results', 'surrogates')
+
+
+def wing_coefficients(aspect_ratio, taper, twist, dihedral, airfoil_file, solver='vlm'):
+    """ Solves a wing of unit planform area, laid out as in :class:`Wing` (unswept trailing edge, same panelling) and
+    returns the coefficients in :data:`OUTPUTS`. Moments are taken about the quarter-chord point of the MAC.
+
+    :return: Dictionary with the fitted coefficients of a single wing
+    :rtype: dict
+    """
+    span = sqrt(aspect_ratio)
+    semi_span = span / 2.0
+    root_chord = 2.0 / ((1 + taper) * span)
+    tip_offset = root_chord - root_chord * taper
+
+    # Analytical MAC of a straight tapered wing
+    mac = 2.0 / 3.0 * root_chord * (1 + taper + taper ** 2) / (1 + taper)
+    y_mac = semi_span * (1 + 2 * taper) / (3 * (1 + taper))
+    x_ac = y_mac * tip_offset / semi_span + 0.25 * mac
+
+    surface = Surface(name="Wing",
+                      n_chordwise=12,
+                      chord_spacing=Spacing.cosine,
+                      n_spanwise=16,
+                      span_spacing=Spacing.neg_sine,
+                      y_duplicate=0.0,
+                      sections=[Section(leading_edge_point=Point(0, 0, 0),
+                                        chord=root_chord,
+                                        airfoil=FileAirfoil(airfoil_file)),
+                                Section(leading_edge_point=Point(tip_offset, semi_span,
+                                                                 semi_span * tan(radians(dihedral))),
+                                        chord=root_chord * taper,
+                                        angle=twist,
+                                        airfoil=FileAirfoil(airfoil_file))])
+    geometry = Geometry(name="Surrogate Wing",
+                        reference_area=1.0,
+                        reference_chord=mac,
+                        reference_span=span,
+                        reference_point=Point(0.0, 0.0, 0.0),
+                        surfaces=[surface])
+    cases = [Case(name='alpha%s' % i, alpha=alpha, X_cg=x_ac) for i, alpha in enumerate(SAMPLE_ALPHAS)]
+
+    if solver == 'vlm':
+        session = VortexLatticeSession(geometry=geometry, cases=cases)
+    else:
+        session = Session(geometry=geometry, cases=cases, outputs=['Totals'])
+    results = session.get_results()
+    session.reset()
+
+    cl = np.array([results[case.name]['Totals']['CLtot'] for case in cases])
+    cm = np.array([results[case.name]['Totals']['Cmtot'] for case in cases])
+    cl_alpha, cl_0 = np.polyfit(np.radians(SAMPLE_ALPHAS), cl, 1)
+    cm_cl, cm_0 = np.polyfit(cl, cm, 1)
+    return {'cl_alpha': cl_alpha, 'cl_0': cl_0, 'cm_0': cm_0, 'cm_cl': cm_cl}
+
+
+class WingAeroSurrogate(object):
+    """ Cubic response surface of the wing coefficients of a single airfoil. The samples are stored in
+    :data:`SURROGATE_DIR`, such that the sweep is only solved once per airfoil and solver.
+
+    :param airfoil_type: Folder of the airfoil within 'airfoils'
+    :type airfoil_type: str
+
+    :param airfoil_choice: Filename of the airfoil (without extension)
+    :type airfoil_choice: str
+
+    :param solver: Solver of the sweep, 'avl' or 'vlm'
+    :type solver: str
+
+    :param n_samples: Number of samples of a new sweep on top of the 16 corners, the cubic fit has 35 terms
+    :type n_samples: int
+
+    :param max_errors: Maximum leave-one-out error per coefficient to trust the fit, defaults to :data:`MAX_ERRORS`
+    :type max_errors: dict or NoneType
+    """
+
+    def __init__(self, airfoil_type, airfoil_choice, solver='vlm', n_samples=64, max_errors=None, directory=None):
+        self.airfoil_type = airfoil_type
+        self.airfoil_choice = airfoil_choice
+        self.solver = solver
+        self.n_samples = n_samples
+        self.max_errors = max_errors if max_errors is not None else MAX_ERRORS
+        self.directory = directory if directory is not None else SURROGATE_DIR
+
+        self.points, self.values = self.load_samples()
+        self.lower = self.points.min(axis=0)
+        self.upper = self.points.max(axis=0)
+        self.exponents = self.get_exponents(len(VARIABLES))
+        self.coefficients, self.errors = self.fit()
+        self.accurate = all(self.errors[name] <= self.max_errors[name] for name in OUTPUTS)
+
+    @property
+    def airfoil_file(self):
+        return get_dir(os.path.join('airfoils', self.airfoil_type, '%s.dat' % self.airfoil_choice))
+
+    @property
+    def sample_file(self):
+        return os.path.join(self.directory, '%s_%s_%s.npz' % (self.airfoil_type, self.airfoil_choice, self.solver))
+
+    def load_samples(self):
+        """ Loads the stored sweep of this airfoil, or solves and stores a new one.
+
+        :return: Sample points (n x 4) and the coefficients at these points (n x 4)
+        :rtype: tuple
+        """
+        if os.path.isfile(self.sample_file):
+            data = np.load(self.sample_file)
+            return data['points'], data['values']
+
+        points = self.get_sample_points(self.n_samples)
+        values = np.array([[wing_coefficients(*point, airfoil_file=self.airfoil_file, solver=self.solver)[name]
+                            for name in OUTPUTS] for point in points])
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        np.savez(self.sample_file, points=points, values=values)
+        return points, values
+
+    @staticmethod
+    def get_sample_points(n_samples, seed=0):
+        """ Latin hypercube samples within :data:`BOUNDS`, the corners of the box are added such that the trust
+        region spans the full bounds.
+
+        :rtype: numpy.ndarray
+        """
+        random = np.random.RandomState(seed)
+        n_vars = len(VARIABLES)
+        strata = (np.argsort(random.rand(n_samples, n_vars), axis=0) + random.rand(n_samples, n_vars)) / n_samples
+        corners = np.array(np.meshgrid(*[[0.0, 1.0]] * n_vars)).reshape(n_vars, -1).T
+        unit = np.vstack((corners, strata))
+        lower = np.array([BOUNDS[name][0] for name in VARIABLES])
+        upper = np.array([BOUNDS[name][1] for name in VARIABLES])
+        return lower + unit * (upper - lower)
+
+    @staticmethod
+    def get_exponents(n_vars, order=ORDER):
+        """ Exponents of the monomials of a full polynomial, i.e. all products of up to `order` variables.
+
+        :rtype: numpy.ndarray
+        """
+        exponents = [np.zeros(n_vars, dtype=int)]
+        for degree in range(1, order + 1):
+            for combination in itertools.combinations_with_replacement(range(n_vars), degree):
+                exponents.append(np.bincount(combination, minlength=n_vars))
+        return np.array(exponents)
+
+    def _basis(self, points, inverse_aspect_ratio):
+        # monomials of the variables scaled to [-1, 1], one row per point
+        points = np.array(np.atleast_2d(points), dtype=float)
+        lower, upper = self.lower.copy(), self.upper.copy()
+        if inverse_aspect_ratio:
+            points[:, 0] = 1.0 / points[:, 0]
+            lower[0], upper[0] = 1.0 / self.upper[0], 1.0 / self.lower[0]
+        u = 2.0 * (points - lower) / (upper - lower) - 1.0
+        return np.prod(u[:, np.newaxis, :] ** self.exponents[np.newaxis, :, :], axis=2)
+
+    def fit(self):
+        """ Least-squares fit of the response surface, per coefficient. The error estimate is the RMS leave-one-out
+        residual, obtained from the diagonal of the hat matrix without refitting.
+
+        :return: Polynomial coefficients and the leave-one-out error per output
+        :rtype: tuple
+        """
+        coefficients, errors = dict(), dict()
+        for idx, name in enumerate(OUTPUTS):
+            basis = self._basis(self.points, name in INVERSE_ASPECT_RATIO)
+            values = self.values[:, idx]
+            coefficients[name] = np.linalg.lstsq(basis, values, rcond=-1)[0]
+            residuals = values - np.dot(basis, coefficients[name])
+            leverage = np.sum(basis * np.dot(basis, np.linalg.pinv(np.dot(basis.T, basis))), axis=1)
+            errors[name] = float(np.sqrt(np.mean((residuals / (1.0 - np.minimum(leverage, 0.999))) ** 2)))
+        return coefficients, errors
+
+    def in_trust_region(self, point):
+        """ A query is trusted when it lies within the bounding box of the samples and the fit is accurate enough.
+
+        :rtype: bool
+        """
+        point = np.asarray(point, dtype=float)
+        return bool(self.accurate and np.all(point >= self.lower) and np.all(point <= self.upper))
+
+    def predict(self, point):
+        """ Evaluates the response surface at a point (aspect_ratio, taper, twist, dihedral).
+
+        :return: Dictionary with the coefficients in :data:`OUTPUTS`, None outside the trust region
+        :rtype: dict or NoneType
+        """
+        if not self.in_trust_region(point):
+            return None
+        bases = {False: self._basis(point, False), True: self._basis(point, True)}
+        return {name: float(np.dot(bases[name in INVERSE_ASPECT_RATIO][0], self.coefficients[name]))
+                for name in OUTPUTS}
+
+
+#: Surrogates loaded in this Python session, by airfoil and solver
+_SURROGATES = {}
+
+
+def get_surrogate(airfoil_type, airfoil_choice, solver='vlm'):
+    """ Returns the (shared) surrogate of an airfoil, it is created on the first request.
+
+    :rtype: WingAeroSurrogate
+    """
+    key = (airfoil_type, airfoil_choice, solver)
+    if key not in _SURROGATES:
+        _SURROGATES[key] = WingAeroSurrogate(airfoil_type, airfoil_choice, solver=solver)
+    return _SURROGATES[key]
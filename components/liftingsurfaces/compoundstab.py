@@ -9,6 +9,9 @@ from user import MyColors
 from definitions import ExternalBody
 from directories import *
 
+#  Import AVL wrapper written by Reno El Mendorp. https://github.com/renoelmendorp/AVLWrapper
+from avl import Surface, Section, Spacing, FileAirfoil, Control, Point as AVLPoint
+
 __author__ = ["Nelson Johnson", "San Kilkis"]
 __all__ = ["CompoundStabilizer"]
 
@@ -90,6 +93,9 @@ class CompoundStabilizer(ExternalBody):
     #: Changes the number of ply's of carbon fiber http://www.ijera.com/papers/Vol4_issue5/Version%202/J45025355.pdf
     ply_number = Input(3, validator=val.Instance(int))
 
+    #: Hinge location of the elevator as a fraction of the HT chord, the elevator spans the entire HT
+    elevator_hinge = Input(0.7, validator=val.Range(0.5, 0.95))
+
     @Part
     def stabilizer_h(self):
         """ This is an instantiation of the :class:`HorizontalStabilizer` class with the required planform area from the
@@ -265,6 +271,71 @@ class CompoundStabilizer(ExternalBody):
                              reference_point=self.position,
                              vector1=Vector(1, 0, 0), vector2=Vector(0, 0, 1))
 
+# --- AVL Geometry: ----------------------------------------------------------------------------------------------------
+#  In this block, the AVL surfaces of the tail are defined, these are added to the wing surface for full-aircraft runs.
+
+    @Attribute(private=True)
+    def elevator(self):
+        """ The elevator control of the HT sections, a positive deflection is trailing edge down on both sides.
+
+        :return: AVL Elevator Control
+        :rtype: Control
+        """
+        return Control(name='elevator', gain=1.0, x_hinge=self.elevator_hinge, duplicate_sign=1.0)
+
+    def _avl_section(self, surface, leading_edge_point, chord, angle=0.0, controls=None):
+        """ Creates an AVL section with the airfoil of a tail surface """
+        return Section(leading_edge_point=leading_edge_point,
+                       chord=chord,
+                       angle=angle,
+                       controls=controls,
+                       airfoil=FileAirfoil(get_dir(os.path.join('airfoils', surface.airfoil_type,
+                                                                '%s.dat' % surface.airfoil_choice))))
+
+    @Attribute(private=True)
+    def ht_surface(self):
+        """ The AVL surface of the HT with the elevator, mirrored about the symmetry plane at y=0.
+
+        :return: AVL HT Surface
+        :rtype: Surface
+        """
+        ht = self.stabilizer_h
+        root = ht.position
+        return Surface(name="Horizontal Tail",
+                       n_chordwise=8,
+                       chord_spacing=Spacing.cosine,
+                       n_spanwise=10,
+                       span_spacing=Spacing.neg_sine,
+                       y_duplicate=0.0,
+                       sections=[self._avl_section(ht, AVLPoint(root.x, 0.0, root.z), ht.root_chord,
+                                                   controls=[self.elevator]),
+                                 self._avl_section(ht, AVLPoint(root.x + ht.tip_offset, ht.semi_span, root.z),
+                                                   ht.tip_chord, angle=ht.twist, controls=[self.elevator])])
+
+    def _vt_surface(self, vt, name):
+        """ The AVL surface of a VT, which extends upwards from its root at the HT tip """
+        root = vt.position
+        return Surface(name=name,
+                       n_chordwise=8,
+                       chord_spacing=Spacing.cosine,
+                       n_spanwise=6,
+                       span_spacing=Spacing.cosine,
+                       sections=[self._avl_section(vt, AVLPoint(root.x, root.y, root.z), vt.root_chord),
+                                 self._avl_section(vt, AVLPoint(root.x + vt.tip_offset, root.y, root.z + vt.semi_span),
+                                                   vt.tip_chord, angle=vt.twist)])
+
+    @Attribute
+    def avl_surfaces(self):
+        """ The AVL surfaces of the HT (with elevator) and both VTs in the aircraft axis system, i.e. with the wing root
+        leading edge at the origin. Combined with the surface of the :class:`Wing` these form the full aircraft.
+
+        :return: AVL Tail Surfaces
+        :rtype: list
+        """
+        return [self.ht_surface,
+                self._vt_surface(self.stabilizer_vright, "Right Vertical Tail"),
+                self._vt_surface(self.stabilizer_vleft, "Left Vertical Tail")]
+
     @Attribute
     def component_type(self):
         """ This attribute names the component 'ct' for compound stabilizer.
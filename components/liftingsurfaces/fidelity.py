@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Fidelity tiers of the wing aerodynamic coefficients. Early in a design loop (or a sweep) the lift curve slope and
+the pitching moment are taken from analytic estimates: the Helmbold/DATCOM lift curve slope and the DATCOM moment of a
+straight tapered wing with the thin-airfoil moment of its airfoil. Once the design changes less than a threshold
+between two queries, it is promoted to the lattice (AVL or vortex-lattice) solution. Every value is logged with the
+tier that produced it.
+"""
+
+import numpy as np
+from math import pi, sqrt, tan, cos, atan, radians
+
+#  Import AVL wrapper written by Reno El Mendorp. https://github.com/renoelmendorp/AVLWrapper
+from avl.avlwrapper.vlm import get_camber_slope
+
+__author__ = "Şan Kılkış"
+__all__ = ["FidelityManager", "helmbold_lift_slope", "thin_airfoil_moment", "datcom_moment"]
+
+#: Tiers in order of increasing fidelity (and cost)
+TIERS = ('analytic', 'lattice')
+
+
+def sweep_at(le_sweep, aspect_ratio, taper, chord_fraction):
+    """ Sweep angle of the line at a fraction of the chord of a straight tapered wing.
+
+    :return: Sweep angle in radians
+    :rtype: float
+    """
+    return atan(tan(radians(le_sweep)) - 4.0 * chord_fraction / aspect_ratio * (1 - taper) / (1 + taper))
+
+
+def helmbold_lift_slope(aspect_ratio, half_chord_sweep, section_slope=2 * pi):
+    """ Lift curve slope of a finite wing by the Helmbold equation in the DATCOM form (incompressible).
+
+    :return: Lift curve slope [1/rad]
+    :rtype: float
+    """
+    kappa = section_slope / (2 * pi)
+    return 2 * pi * aspect_ratio / (2 + sqrt((aspect_ratio / kappa) ** 2 * (1 + tan(half_chord_sweep) ** 2) + 4))
+
+
+def thin_airfoil_moment(airfoil):
+    """ Pitching moment about the quarter chord of an airfoil by thin-airfoil theory, from the slope of its camber line.
+
+    :return: Section moment coefficient C_m_ac [-]
+    :rtype: float
+    """
+    theta = np.linspace(0.0, pi, 201)
+    slope = get_camber_slope(airfoil, 0.5 * (1.0 - np.cos(theta)))
+    #  Fourier coefficients A_1 and A_2 of the camber slope, integrated by the trapezoidal rule
+    weights = np.full(len(theta), theta[1] - theta[0])
+    weights[[0, -1]] *= 0.5
+    a_1 = 2.0 / pi * np.sum(weights * slope * np.cos(theta))
+    a_2 = 2.0 / pi * np.sum(weights * slope * np.cos(2 * theta))
+    return float(pi / 4.0 * (a_2 - a_1))
+
+
+def datcom_moment(section_moment, aspect_ratio, quarter_chord_sweep):
+    """ Pitching moment about the aerodynamic center of an untwisted wing from the section moment (DATCOM).
+
+    :return: Wing moment coefficient C_m_ac [-]
+    :rtype: float
+    """
+    cos_sweep = cos(quarter_chord_sweep)
+    return section_moment * aspect_ratio * cos_sweep ** 2 / (aspect_ratio + 2 * cos_sweep)
+
+
+class FidelityManager(object):
+    """ Chooses the tier of every query by the largest relative change of the design (a vector of design variables)
+    since the previously recorded design with the same key, and keeps the log of all values. A manager is owned by the
+    object which compares consecutive designs (e.g. the UAV over its C.G. iterations), such that separate designs
+    never share their history.
+
+    :param verbose: Switch to print every logged value
+    :type verbose: bool
+    """
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.history = dict()
+        self.log = []
+
+    def peek_tier(self, key, design, threshold):
+        """ The 'lattice' tier when the design changed less than the threshold since the previously recorded design,
+        otherwise (and before the first record) the 'analytic' tier. The history is not changed, such that the tier
+        does not depend on how often (or in which order) it is queried.
+
+        :return: Tier and the largest relative change of the design
+        :rtype: tuple
+        """
+        design = np.asarray(design, dtype=float)
+        previous = self.history.get(key)
+
+        if previous is None or previous.shape != design.shape:
+            change = float('inf')
+        else:
+            change = float(np.max(np.abs(design - previous) / np.maximum(np.abs(previous), 1e-9)))
+        return ('lattice' if change <= threshold else 'analytic'), change
+
+    def record(self, key, quantity, tier, value, design=None):
+        """ Logs a value with the tier which produced it, and stores the design which produced it as the previous
+        design of the key.
+
+        :return: The value
+        """
+        if design is not None:
+            self.history[key] = np.asarray(design, dtype=float)
+        self.log.append({'key': key, 'quantity': quantity, 'tier': tier, 'value': value})
+        if self.verbose:
+            print('%s %s = %1.5f (%s)' % (key, quantity, value, tier))
+        return value
+
+    def summary(self):
+        """ Number of logged values per tier.
+
+        :rtype: dict
+        """
+        counts = dict((tier, 0) for tier in TIERS)
+        for entry in self.log:
+            counts[entry['tier']] = counts.get(entry['tier'], 0) + 1
+        return counts
+
+    def reset(self):
+        self.history = dict()
+        self.log = []
@@ -82,6 +82,12 @@ class ScissorPlot(Base):
 
     :param lhc: Derived input of the non-dimensionalized tail arm based on configuration choice
     :type lhc: float
+
+    :param cla_h_in: Lift curve slope of the HT from a lattice analysis, None uses the thin-airfoil estimate
+    :type cla_h_in: float or NoneType
+
+    :param downwash_in: Downwash gradient at the HT from a lattice analysis, None uses the empirical estimate
+    :type downwash_in: float or NoneType
     """
 
     __icon__ = os.path.join(DIRS['ICON_DIR'], 'stability.png')
@@ -147,6 +153,12 @@ class ScissorPlot(Base):
     #: Below is a switch to determine the configuration.
     configuration = Input('conventional', validator=val.OneOf(['conventional']))
 
+    #: Lift curve slope of the HT from a lattice analysis (see :class:`TailAerodynamics`), overrules :attr:`cla_h`
+    cla_h_in = Input(None)
+
+    #: Downwash gradient at the HT from a lattice analysis (see :class:`TailAerodynamics`), overrules :attr:`downwash_a`
+    downwash_in = Input(None)
+
     @Input
     def lhc(self):
         """ Derived input of the non-dimensionalized tail arm based on configuration choice
@@ -167,21 +179,27 @@ class ScissorPlot(Base):
 
     @Attribute
     def cla_h(self):
-        """ This attribute estimates the lift slope of a low sweep, low speed three dimensional wing.
+        """ This attribute estimates the lift slope of a low sweep, low speed three dimensional wing, unless it is given
+        by :attr:`cla_h_in`.
 
         :return: HT lift curve slope
         :rtype: float
         """
+        if self.cla_h_in is not None:
+            return self.cla_h_in
         cla_h = self.a_0/(1+(self.a_0 / (pi * self.AR_h * self.e_h)))
         return cla_h
 
     @Attribute
     def downwash_a(self):
-        """ This attribute estimates the wings change in downwash with angle of attack.
+        """ This attribute estimates the wings change in downwash with angle of attack, unless it is given by
+        :attr:`downwash_in`.
 
         :return: Downwash gradient of main wing
         :rtype: float
         """
+        if self.downwash_in is not None:
+            return self.downwash_in
         deda = 4/(self.AR + 2)
         return deda
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Lattice analyses of the horizontal tail, which feed the :class:`ScissorPlot` with the HT lift curve slope and the
+downwash gradient. The scope is limited to the HT: the VT is not analysed, as no tail sizing input uses its lattice
+results (the VT is sized by its volume coefficient). The analysis is opt-in, see :attr:`UAV.tail_analysis`, by default
+the scissor plot uses its thin-airfoil estimates.
+"""
+
+#  Required Modules
+from parapy.core import *
+from math import *
+from directories import *
+from wing import Wing, get_avl_cache
+
+#  Import AVL wrapper written by Reno El Mendorp. https://github.com/renoelmendorp/AVLWrapper
+from avl import Geometry, Surface, Section, Point, Spacing, Session, Case, FileAirfoil, VortexLatticeSession
+
+__author__ = "Şan Kılkış"
+__all__ = ["TailAerodynamics"]
+
+
+class TailAerodynamics(Base):
+    """ Lattice analyses of the tail surfaces, which replace the thin-airfoil estimates of the :class:`ScissorPlot`.
+    Three sessions are solved at the same time in the background: the isolated HT (for its lift curve slope), the
+    isolated wing and the wing with the HT behind it. The downwash gradient at the tail follows from the lift of the HT
+    in the presence of the wing. As the HT is still to be sized by the scissor plot, it is analysed with a nominal
+    area, the slope and downwash gradient only weakly depend on the tail size.
+
+    :param wing_in: The instantiated wing (typically passed from myUAV)
+    :type wing_in: Wing
+
+    :param aspect_ratio_h: Aspect ratio of the HT
+    :type aspect_ratio_h: float
+
+    :param taper: Taper ratio of the HT
+    :type taper: float
+
+    :param lhc: Tail arm from the wing aerodynamic center to the HT aerodynamic center, non-dimensionalized by the MAC
+    :type lhc: float
+
+    :param shs: Nominal HT to wing area ratio of the downwash analysis
+    :type shs: float
+
+    :param airfoil_type: Folder of the tail airfoil within 'airfoils'
+    :type airfoil_type: str
+
+    :param airfoil_choice: Filename of the tail airfoil (without extension)
+    :type airfoil_choice: str
+
+    :param angles: The two angles of attack of the slope estimates in degrees
+    :type angles: list
+    """
+
+    __icon__ = os.path.join(DIRS['ICON_DIR'], 'ctail.png')
+
+    #: Instantiated Wing Object
+    wing_in = Input(Wing(), validator=val.Instance(Wing))
+
+    #: Aspect ratio of the HT
+    aspect_ratio_h = Input(5.0, validator=val.Positive())
+
+    #: Taper ratio of the HT
+    taper = Input(0.35, validator=val.Range(0.1, 1.0))
+
+    #: Tail arm from the wing aerodynamic center to the HT aerodynamic center, non-dimensionalized by the MAC
+    lhc = Input(3.0, validator=val.Instance(float))
+
+    #: Nominal HT to wing area ratio of the downwash analysis
+    shs = Input(0.2, validator=val.Positive())
+
+    #: Folder of the tail airfoil within 'airfoils'
+    airfoil_type = Input('symmetric', validator=val.OneOf(['cambered', 'reflexed', 'symmetric']))
+
+    #: Filename of the tail airfoil (without extension)
+    airfoil_choice = Input('NACA0012')
+
+    #: The two angles of attack of the slope estimates in degrees, within the linear range
+    angles = Input([0.0, 4.0])
+
+    @Attribute(private=True)
+    def airfoil(self):
+        """ The AVL airfoil of all tail sections.
+
+        :rtype: FileAirfoil
+        """
+        return FileAirfoil(get_dir(os.path.join('airfoils', self.airfoil_type, '%s.dat' % self.airfoil_choice)))
+
+    def _get_planform(self, area, aspect_ratio):
+        """ Root chord, tip chord and span of a tapered surface with an unswept trailing edge """
+        span = sqrt(aspect_ratio * area)
+        root_chord = 2.0 * area / ((1 + self.taper) * span)
+        return root_chord, root_chord * self.taper, span
+
+    def _get_mac(self, area, aspect_ratio):
+        """ Length of the MAC of a tapered surface and the distance of its aerodynamic center (the quarter chord point
+        of the MAC) behind the root leading edge, for an unswept trailing edge """
+        root_chord, tip_chord, span = self._get_planform(area, aspect_ratio)
+        mac = 2.0 / 3.0 * root_chord * (1 + self.taper + self.taper ** 2) / (1 + self.taper)
+        y_mac = span / 6.0 * (1 + 2 * self.taper) / (1 + self.taper)
+        x_le_mac = y_mac * (root_chord - tip_chord) / (span / 2.0)
+        return mac, x_le_mac + 0.25 * mac
+
+    def _get_ht_surface(self, area, x_le, z_le):
+        """ The AVL surface of an HT with the given planform area, mirrored about the symmetry plane """
+        root_chord, tip_chord, span = self._get_planform(area, self.aspect_ratio_h)
+        return Surface(name="Horizontal Tail",
+                       n_chordwise=8,
+                       chord_spacing=Spacing.cosine,
+                       n_spanwise=10,
+                       span_spacing=Spacing.neg_sine,
+                       y_duplicate=0.0,
+                       sections=[Section(leading_edge_point=Point(x_le, 0.0, z_le), chord=root_chord,
+                                         airfoil=self.airfoil),
+                                 Section(leading_edge_point=Point(x_le + root_chord - tip_chord, span / 2.0, z_le),
+                                         chord=tip_chord, airfoil=self.airfoil)])
+
+    @Attribute(private=True)
+    def ht_geom(self):
+        """ The isolated HT of unit planform area.
+
+        :return: AVL HT Geometry
+        :rtype: Geometry
+        """
+        span = self._get_planform(1.0, self.aspect_ratio_h)[2]
+        return Geometry(name="Horizontal Tail",
+                        reference_area=1.0,
+                        reference_chord=self._get_mac(1.0, self.aspect_ratio_h)[0],
+                        reference_span=span,
+                        reference_point=Point(0.0, 0.0, 0.0),
+                        surfaces=[self._get_ht_surface(1.0, 0.0, 0.0)])
+
+    def _get_wing_geom(self, name, surfaces):
+        """ An AVL geometry with the reference values of the wing """
+        return Geometry(name=name,
+                        reference_area=self.wing_in.s_req,
+                        reference_chord=self.wing_in.mac_length,
+                        reference_span=self.wing_in.semi_span * 2.0,
+                        reference_point=Point(0.0, 0.0, 0.0),
+                        surfaces=surfaces)
+
+    @Attribute(private=True)
+    def wing_tail_geom(self):
+        """ The wing with the nominal HT placed as in myUAV: the HT aerodynamic center one tail arm behind the wing
+        aerodynamic center, raised by the dihedral of the wing.
+
+        :return: AVL Wing and HT Geometry
+        :rtype: Geometry
+        """
+        area = self.shs * self.wing_in.s_req
+        span = self._get_planform(area, self.aspect_ratio_h)[2]
+        x_le = self.wing_in.aerodynamic_center.x + self.lhc * self.wing_in.mac_length - \
+            self._get_mac(area, self.aspect_ratio_h)[1]
+        z_le = span / 2.0 * sin(radians(self.wing_in.dihedral))
+        return self._get_wing_geom("Wing and Tail", [self.wing_in.wing_surface, self._get_ht_surface(area, x_le, z_le)])
+
+    def _get_session(self, geometry, name, **states):
+        """ A session of one case per angle, solved by the :attr:`Wing.aero_solver` and stored in the shared cache """
+        cases = [Case(name='%s%s' % (name, i), **dict(states, **{name: angle})) for i, angle in enumerate(self.angles)]
+        if self.wing_in.aero_solver == 'vlm':
+            return VortexLatticeSession(geometry=geometry, cases=cases, cache=get_avl_cache())
+        return Session(geometry=geometry, cases=cases, cache=get_avl_cache(), outputs=['Totals'])
+
+    @Attribute(private=True)
+    def sessions(self):
+        """ The sessions of all surfaces, started at the same time in the background.
+
+        :return: Running sessions by name
+        :rtype: dict
+        """
+        velocity = 1.2 * self.wing_in.stall_speed
+        sessions = {'ht': self._get_session(self.ht_geom, 'alpha', velocity=velocity),
+                    'wing': self._get_session(self._get_wing_geom("Main Wing", [self.wing_in.wing_surface]), 'alpha',
+                                              velocity=velocity, X_cg=self.wing_in.aerodynamic_center.x),
+                    'wing_tail': self._get_session(self.wing_tail_geom, 'alpha', velocity=velocity,
+                                                   X_cg=self.wing_in.aerodynamic_center.x)}
+        for session in sessions.values():
+            session.submit()
+        return sessions
+
+    @Attribute
+    def results(self):
+        """ Waits for all sessions and collects the totals per surface, ordered by angle.
+
+        :return: Dictionary with a list of AVL Totals per session name
+        :rtype: dict
+        """
+        results = dict()
+        for name, session in self.sessions.items():
+            session_results = session.result()
+            results[name] = [session_results[case.name]['Totals'] for case in session.cases]
+            session.reset()
+        return results
+
+    def _get_slope(self, name, coefficient, angle):
+        """ Slope of a coefficient between the two angles in [1/rad] """
+        totals = self.results[name]
+        return (totals[-1][coefficient] - totals[0][coefficient]) / \
+               (radians(totals[-1][angle]) - radians(totals[0][angle]))
+
+    @Attribute
+    def cla_h(self):
+        """ The lift curve slope of the isolated HT.
+
+        :return: HT lift curve slope [1/rad]
+        :rtype: float
+        """
+        return self._get_slope('ht', 'CLtot', 'Alpha')
+
+    @Attribute
+    def downwash_gradient(self):
+        """ The downwash gradient at the HT. The lift slope added by the HT (w.r.t. the wing area) is that of the
+        isolated HT, reduced by (1 - d_epsilon/d_alpha).
+
+        :return: Downwash gradient d_epsilon/d_alpha [-]
+        :rtype: float
+        """
+        tail_slope = self._get_slope('wing_tail', 'CLtot', 'Alpha') - self._get_slope('wing', 'CLtot', 'Alpha')
+        return 1.0 - tail_slope / (self.cla_h * self.shs)
+
+
+if __name__ == '__main__':
+    from parapy.gui import display
+
+    obj = TailAerodynamics(label='Tail Aerodynamics')
+    display(obj)
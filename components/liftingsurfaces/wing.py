@@ -12,14 +12,36 @@ from primitives import LiftingSurface
 from directories import *
 from definitions import *
 from user import MyColors
+from aerosurrogate import get_surrogate
+from fidelity import FidelityManager, sweep_at, helmbold_lift_slope, thin_airfoil_moment, datcom_moment
 
 #  Import AVL wrapper written by Reno El Mendorp. https://github.com/renoelmendorp/AVLWrapper
-from avl import Geometry, Surface, Section, Point, Spacing, Session, Case, FileAirfoil
+from avl import Geometry, Surface, Section, Point, Spacing, Session, Case, FileAirfoil, ResultCache, \
+    VortexLatticeSession, AdaptiveAlphaSession
 
 __author__ = "Nelson Johnson"
-__all__ = ["Wing"]
+__all__ = ["Wing", "get_avl_cache"]
 __settable__ = (True if __name__ == '__main__' else False)
 
+#: On-disk AVL result cache shared by all wings, such that identical analyses (i.e. during the C.G. convergence loop or
+#: in a new Python session) are not solved again. Created by :func:`get_avl_cache` on first use
+_AVL_CACHE = None
+
+#: Factor by which the number of chordwise and spanwise vortices grows between two levels of the lattice study
+LATTICE_REFINEMENT = 1.5
+
+
+def get_avl_cache():
+    """ The AVL result cache shared by all wings and the analyses of the aircraft, its directory is only created
+    once an analysis needs it.
+
+    :rtype: ResultCache
+    """
+    global _AVL_CACHE
+    if _AVL_CACHE is None:
+        _AVL_CACHE = ResultCache()
+    return _AVL_CACHE
+
 
 class Wing(ExternalBody, LiftingSurface):
     """ This class will create the wing geometry based on the required:
@@ -60,6 +82,36 @@ class Wing(ExternalBody, LiftingSurface):
 
     :param ply_number: Changes the number of ply's of carbon fiber pre-preg.
     :type ply_number: int
+
+    :param n_chordwise: Number of chordwise vortices of the (final) AVL lattice
+    :type n_chordwise: int
+
+    :param n_spanwise: Number of spanwise vortices of the (final) AVL lattice
+    :type n_spanwise: int
+
+    :param lattice_mode: 'fixed' uses the lattice above, 'coarse' a lattice of half the vortices (e.g. during C.G. \
+    iterations) and 'converged' refines the coarse lattice until :attr:`lattice_tolerance` is met
+    :type lattice_mode: str
+
+    :param lattice_tolerance: Largest relative change of C_L_alpha and absolute change of C_m between two levels
+    :type lattice_tolerance: float
+
+    :param max_lattice_levels: Largest number of lattices solved by the convergence study
+    :type max_lattice_levels: int
+
+    :param verbose: Switch to print every level of the lattice study
+    :type verbose: bool
+
+    :param aero_fidelity: 'lattice' solves the AVL lattice, 'analytic' uses the Helmbold/DATCOM estimates and 'auto' \
+    promotes from the latter to the former once the design changes less than :attr:`fidelity_threshold`
+    :type aero_fidelity: str
+
+    :param fidelity_threshold: Largest relative change of the design variables at which 'auto' uses the lattice
+    :type fidelity_threshold: float
+
+    :param fidelity_manager: Keeps the previous design of 'auto' and the log of the coefficients, by default owned by
+    the wing (typically passed from myUAV, to compare the wings of consecutive C.G. iterations)
+    :type fidelity_manager: FidelityManager
     """
 
     __icon__ = os.path.join(DIRS['ICON_DIR'], 'liftingsurface.png')
@@ -98,6 +150,52 @@ class Wing(ExternalBody, LiftingSurface):
     #: Fixes the wing in place in order to use it as the datum for other parts
     position = Input(Position(XOY), settable=False)
 
+    #: Aerodynamic solver: 'avl' runs the external AVL binary, 'vlm' the built-in vortex-lattice solver (no AVL needed)
+    aero_solver = Input('avl', validator=val.OneOf(['avl', 'vlm']))
+
+    #: Switch to let AVL cases be planned adaptively (typically 4-5 instead of 25 cases), off by default such that the
+    #: full sweep of :attr:`alpha_cases` is solved, e.g. for the plots of the lift and moment curves
+    adaptive_alphas = Input(False, validator=val.Instance(bool))
+
+    #: Switch to answer :attr:`lift_coef_vs_alpha` and :attr:`moment_coef_control` from the response-surface surrogate
+    #: of the airfoil, outside its trust region (or for a user-defined offset) the full analysis is used instead
+    use_surrogate = Input(False, validator=val.Instance(bool))
+
+    #: Number of chordwise vortices of the (final) AVL lattice
+    n_chordwise = Input(12, validator=val.Instance(int))
+
+    #: Number of spanwise vortices of the (final) AVL lattice
+    n_spanwise = Input(16, validator=val.Instance(int))
+
+    #: Resolution of the AVL lattice: 'fixed' uses :attr:`n_chordwise` x :attr:`n_spanwise`, 'coarse' half of these
+    #: (e.g. while the design is still changing) and 'converged' the result of the :attr:`lattice_study`
+    lattice_mode = Input('fixed', validator=val.OneOf(['fixed', 'coarse', 'converged']))
+
+    #: Largest relative change of C_L_alpha and absolute change of C_m between two levels of the lattice study
+    lattice_tolerance = Input(0.005, validator=val.Positive())
+
+    #: Largest number of lattices solved by the lattice study, the last one is used when it did not converge
+    max_lattice_levels = Input(5, validator=val.Range(2, 10))
+
+    #: Switch to print every level of the lattice study
+    verbose = Input(False, validator=val.Instance(bool))
+
+    #: Fidelity of :attr:`lift_coef_vs_alpha` and :attr:`moment_coef_control`: 'lattice' always solves the lattice,
+    #: 'analytic' uses the :attr:`analytic_estimates` and 'auto' lets the :attr:`fidelity_manager` choose per query
+    aero_fidelity = Input('lattice', validator=val.OneOf(['lattice', 'analytic', 'auto']))
+
+    #: Largest relative change of the design variables since the previously recorded design at which 'auto' uses the
+    #: lattice
+    fidelity_threshold = Input(0.01, validator=val.Positive())
+
+    @Input
+    def fidelity_manager(self):
+        """ A fidelity manager of this wing only, with 'auto' a standalone wing is thus answered analytically.
+
+        :rtype: FidelityManager
+        """
+        return FidelityManager()
+
 #  This block of Attributes calculates the planform parameters. ########------------------------------------------------
 
     @Attribute(private=True)
@@ -281,25 +379,23 @@ class Wing(ExternalBody, LiftingSurface):
                        airfoil=FileAirfoil(get_dir(os.path.join('airfoils', self.airfoil_type,
                                                                 '%s.dat' % self.airfoil_choice))))
 
-    @Attribute(private=True)
-    def wing_surface(self):
-        """" Here we define the wing surface using a symmetry plane at y=0. Here the number of vortecies and their
-         chordwise and spanwise spacing is also set.
+    def _get_surface(self, n_chordwise, n_spanwise):
+        """" Here we define the wing surface using a symmetry plane at y=0, with the given number of vortecies and
+         their chordwise and spanwise spacing.
 
          :return: AVL Wing Surface
          :rtype: Surface
          """
         return Surface(name="Wing",
-                       n_chordwise=12,
+                       n_chordwise=n_chordwise,
                        chord_spacing=Spacing.cosine,
-                       n_spanwise=16,
+                       n_spanwise=n_spanwise,
                        span_spacing=Spacing.neg_sine,
                        y_duplicate=0.0,
                        sections=[self.root_section, self.tip_section])
 
-    @Attribute(private=True)
-    def wing_geom(self):
-        """"  Here we define the AVL geometry.
+    def _get_geometry(self, surface):
+        """"  Here we define the AVL geometry of a wing surface.
 
          :return: AVL Wing Geometry
          :rtype: Geometry
@@ -309,7 +405,91 @@ class Wing(ExternalBody, LiftingSurface):
                         reference_chord=self.mac_length,
                         reference_span=self.semi_span * 2.0,
                         reference_point=Point(0.0, 0.0, 0.0),
-                        surfaces=[self.wing_surface])
+                        surfaces=[surface])
+
+    @Attribute
+    def coarse_lattice(self):
+        """ The coarse lattice, with half the vortices of the final lattice, which starts the lattice study.
+
+        :return: Number of chordwise and spanwise vortices
+        :rtype: tuple
+        """
+        return max(4, int(ceil(self.n_chordwise / 2.0))), max(6, int(ceil(self.n_spanwise / 2.0)))
+
+    @Attribute
+    def lattice_study(self):
+        """ Solves the wing on successively finer lattices, starting from the :attr:`coarse_lattice`, until the lift
+        curve slope and the pitching moment at the control lift coefficient change less than :attr:`lattice_tolerance`
+        between two levels. All levels are stored in the shared AVL result cache. The study is only solved in the
+        'converged' :attr:`lattice_mode`.
+
+        :return: One dictionary per level with 'n_chordwise', 'n_spanwise', 'cl_alpha', 'cm' and 'converged' or None
+        :rtype: list or NoneType
+        """
+        if self.lattice_mode != 'converged':
+            return None
+
+        n_chordwise, n_spanwise = self.coarse_lattice
+        levels = []
+        while len(levels) < self.max_lattice_levels:
+            session = self._get_session(self._get_geometry(self._get_surface(n_chordwise, n_spanwise)))
+            results = session.get_results()
+            session.reset()
+
+            #  Same estimates as :attr:`lift_coef_vs_alpha`, with C_m interpolated at the control lift coefficient
+            totals = sorted([results[case]['Totals'] for case in results], key=lambda f: f['Alpha'])
+            cl = [f['CLtot'] for f in totals]
+            cl_alpha = (cl[-1] - cl[0]) / (radians(totals[-1]['Alpha']) - radians(totals[0]['Alpha']))
+            cm = float(np.interp(self.lift_coef_control, cl, [f['Cmtot'] for f in totals]))
+
+            converged = bool(levels) and abs(cl_alpha - levels[-1]['cl_alpha']) <= \
+                self.lattice_tolerance * abs(levels[-1]['cl_alpha']) and \
+                abs(cm - levels[-1]['cm']) <= self.lattice_tolerance
+            levels.append({'n_chordwise': n_chordwise, 'n_spanwise': n_spanwise,
+                           'cl_alpha': cl_alpha, 'cm': cm, 'converged': converged})
+            if self.verbose:
+                print 'Lattice %dx%d: C_L_alpha = %1.4f [1/rad], C_m = %1.5f' % (n_chordwise, n_spanwise, cl_alpha, cm)
+            if converged:
+                break
+
+            n_chordwise = int(round(n_chordwise * LATTICE_REFINEMENT))
+            n_spanwise = int(round(n_spanwise * LATTICE_REFINEMENT))
+
+        if not levels[-1]['converged']:
+            print Warning('The AVL lattice did not converge within %d levels, the finest lattice is used'
+                          % self.max_lattice_levels)
+        return levels
+
+    @Attribute
+    def lattice(self):
+        """ The number of chordwise and spanwise vortices of the AVL lattice, following :attr:`lattice_mode`.
+
+        :return: Number of chordwise and spanwise vortices
+        :rtype: tuple
+        """
+        if self.lattice_mode == 'coarse':
+            return self.coarse_lattice
+        elif self.lattice_mode == 'converged':
+            return self.lattice_study[-1]['n_chordwise'], self.lattice_study[-1]['n_spanwise']
+        return self.n_chordwise, self.n_spanwise
+
+    @Attribute(private=True)
+    def wing_surface(self):
+        """" Here we define the wing surface with the vortices of :attr:`lattice`.
+
+         :return: AVL Wing Surface
+         :rtype: Surface
+         """
+        return self._get_surface(*self.lattice)
+
+    @Attribute(private=True)
+    def wing_geom(self):
+        """"  Here we define the AVL geometry.
+
+         :return: AVL Wing Geometry
+         :rtype: Geometry
+         """
+        return self._get_geometry(self.wing_surface)
 
     @Attribute(private=True)
     def alpha_cases(self):
@@ -328,14 +508,38 @@ class Wing(ExternalBody, LiftingSurface):
                                    X_cg=self.aerodynamic_center.x))
         return alpha_case
 
+    def _get_session(self, geometry):
+        """"  Here we define the AVL session of a geometry with the cases above. Results are stored in the shared cache
+         of :func:`get_avl_cache`. Only the total forces are used, thus AVL is only asked to write the 'Totals' output.
+         With :attr:`aero_solver` set to 'vlm' the same geometry and cases are solved by the built-in vortex-lattice
+         solver. With :attr:`adaptive_alphas` the cases are planned by the session itself over the same alpha range: the
+         linearity of the lift curve is checked and cases are added near the lift coefficient at 1.2 x v_s.
+
+         :return: AVL Run Session
+         :rtype: Session
+         """
+        session_class = VortexLatticeSession if self.aero_solver == 'vlm' else Session
+        if self.adaptive_alphas:
+            return AdaptiveAlphaSession(geometry=geometry,
+                                        target_cl=self.lift_coef_control,
+                                        alpha_range=(-10.0, 20.0),
+                                        session_class=session_class,
+                                        cache=get_avl_cache(),
+                                        outputs=['Totals'],
+                                        velocity=1.2*self.stall_speed,
+                                        X_cg=self.aerodynamic_center.x)
+        if self.aero_solver == 'vlm':
+            return VortexLatticeSession(geometry=geometry, cases=self.alpha_cases, cache=get_avl_cache())
+        return Session(geometry=geometry, cases=self.alpha_cases, cache=get_avl_cache(), outputs=['Totals'])
+
     @Attribute(private=True)
     def avl_session(self):
-        """"  Here we define the AVL session with the cases above.
+        """"  The AVL session of the wing geometry, with the lattice of :attr:`lattice_mode`.
 
          :return: AVL Run Session
          :rtype: Session
          """
-        return Session(geometry=self.wing_geom, cases=self.alpha_cases)
+        return self._get_session(self.wing_geom)
 
     @Attribute
     def show_avlgeom(self):
@@ -347,14 +551,24 @@ class Wing(ExternalBody, LiftingSurface):
         self.avl_session.show_geometry()
         return 'Done'
 
+    @Attribute(private=True)
+    def avl_future(self):
+        """"  Here the AVL session is started in the background, such that other geometry can be built while AVL runs.
+         Requesting this attribute early (e.g. before the rest of the aircraft is built) lets the solve overlap.
+
+         :return: Running AVL Session
+         :rtype: Session
+         """
+        return self.avl_session.submit()
+
     @Attribute
     def avl_results(self):
-        """"  Here, the results are extracted and stored in the memory of ParaPy.
+        """"  Here, the results are extracted and stored in the memory of ParaPy. Waits for the background session.
 
          :return: Dictionary with AVL Results
          :rtype: dict
          """
-        return self.avl_session.get_results()
+        return self.avl_future.result()
 
     @Attribute(private=True)
     def avl_data_grabber(self):
@@ -382,17 +596,100 @@ class Wing(ExternalBody, LiftingSurface):
                 'alpha_degrees': alpha_deg,
                 'alpha_radians': alpha_rad}
 
+    @Attribute(private=True)
+    def aero_surrogate(self):
+        """ The response-surface surrogate of the chosen airfoil, fitted on a stored sweep of :attr:`aero_solver`
+        analyses. The sweep is solved (once) when no stored sweep exists yet.
+
+        :return: Wing aerodynamic surrogate
+        :rtype: WingAeroSurrogate
+        """
+        return get_surrogate(self.airfoil_type, self.airfoil_choice, solver=self.aero_solver)
+
+    @Attribute
+    def surrogate_prediction(self):
+        """ The surrogate coefficients of this wing, None when the surrogate is not used or the wing lies outside its
+        trust region. The surrogate assumes the default (unswept trailing edge) offset.
+
+        :return: Dictionary with 'cl_alpha', 'cl_0', 'cm_0' and 'cm_cl' or None
+        :rtype: dict or NoneType
+        """
+        if not self.use_surrogate or self.offset is not None:
+            return None
+        return self.aero_surrogate.predict((self.aspect_ratio, self.taper, self.twist, self.dihedral))
+
+    @Attribute
+    def surrogate_error(self):
+        """ The leave-one-out error estimate of the surrogate coefficients, None when the surrogate is not used.
+
+        :return: Dictionary with the RMS leave-one-out error per coefficient or None
+        :rtype: dict or NoneType
+        """
+        if not self.use_surrogate:
+            return None
+        return self.aero_surrogate.errors
+
+    @Attribute
+    def analytic_estimates(self):
+        """ Analytic estimates of the aerodynamic coefficients, which cost no lattice solve: the Helmbold/DATCOM lift
+        curve slope from the aspect ratio and half-chord sweep, and the DATCOM pitching moment about the aerodynamic
+        center from the thin-airfoil moment of the airfoil (the effect of twist is neglected).
+
+        :return: Dictionary with 'cl_alpha' [1/rad] and 'cm_ac' [-]
+        :rtype: dict
+        """
+        half_chord_sweep = sweep_at(self.le_sweep, self.aspect_ratio, self.taper, 0.5)
+        quarter_chord_sweep = sweep_at(self.le_sweep, self.aspect_ratio, self.taper, 0.25)
+        return {'cl_alpha': helmbold_lift_slope(self.aspect_ratio, half_chord_sweep),
+                'cm_ac': datcom_moment(thin_airfoil_moment(self.root_section.airfoil), self.aspect_ratio,
+                                       quarter_chord_sweep)}
+
+    @Attribute
+    def design_vector(self):
+        """ The design variables which drive the aerodynamic coefficients, compared between queries by 'auto'.
+
+        :return: Aspect ratio, taper, sweep, twist, dihedral and control lift coefficient
+        :rtype: tuple
+        """
+        return (self.aspect_ratio, self.taper, self.le_sweep, self.twist, self.dihedral, self.lift_coef_control)
+
+    @Attribute
+    def aero_tier(self):
+        """ The tier which produces :attr:`lift_coef_vs_alpha` and :attr:`moment_coef_control`: 'surrogate' inside
+        the trust region of the surrogate, otherwise following :attr:`aero_fidelity`. With 'auto' the
+        :attr:`fidelity_manager` compares the :attr:`design_vector` with the design last recorded by a wing with the
+        same label (e.g. the previous C.G. iteration), a new or changing design is answered analytically and a settled
+        design by the lattice. Reading the tier does not change the history, the coefficients record the design.
+
+        :return: 'surrogate', 'analytic' or 'lattice'
+        :rtype: str
+        """
+        if self.surrogate_prediction is not None:
+            return 'surrogate'
+        elif self.aero_fidelity == 'auto':
+            return self.fidelity_manager.peek_tier(self.label, self.design_vector, self.fidelity_threshold)[0]
+        return self.aero_fidelity
+
     @Attribute
     def lift_coef_vs_alpha(self):
-        """ This estimates the lift curve slope.
+        """ This estimates the lift curve slope. Taken from the surrogate inside its trust region, or from the
+        :attr:`analytic_estimates` in the analytic :attr:`aero_tier`.
 
         :return: Lift Coefficient Gradient [1/rad]
         :rtype: float
         """
-        cl = self.avl_data_grabber['lift_coefs']
-        alpha_rad = self.avl_data_grabber['alpha_radians']
-        cl_alpha = np.mean([(cl[i+1] - cl[i]) / (alpha_rad[i+1] - alpha_rad[i]) for i in range(0, len(alpha_rad) - 1)])
-        return cl_alpha
+        if self.aero_tier == 'surrogate':
+            cl_alpha = self.surrogate_prediction['cl_alpha']
+        elif self.aero_tier == 'analytic':
+            cl_alpha = self.analytic_estimates['cl_alpha']
+        else:
+            cl = self.avl_data_grabber['lift_coefs']
+            alpha_rad = self.avl_data_grabber['alpha_radians']
+            #  The mean of the finite-difference slopes of an evenly spaced sweep equals the slope between its end
+            #  points, the latter is independent of the spacing of (adaptively planned) cases.
+            cl_alpha = (cl[-1] - cl[0]) / (alpha_rad[-1] - alpha_rad[0])
+        return self.fidelity_manager.record(self.label, 'C_L_alpha', self.aero_tier, cl_alpha,
+                                            design=self.design_vector)
 
     @Attribute
     def plot_liftgradient(self):
@@ -442,13 +739,20 @@ class Wing(ExternalBody, LiftingSurface):
     @Attribute
     def moment_coef_control(self):
         """"  This attribute gets the pitching moment of the wing about its aerodynamic center from avl corresponding to
-         index found from the above lift coefficient at 1.2* V_s.
+         index found from the above lift coefficient at 1.2* V_s. Taken from the surrogate inside its trust region, or
+         from the :attr:`analytic_estimates` in the analytic :attr:`aero_tier`.
 
          :return: C_mac at 1.2*V_s
          :rtype: float
          """
-        case_name = self.avl_results['alpha%s' % self.lift_coef_control_index]['Totals']['Cmtot']
-        return case_name
+        if self.aero_tier == 'surrogate':
+            cm = self.surrogate_prediction['cm_0'] + self.surrogate_prediction['cm_cl'] * self.lift_coef_control
+        elif self.aero_tier == 'analytic':
+            cm = self.analytic_estimates['cm_ac']
+        else:
+            cm = self.avl_results['alpha%s' % self.lift_coef_control_index]['Totals']['Cmtot']
+        return self.fidelity_manager.record(self.label, 'C_m_control', self.aero_tier, cm,
+                                            design=self.design_vector)
 
     @Attribute
     def write_results(self):
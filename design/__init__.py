@@ -1,6 +1,9 @@
 from designinput import *
 from weightestimator import *
+from constraintdiagram import *
 from wingpowerloading import *
 from parametergenerator import *
+from sizingkernel import *
+from trimtable import *
 from performance import *
 
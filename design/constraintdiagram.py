@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Constraint (wing and power loading) diagram with pluggable constraints. Every constraint either limits the wing
+loading (e.g. the stall or hand-launch speed) or gives the largest power loading as a function of the wing loading
+(e.g. climb, ceiling, sustained turn or cruise speed). All constraints are evaluated with array operations, their
+parameters may be arrays with a batch shape, such that the feasible regions of many designs (e.g. of a sweep or in an
+optimizer) are found at once:
+
+>>> from design import feasible_region, StallSpeed, ClimbGradient, CruiseSpeed
+>>> region = feasible_region([StallSpeed(speed=8.0, cl_max=1.25), ClimbGradient(cl_max=1.25, aspect_ratio=10.0),
+...                           CruiseSpeed(speed=[15.0, 20.0, 25.0], altitude=500.0, aspect_ratio=10.0)])
+>>> region['optimum']['power_loading'].shape
+(3,)
+"""
+
+import numpy as np
+from math import pi
+import matplotlib.pyplot as plt
+from parapy.core import *
+from directories import *
+
+__author__ = "Şan Kılkış"
+__all__ = ["ConstraintDiagram", "feasible_region", "isa_density", "Constraint", "StallSpeed", "HandLaunchSpeed",
+           "ClimbGradient", "ClimbRate", "Ceiling", "SustainedTurn", "CruiseSpeed"]
+
+
+def isa_density(altitude):
+    """ ISA density in the troposphere.
+
+    :param altitude: Geopotential altitude(s) in SI meter [m]
+    :return: Density in SI kilogram per meter cubed [kg/m^3]
+    :rtype: numpy.ndarray
+    """
+    return 1.225 * (1.0 - 2.25577e-5 * np.asarray(altitude, dtype=float)) ** 4.25588
+
+
+def _batch(value):
+    """ A constraint parameter with an axis appended, such that it broadcasts against the wing loading axis """
+    return np.asarray(value, dtype=float)[..., np.newaxis]
+
+
+class Constraint(object):
+    """ Base class of the constraints. A constraint of the 'wing_loading' kind implements :meth:`wing_loading_limit`,
+    one of the 'power_loading' kind :meth:`power_loading`. Defaults of the aerodynamic and propulsive parameters are
+    those of :class:`WingPowerLoading`.
+
+    :param label: Name of the constraint in the diagram
+    :type label: str
+    """
+
+    kind = 'power_loading'
+    default_label = 'Constraint'
+
+    def __init__(self, label=None, zero_lift_drag=0.02, aspect_ratio=10.0, e_factor=0.8, eta_prop=0.7):
+        self.label = label if label is not None else self.default_label
+        self.zero_lift_drag = zero_lift_drag
+        self.aspect_ratio = aspect_ratio
+        self.e_factor = e_factor
+        self.eta_prop = eta_prop
+
+    @property
+    def induced_drag_factor(self):
+        """ k = 1 / (pi * AR * e) with a batch axis appended """
+        return 1.0 / (pi * _batch(self.aspect_ratio) * _batch(self.e_factor))
+
+    def wing_loading_limit(self):
+        """ Largest feasible wing loading in SI Newton per meter squared [N/m^2], of the batch shape """
+        raise NotImplementedError
+
+    def power_loading(self, wing_loading):
+        """ Largest feasible power loading in SI Newton per Watt [N/W] at the wing loadings [N/m^2], the last axis of
+        the wing loadings spans the diagram and the leading axes are the batch axes """
+        raise NotImplementedError
+
+    def _speed_power_loading(self, wing_loading, speed, rho, load_factor=1.0):
+        """ Power loading of steady level flight at a speed and load factor: T/W = q C_D0 / (W/S) + k n^2 (W/S) / q """
+        q = 0.5 * _batch(rho) * _batch(speed) ** 2
+        thrust_loading = q * _batch(self.zero_lift_drag) / wing_loading + \
+            self.induced_drag_factor * _batch(load_factor) ** 2 * wing_loading / q
+        return _batch(self.eta_prop) / (_batch(speed) * thrust_loading)
+
+
+class StallSpeed(Constraint):
+    """ Wing loading at which the wing stalls at the given speed, from the lift equation.
+
+    :param speed: Stall speed in SI meter per second [m/s]
+    :param cl_max: Maximum lift coefficient of the wing
+    :param rho: Density in SI kilogram per meter cubed [kg/m^3]
+    """
+
+    kind = 'wing_loading'
+    default_label = 'Stall Speed'
+
+    def __init__(self, speed=8.0, cl_max=1.25, rho=1.225, **kwargs):
+        super(StallSpeed, self).__init__(**kwargs)
+        self.speed = speed
+        self.cl_max = cl_max
+        self.rho = rho
+
+    def wing_loading_limit(self):
+        return 0.5 * np.asarray(self.rho, dtype=float) * np.asarray(self.cl_max, dtype=float) * \
+            np.asarray(self.speed, dtype=float) ** 2
+
+
+class HandLaunchSpeed(StallSpeed):
+    """ Wing loading at which a hand launch speed exceeds the stall speed by a margin.
+
+    :param launch_speed: Launch speed which a person achieves in SI meter per second [m/s]
+    :param margin: Ratio of the launch speed to the stall speed
+    """
+
+    default_label = 'Hand-Launch Speed'
+
+    def __init__(self, launch_speed=8.0, margin=1.0, **kwargs):
+        super(HandLaunchSpeed, self).__init__(speed=np.asarray(launch_speed, dtype=float) / margin, **kwargs)
+
+
+class ClimbGradient(Constraint):
+    """ Climb gradient requirement of :class:`WingPowerLoading`, flown 0.2 below the maximum lift coefficient.
+
+    :param gradient: Climb gradient, the default clears a 10m object 17m away
+    :param cl_max: Maximum lift coefficient of the wing
+    :param rho: Density in SI kilogram per meter cubed [kg/m^3]
+    """
+
+    default_label = 'Climb Gradient'
+
+    def __init__(self, gradient=0.507, cl_max=1.25, rho=1.225, **kwargs):
+        super(ClimbGradient, self).__init__(**kwargs)
+        self.gradient = gradient
+        self.cl_max = cl_max
+        self.rho = rho
+
+    def power_loading(self, wing_loading):
+        cl_max = _batch(self.cl_max)
+        lift_coef_cg = cl_max - 0.2
+        drag_coef_cg = _batch(self.zero_lift_drag) + cl_max ** 2 / (pi * _batch(self.aspect_ratio) *
+                                                                     _batch(self.e_factor))
+        return _batch(self.eta_prop) / (np.sqrt(wing_loading * (2.0 / _batch(self.rho)) * (1 / lift_coef_cg)) *
+                                        _batch(self.gradient) + (drag_coef_cg / lift_coef_cg))
+
+
+class ClimbRate(Constraint):
+    """ Rate of climb at an altitude, flown at the speed of the best rate of climb of a propeller aircraft (the
+    speed of the maximum of C_L^3 / C_D^2).
+
+    :param rate: Rate of climb in SI meter per second [m/s]
+    :param altitude: Altitude in SI meter [m]
+    """
+
+    default_label = 'Climb Rate'
+
+    def __init__(self, rate=1.524, altitude=3000.0, **kwargs):
+        super(ClimbRate, self).__init__(**kwargs)
+        self.rate = rate
+        self.altitude = altitude
+
+    def power_loading(self, wing_loading):
+        k = self.induced_drag_factor
+        cd0 = _batch(self.zero_lift_drag)
+        speed = np.sqrt(2.0 * wing_loading / _batch(isa_density(self.altitude)) * np.sqrt(k / (3.0 * cd0)))
+        return _batch(self.eta_prop) / (_batch(self.rate) + speed * 1.155 * 2.0 * np.sqrt(k * cd0))
+
+
+class Ceiling(ClimbRate):
+    """ Service ceiling, at which the rate of climb is 100 ft/min.
+
+    :param altitude: Service ceiling in SI meter [m]
+    """
+
+    default_label = 'Ceiling'
+
+    def __init__(self, altitude=4000.0, rate=0.508, **kwargs):
+        super(Ceiling, self).__init__(rate=rate, altitude=altitude, **kwargs)
+
+
+class SustainedTurn(Constraint):
+    """ Level turn at a load factor and speed, without loss of speed or altitude.
+
+    :param load_factor: Load factor of the turn, 1 / cos(bank angle)
+    :param speed: True airspeed in SI meter per second [m/s]
+    :param altitude: Altitude in SI meter [m]
+    """
+
+    default_label = 'Sustained Turn'
+
+    def __init__(self, load_factor=1.41, speed=15.0, altitude=0.0, **kwargs):
+        super(SustainedTurn, self).__init__(**kwargs)
+        self.load_factor = load_factor
+        self.speed = speed
+        self.altitude = altitude
+
+    def power_loading(self, wing_loading):
+        return self._speed_power_loading(wing_loading, self.speed, isa_density(self.altitude), self.load_factor)
+
+
+class CruiseSpeed(Constraint):
+    """ Level flight at a cruise speed and altitude.
+
+    :param speed: True airspeed in SI meter per second [m/s]
+    :param altitude: Altitude in SI meter [m]
+    """
+
+    default_label = 'Cruise Speed'
+
+    def __init__(self, speed=20.0, altitude=500.0, **kwargs):
+        super(CruiseSpeed, self).__init__(**kwargs)
+        self.speed = speed
+        self.altitude = altitude
+
+    def power_loading(self, wing_loading):
+        return self._speed_power_loading(wing_loading, self.speed, isa_density(self.altitude))
+
+
+def feasible_region(constraints, n_points=200, objective='wing_loading'):
+    """ The feasible region of the constraint diagram: wing loadings up to the smallest wing loading limit and power
+    loadings below the envelope of the power loading constraints. The envelope is evaluated at n_points wing loadings
+    which end exactly at the wing loading limit. The optimum corner is the upper-right corner of the region (the
+    smallest wing, the 'wing_loading' objective) or the highest point of the envelope (the smallest motor, the
+    'power_loading' objective, resolved to the wing loading step).
+
+    :param constraints: At least one constraint of either kind
+    :type constraints: list
+    :return: Dictionary with the 'wing_loading' axis, the 'envelope' power loading and the index of the 'active'
+             constraint (in the list of power loading constraints) of batch shape + (n_points,), the
+             'wing_loading_limit', the 'polygon' of batch shape + (n_points + 2, 2) and the 'optimum' dictionary with
+             'wing_loading', 'power_loading' and 'active'
+    :rtype: dict
+    """
+    limits = [constraint.wing_loading_limit() for constraint in constraints if constraint.kind == 'wing_loading']
+    curves = [constraint for constraint in constraints if constraint.kind == 'power_loading']
+    if not limits or not curves:
+        raise ValueError('The constraint diagram requires at least one wing loading and one power loading constraint')
+
+    ws_limit = np.amin(np.broadcast_arrays(*limits), axis=0)
+    wing_loading = _batch(ws_limit) * np.linspace(0.0, 1.0, n_points + 1)[1:]
+    power_loadings = np.broadcast_arrays(*[constraint.power_loading(wing_loading) for constraint in curves])
+    wing_loading = np.broadcast_to(wing_loading, power_loadings[0].shape)
+
+    envelope = np.amin(power_loadings, axis=0)
+    active = np.argmin(power_loadings, axis=0)
+    if objective == 'wing_loading':
+        idx = np.full(envelope.shape[:-1] + (1,), n_points - 1, dtype=int)
+    elif objective == 'power_loading':
+        idx = np.argmax(envelope, axis=-1)[..., np.newaxis]
+    else:
+        raise ValueError("The objective should be either 'wing_loading' or 'power_loading'")
+
+    #  The region is closed along the wing loading limit and the wing loading axis
+    corners_ws = np.broadcast_to(_batch(np.broadcast_to(ws_limit, envelope.shape[:-1])), envelope.shape[:-1] + (2,))
+    polygon = np.stack((np.concatenate((wing_loading, corners_ws[..., :1], wing_loading[..., :1]), axis=-1),
+                        np.concatenate((envelope, np.zeros(envelope.shape[:-1] + (2,))), axis=-1)), axis=-1)
+
+    return {'wing_loading': wing_loading,
+            'envelope': envelope,
+            'active': active,
+            'wing_loading_limit': ws_limit,
+            'polygon': polygon,
+            'optimum': {'wing_loading': np.take_along_axis(wing_loading, idx, axis=-1)[..., 0],
+                        'power_loading': np.take_along_axis(envelope, idx, axis=-1)[..., 0],
+                        'active': np.take_along_axis(active, idx, axis=-1)[..., 0]}}
+
+
+class ConstraintDiagram(Base):
+    """ The constraint diagram of a single design, see :func:`feasible_region`.
+
+    :param constraints: Constraints of the design, with scalar parameters
+    :type constraints: list
+
+    :param n_points: Number of wing loadings at which the envelope is evaluated
+    :type n_points: int
+
+    :param objective: 'wing_loading' picks the upper-right corner, 'power_loading' the highest power loading
+    :type objective: str
+    """
+
+    __icon__ = os.path.join(DIRS['ICON_DIR'], 'designpoint.png')
+
+    #: Number of wing loadings at which the envelope is evaluated
+    n_points = Input(200, validator=val.Instance(int))
+
+    #: 'wing_loading' picks the upper-right corner of the region (smallest wing), 'power_loading' the highest power
+    #: loading (smallest motor)
+    objective = Input('wing_loading', validator=val.OneOf(['wing_loading', 'power_loading']))
+
+    @Input
+    def constraints(self):
+        """ Constraints of the design, with scalar parameters. By default the stall speed and climb gradient
+        requirements of :class:`WingPowerLoading`, a new list for every diagram.
+
+        :rtype: list
+        """
+        return [StallSpeed(), ClimbGradient()]
+
+    @Attribute
+    def region(self):
+        """ The feasible region of the constraints.
+
+        :rtype: dict
+        """
+        region = feasible_region(self.constraints, n_points=self.n_points, objective=self.objective)
+        if region['envelope'].ndim != 1:
+            raise ValueError('The constraint diagram of a single design requires constraints with scalar parameters, '
+                             'use feasible_region for a batch of designs')
+        return region
+
+    @Attribute
+    def feasible_polygon(self):
+        """ Vertices of the feasible region, the envelope followed by the corners on the wing loading axis.
+
+        :return: (W/S [N/m^2], W/P [N/W]) per vertex
+        :rtype: numpy.ndarray
+        """
+        return self.region['polygon']
+
+    @Attribute
+    def optimum(self):
+        """ The optimum corner of the feasible region and the label of the active power loading constraint.
+
+        :return: Dictionary with 'wing_loading' [N/m^2], 'power_loading' [N/W] and 'active'
+        :rtype: dict
+        """
+        optimum = self.region['optimum']
+        curves = [constraint for constraint in self.constraints if constraint.kind == 'power_loading']
+        return {'wing_loading': float(optimum['wing_loading']),
+                'power_loading': float(optimum['power_loading']),
+                'active': curves[int(optimum['active'])].label}
+
+    @Attribute
+    def plot_constraintdiagram(self):
+        """ This attribute plots the constraint diagram with the feasible region and the optimum.
+
+         :return: Plot
+         """
+        fig = plt.figure('ConstraintDiagram')
+        plt.style.use('ggplot')
+
+        ws_limit = float(self.region['wing_loading_limit'])
+        wing_loading = np.linspace(0.0, 1.5, 301)[1:] * ws_limit
+        y_max = 1.2 * np.max(self.region['envelope'])
+        for constraint in self.constraints:
+            if constraint.kind == 'wing_loading':
+                limit = float(constraint.wing_loading_limit())
+                plt.plot([limit, limit], [0, y_max], label=constraint.label)
+            else:
+                plt.plot(wing_loading, constraint.power_loading(wing_loading), '--', label=constraint.label)
+
+        plt.fill(self.feasible_polygon[:, 0], self.feasible_polygon[:, 1], alpha=0.3, label='Feasible Region')
+        plt.plot(self.optimum['wing_loading'], self.optimum['power_loading'],
+                 marker='o',
+                 markerfacecolor='white',
+                 markeredgecolor='black', markeredgewidth=1,
+                 linewidth=0,
+                 label='Optimum')
+
+        plt.ylabel('W/P [N*W^-1]')
+        plt.xlabel('W/S [N*m^-2]')
+        plt.axis([0, wing_loading[-1], 0, y_max])
+        plt.legend()
+        plt.title('Constraint Diagram')
+        plt.show()
+        fig.savefig(fname=os.path.join(DIRS['USER_DIR'], 'plots', '%s.pdf' % fig.get_label()), format='pdf')
+        return "Plot generated and closed"
+
+
+if __name__ == '__main__':
+    from parapy.gui import display
+
+    obj = ConstraintDiagram(label='Constraint Diagram')
+    display(obj)
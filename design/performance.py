@@ -42,6 +42,12 @@ class Performance(Base):
 
     :param stall_buffer: Safety Factor to create a buffer between Endurance/Cruise velocity and the Stall Speed
     :type stall_buffer: float
+
+    :param trim_table_in: The instantiated trim table of the aircraft, None skips the trim prediction
+    :type trim_table_in: TrimTable or NoneType
+
+    :param x_cg: Longitudinal location of the C.G. in SI meter [m]
+    :type x_cg: float
     """
 
     __initargs__ = ["parasitic_drag"]
@@ -74,6 +80,12 @@ class Performance(Base):
     #: Safety Factor to create a buffer between flight speed and stall speed
     stall_buffer = Input(1.5, validator=val.Range(1.0, 1.5))
 
+    #: Instantiated Trim Table Object, None skips the trim prediction
+    trim_table_in = Input(None)
+
+    #: Longitudinal location of the C.G. in SI meter [m]
+    x_cg = Input(0.0)
+
     @Attribute
     def stall_speed(self):
         """ Computes the new stall speed caused by change in MTOW in Class II (bottoms-up) as compared to the initial \
@@ -172,8 +184,8 @@ class Performance(Base):
         :return: Optimum endurance velocity in SI meter per second [m/s]
         :rtype: float
         """
-        diff = [self.power_available_cont[i] - self.power_required[i] for i in range(0, len(self.speed_range))]
-        idx_e = diff.index(max(diff))
+        diff = self.power_available_cont - self.power_required
+        idx_e = int(np.argmax(diff))
         safe_speed = self.stall_buffer * self.stall_speed
         calc_speed = self.speed_range[idx_e]
         if calc_speed >= safe_speed:
@@ -193,13 +205,9 @@ class Performance(Base):
         :return: Optimum cruise velocity in SI meter per second [m/s]
         :rtype: float
         """
-        diff = []
-        for i in range(0, len(self.speed_range) - 1):
-            tangent = self.power_required[i + 1] / self.speed_range[i+1]
-            local_tangent = (self.power_required[i + 1] - self.power_required[i]) / \
-                            (self.speed_range[i + 1] - self.speed_range[i])
-            diff = diff + [(abs(tangent - local_tangent))]
-        idx_c = diff.index(min(diff))
+        tangent = self.power_required[1:] / self.speed_range[1:]
+        local_tangent = np.diff(self.power_required) / np.diff(self.speed_range)
+        idx_c = int(np.argmin(np.abs(tangent - local_tangent)))
         safe_speed = self.stall_buffer * self.stall_speed
         calc_speed = self.speed_range[idx_c]
         if calc_speed >= safe_speed:
@@ -217,11 +225,8 @@ class Performance(Base):
         :return: Maximum velocity in SI meter per second [m/s]
         :rtype: float
         """
-
-        diff = [abs(self.power_available_burst[i] - self.power_required[i]) for i in range(0, len(self.speed_range))]
-        idx_m = diff.index(min(diff))
-
-        return self.speed_range[idx_m] if idx_m is not -1 else self.speed_range[-1]
+        diff = np.abs(self.power_available_burst - self.power_required)
+        return self.speed_range[int(np.argmin(diff))]
 
     @Attribute
     def power_spline(self):
@@ -246,17 +251,53 @@ class Performance(Base):
         range_km = 3.6 * hours * velocity
         return range_km
 
+    @Attribute
+    def endurance_trim(self):
+        """ Trimmed angle of attack and elevator deflection at the endurance velocity, interpolated from the trim table.
+
+        :return: Angle of attack and elevator deflection in degrees [deg], None without a trim table
+        :rtype: tuple or NoneType
+        """
+        if self.trim_table_in is None:
+            return None
+        return tuple(float(value) for value in self.trim_table_in.trim(self.x_cg, self.endurance_velocity))
+
+    @Attribute
+    def cruise_trim(self):
+        """ Trimmed angle of attack and elevator deflection at the cruise velocity, interpolated from the trim table.
+
+        :return: Angle of attack and elevator deflection in degrees [deg], None without a trim table
+        :rtype: tuple or NoneType
+        """
+        if self.trim_table_in is None:
+            return None
+        return tuple(float(value) for value in self.trim_table_in.trim(self.x_cg, self.cruise_velocity))
+
     @Attribute
     def eta_values(self):
-        return [self.propeller_eta_curve(float(i)) for i in self.prop_speed_range]
+        """ Propeller efficiencies at all airspeeds of :attr:`prop_speed_range`, in a single call of the curve.
+
+        :rtype: numpy array
+        """
+        return np.asarray(self.propeller_eta_curve(self.prop_speed_range), dtype=float)
 
     @Attribute
     def power_available_cont(self):
-        return [self.power_available[0] * i for i in self.eta_values]
+        """ Continuous power available at all airspeeds of :attr:`prop_speed_range`.
+
+        :return: Power available in SI Watt [W]
+        :rtype: numpy array
+        """
+        return self.power_available[0] * self.eta_values
 
     @Attribute
     def power_available_burst(self):
-        return [self.power_available[1] * i for i in self.eta_values]
+        """ Burst power available at all airspeeds of :attr:`prop_speed_range`.
+
+        :return: Power available in SI Watt [W]
+        :rtype: numpy array
+        """
+        return self.power_available[1] * self.eta_values
 
     @Attribute
     def plot_airspeed_vs_power(self):
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Geometry-free sizing kernel. The chain :class:`ClassOne` -> :attr:`WingPowerLoading.designpoint` ->
+:attr:`WingPowerLoading.cruise_parameters` -> :attr:`WingPowerLoading.battery_capacity` ->
+:attr:`ParameterGenerator.motor_power` is pure algebra, here it is evaluated with array operations for many
+requirement sets at once, without instantiating ParaPy objects. The payload power is read from the EO/IR camera
+database in the same way as :class:`EOIR` does.
+
+>>> from design import sizing_kernel
+>>> sizing = sizing_kernel(['endurance', 'range'], [1.0, 100.0], 'payload', [0.25, 1.0], [True, False])
+>>> sizing['weight_mtow']
+array([1.788395, 5.35472 ])
+"""
+
+import numpy as np
+from math import pi
+from os import listdir
+from directories import *
+from my_csv2dict import read_csv
+from wingpowerloading import power_loading_grid
+from components.electronics.flightcontroller import NAVIO_POWER
+
+__author__ = "Şan Kılkış"
+__all__ = ["sizing_kernel", "camera_table"]
+
+#: Camera weights and powers by file name, read once from the EO/IR database
+_CAMERA_TABLE = dict()
+
+
+def camera_table(directory=DIRS['EOIR_DATA_DIR']):
+    """ The weight and power of all cameras in the EO/IR database, sorted by weight like :attr:`EOIR.camera_selector`.
+
+    :return: Camera weights in SI kilogram [kg] and powers in SI Watt [W]
+    :rtype: tuple
+    """
+    if directory not in _CAMERA_TABLE:
+        camera_names = [str(i.split('.')[0]) for i in listdir(directory) if i.endswith('csv')]
+        specs = sorted([read_csv(name, directory) for name in camera_names], key=lambda f: float(f['weight']))
+        _CAMERA_TABLE[directory] = (np.array([f['weight'] for f in specs], dtype=float),
+                                    np.array([f['power'] for f in specs], dtype=float))
+    return _CAMERA_TABLE[directory]
+
+
+def _payload_power(weight_payload):
+    """ Power of the heaviest camera which is not heavier than the payload weight, the first of equally heavy cameras.
+    NaN where no camera is light enough (for which :class:`EOIR` raises a ValueError) """
+    weights, powers = camera_table()
+    idx = np.searchsorted(weights, weight_payload, side='right') - 1
+    valid = idx >= 0
+    idx = np.searchsorted(weights, weights[np.maximum(idx, 0)], side='left')
+    return np.where(valid, powers[idx], np.nan)
+
+
+def sizing_kernel(performance_goal, goal_value, weight_target, target_value, handlaunch,
+                  maximum_lift_coefficient=(1.0, 1.25, 1.5), eta_prop=0.7, eta_motor=0.9, e_factor=0.8, rho=1.225,
+                  rho_cr=0.9091, zero_lift_drag=0.02, climb_rate=1.524, climb_gradient=0.507):
+    """ Sizes a batch of UAVs from their requirements. The five requirement arguments are scalars or arrays which are
+    broadcast against each other, the remaining arguments are the defaults of :class:`WingPowerLoading`.
+
+    :param performance_goal: 'endurance' or 'range'
+    :param goal_value: Design endurance in SI hours [h] or range in SI kilometer [km]
+    :param weight_target: 'payload' or 'mtow', the type of :attr:`target_value`
+    :param target_value: Payload weight or MTOW in SI kilogram [kg]
+    :param handlaunch: True for hand launched UAVs
+    :return: Dictionary with an array per quantity: 'weight_mtow' and 'weight_payload' [kg], 'lift_coefficient',
+             'aspect_ratio', 'wing_loading' [N/m^2], 'power_loading' [N/W], 'stall_speed' and 'design_speed' [m/s],
+             'motor_power' [W] and 'battery_capacity' [Wh]
+    :rtype: dict
+    """
+    performance_goal, goal_value, weight_target, target_value, handlaunch = np.broadcast_arrays(
+        np.asarray(performance_goal), np.asarray(goal_value, dtype=float), np.asarray(weight_target),
+        np.asarray(target_value, dtype=float), np.asarray(handlaunch, dtype=bool))
+
+    #  Class-I weight estimation, see ClassOne
+    is_payload = weight_target == 'payload'
+    weight_mtow = np.where(is_payload, 4.7551 * target_value + 0.59962, target_value)
+    weight_payload = np.where(is_payload, target_value, 0.2103 * target_value - 0.1261)
+
+    #  Design point, see WingPowerLoading.designpoint: the C_Lmax closest to 1.2 and the aspect ratio closest to 11
+    #  (hand launched, out of [10, 12]) or 20 (out of [12, 20])
+    lift_coefficients = np.asarray(maximum_lift_coefficient, dtype=float)
+    idx1 = int(np.argmin(np.abs(lift_coefficients - 1.2)))
+    lift_coefficient = lift_coefficients[idx1]
+    aspect_ratio_range = np.where(handlaunch[..., np.newaxis], [10.0, 12.0], [12.0, 20.0])
+    optimal_ar = np.where(handlaunch, 11.0, 20.0)
+    idx3 = np.argmin(np.abs(aspect_ratio_range - optimal_ar[..., np.newaxis]), axis=-1)
+    aspect_ratio = np.take_along_axis(aspect_ratio_range, idx3[..., np.newaxis], axis=-1)[..., 0]
+
+    stall_speed = np.where(handlaunch, 8.0, 12.0)
+    wing_loading = 0.5 * rho * lift_coefficient * stall_speed ** 2
+    power_loading = power_loading_grid(wing_loading[..., np.newaxis], lift_coefficients, aspect_ratio_range,
+                                       eta_prop=eta_prop, rho=rho, rho_cr=rho_cr, zero_lift_drag=zero_lift_drag,
+                                       e_factor=e_factor, climb_rate=climb_rate,
+                                       climb_gradient=climb_gradient)['climb_gradient'][..., idx1, 0, 0]
+
+    #  Cruise parameters, see WingPowerLoading.cruise_parameters
+    is_range = performance_goal == 'range'
+    cl_opt = np.sqrt(np.where(is_range, 1.0, 3.0) * zero_lift_drag * pi * aspect_ratio * e_factor)
+    cd_opt = zero_lift_drag + (cl_opt ** 2 / (pi * aspect_ratio * e_factor))
+    v_opt = np.sqrt(wing_loading * (2 / rho) * (1 / cl_opt))
+    s = weight_mtow * 9.81 / wing_loading
+    d_opt = cd_opt * 0.5 * rho * (v_opt ** 2) * s
+    t = np.where(is_range, goal_value * 1000 / v_opt, goal_value * 3600)
+    p_req_drag = (d_opt * v_opt) / (eta_prop * eta_motor)
+
+    #  Battery capacity (see WingPowerLoading.battery_capacity) and motor power (see ParameterGenerator.motor_power)
+    battery_capacity = (_payload_power(weight_payload) + p_req_drag / eta_prop + NAVIO_POWER) * t / 3600.0
+    motor_power = ((9.81 / power_loading) * weight_mtow) / eta_prop
+
+    return {'weight_mtow': weight_mtow,
+            'weight_payload': weight_payload,
+            'lift_coefficient': np.full(weight_mtow.shape, lift_coefficient),
+            'aspect_ratio': aspect_ratio,
+            'wing_loading': wing_loading,
+            'power_loading': power_loading,
+            'stall_speed': stall_speed,
+            'design_speed': np.maximum(v_opt, 5.0 + stall_speed),
+            'motor_power': motor_power,
+            'battery_capacity': battery_capacity}
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from parapy.core import *
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.interpolate import RegularGridInterpolator
+from directories import *
+from components import Wing, CompoundStabilizer
+from components.liftingsurfaces.wing import get_avl_cache
+
+#  Import AVL wrapper written by Reno El Mendorp. https://github.com/renoelmendorp/AVLWrapper
+from avl import Geometry, Point, CaseTable, ParallelSession
+
+__author__ = "Şan Kılkış"
+__all__ = ["TrimTable"]
+
+
+class TrimTable(Base):
+    """ Computes the trimmed angle of attack and elevator deflection of the full aircraft (wing and compound
+    stabilizer) over a grid of C.G. locations and airspeeds. Every grid point is one AVL case in which the angle of
+    attack is constrained to the required lift coefficient and the elevator to zero pitching moment. The cases are
+    solved by a parallel session and stored in the shared AVL cache, such that a repeated table is not solved again.
+
+    The coarse AVL grid is interpolated over C.G. location and required lift coefficient, in which both trim
+    quantities are (close to) bilinear, this returns a dense table for the performance module.
+
+    :param wing_in: The instantiated wing (typically passed from myUAV)
+    :type wing_in: Wing
+
+    :param stabilizer_in: The instantiated compound stabilizer with elevator (typically passed from myUAV)
+    :type stabilizer_in: CompoundStabilizer
+
+    :param weight_mtow: Final Maximum Take-Off Weight in SI kilogram [kg]
+    :type weight_mtow: float
+
+    :param n_cg: Number of C.G. locations of the AVL grid, at least 2
+    :type n_cg: int
+
+    :param n_speed: Number of airspeeds of the AVL grid, at least 2
+    :type n_speed: int
+
+    :param x_cg_values: C.G. locations of the AVL grid in SI meter [m]
+    :type x_cg_values: numpy.ndarray
+
+    :param speeds: True airspeeds of the AVL grid in SI meter per second [m/s]
+    :type speeds: numpy.ndarray
+
+    :param dense_resolution: Number of points along both axes of the dense table
+    :type dense_resolution: int
+
+    :param processes: Number of AVL processes, None uses all available CPUs
+    :type processes: int or NoneType
+    """
+
+    __icon__ = os.path.join(DIRS['ICON_DIR'], 'stability.png')
+
+    #: Instantiated Wing Object
+    wing_in = Input(Wing(), validator=val.Instance(Wing))
+
+    #: Instantiated Compound Stabilizer Object
+    stabilizer_in = Input(CompoundStabilizer(), validator=val.Instance(CompoundStabilizer))
+
+    #: The Maximum Take-Off Weight from bottoms-up Class II in SI kilogram [kg]
+    weight_mtow = Input(5.0, validator=val.Positive())
+
+    #: Number of C.G. locations of the AVL grid
+    n_cg = Input(5, validator=val.Instance(int))
+
+    #: Number of airspeeds of the AVL grid
+    n_speed = Input(8, validator=val.Instance(int))
+
+    #: Vertical location of the C.G. in SI meter [m]
+    z_cg = Input(0.0)
+
+    #: Number of points along both axes of the dense table
+    dense_resolution = Input(50, validator=val.Instance(int))
+
+    #: Number of AVL processes, None uses all available CPUs
+    processes = Input(None)
+
+    @n_cg.on_slot_change
+    def n_cg_validator(self):
+        """ Validator for the n_cg, the interpolation requires at least 2 C.G. locations """
+        if self.n_cg < 2:
+            raise ValueError('n_cg=%d is not a valid number of C.G. locations, at least 2 are required' % self.n_cg)
+
+    @n_speed.on_slot_change
+    def n_speed_validator(self):
+        """ Validator for the n_speed, the interpolation requires at least 2 airspeeds """
+        if self.n_speed < 2:
+            raise ValueError('n_speed=%d is not a valid number of airspeeds, at least 2 are required' % self.n_speed)
+
+    @Input
+    def x_cg_values(self):
+        """ C.G. locations from 10% to 50% of the MAC, which covers the stable range of a conventional aircraft.
+
+        :return: C.G. locations in SI meter [m]
+        :rtype: numpy.ndarray
+        """
+        return self.wing_in.lemac.x + self.wing_in.mac_length * np.linspace(0.1, 0.5, self.n_cg)
+
+    @Input
+    def speeds(self):
+        """ True airspeeds from 1.2 up to 3 times the stall speed of the wing.
+
+        :return: True airspeeds in SI meter per second [m/s]
+        :rtype: numpy.ndarray
+        """
+        return np.linspace(1.2, 3.0, self.n_speed) * self.wing_in.stall_speed
+
+    @Attribute(private=True)
+    def aircraft_geom(self):
+        """ The AVL geometry of the full aircraft, the wing surface with the tail surfaces.
+
+        :return: AVL Aircraft Geometry
+        :rtype: Geometry
+        """
+        return Geometry(name="Aircraft",
+                        reference_area=self.wing_in.s_req,
+                        reference_chord=self.wing_in.mac_length,
+                        reference_span=self.wing_in.semi_span * 2.0,
+                        reference_point=Point(0.0, 0.0, 0.0),
+                        surfaces=[self.wing_in.wing_surface] + self.stabilizer_in.avl_surfaces)
+
+    @Attribute
+    def grid(self):
+        """ C.G. location and airspeed of every case, the airspeed varies fastest.
+
+        :return: Flattened C.G. locations [m] and airspeeds [m/s]
+        :rtype: tuple
+        """
+        x_cg, speed = np.meshgrid(self.x_cg_values, self.speeds, indexing='ij')
+        return x_cg.ravel(), speed.ravel()
+
+    @Attribute
+    def required_lift_coefficients(self):
+        """ The lift coefficient which balances the weight at every airspeed of the grid.
+
+        :rtype: numpy.ndarray
+        """
+        return (2 * 9.81 * self.weight_mtow) / (self.wing_in.rho * np.asarray(self.speeds) ** 2 * self.wing_in.s_req)
+
+    @Attribute(private=True)
+    def trim_cases(self):
+        """ One trim case per grid point, the angle of attack is constrained to the required lift coefficient and the
+        elevator to zero pitching moment about the C.G.
+
+        :return: AVL Case Table
+        :rtype: CaseTable
+        """
+        x_cg, speed = self.grid
+        lift_coefficients = np.tile(self.required_lift_coefficients, len(self.x_cg_values))
+        return CaseTable(names=['trim%s' % i for i in range(len(x_cg))],
+                         outputs=['Totals'],
+                         constraints={'alpha': 'CL', 'elevator': 'Cm'},
+                         alpha=lift_coefficients,
+                         elevator=0.0,
+                         X_cg=x_cg,
+                         Z_cg=self.z_cg,
+                         velocity=speed,
+                         density=self.wing_in.rho,
+                         mass=self.weight_mtow)
+
+    @Attribute(private=True)
+    def trim_session(self):
+        """ The cases are divided over a number of AVL processes, the results are stored in the shared AVL cache. The
+        elevator and moment constraints are not supported by the built-in vortex-lattice solver, thus AVL is required.
+
+        :return: AVL Parallel Session
+        :rtype: ParallelSession
+        """
+        return ParallelSession(geometry=self.aircraft_geom, cases=self.trim_cases, processes=self.processes,
+                               cache=get_avl_cache())
+
+    @Attribute
+    def trim_results(self):
+        """ Solves the trim cases.
+
+        :return: AVL Totals per case
+        :rtype: dict
+        """
+        results = self.trim_session.get_results()
+        self.trim_session.reset()
+        return {name: results[name]['Totals'] for name in self.trim_cases.names}
+
+    def _get_table(self, quantity):
+        """ Collects a quantity of the AVL totals as a (C.G. x airspeed) array """
+        values = np.array([self.trim_results[name][quantity] for name in self.trim_cases.names])
+        return values.reshape(len(self.x_cg_values), len(self.speeds))
+
+    @Attribute
+    def alpha_table(self):
+        """ Trimmed angle of attack on the AVL grid, rows are C.G. locations and columns airspeeds.
+
+        :return: Angles of attack in degrees [deg]
+        :rtype: numpy.ndarray
+        """
+        return self._get_table('Alpha')
+
+    @Attribute
+    def elevator_table(self):
+        """ Trimmed elevator deflection on the AVL grid, rows are C.G. locations and columns airspeeds.
+
+        :return: Elevator deflections in degrees [deg]
+        :rtype: numpy.ndarray
+        """
+        return self._get_table('elevator')
+
+    @Attribute(private=True)
+    def interpolators(self):
+        """ Interpolates the AVL grid over C.G. location and required lift coefficient (ascending, thus with the
+        airspeeds reversed). Queries outside of the grid are extrapolated linearly.
+
+        :rtype: dict
+        """
+        order = np.argsort(self.required_lift_coefficients)
+        axes = (np.asarray(self.x_cg_values, dtype=float), self.required_lift_coefficients[order])
+        return {key: RegularGridInterpolator(axes, table[:, order], bounds_error=False, fill_value=None)
+                for key, table in (('alpha', self.alpha_table), ('elevator', self.elevator_table))}
+
+    def trim(self, x_cg, speed):
+        """ Interpolates the trimmed angle of attack and elevator deflection, both arguments may be arrays.
+
+        :param x_cg: C.G. location(s) in SI meter [m]
+        :param speed: True airspeed(s) in SI meter per second [m/s]
+        :return: Angle(s) of attack and elevator deflection(s) in degrees [deg]
+        :rtype: tuple
+        """
+        x_cg, speed = np.broadcast_arrays(np.asarray(x_cg, dtype=float), np.asarray(speed, dtype=float))
+        lift_coefficient = (2 * 9.81 * self.weight_mtow) / (self.wing_in.rho * speed ** 2 * self.wing_in.s_req)
+        points = np.stack((x_cg.ravel(), lift_coefficient.ravel()), axis=-1)
+        return (self.interpolators['alpha'](points).reshape(x_cg.shape),
+                self.interpolators['elevator'](points).reshape(x_cg.shape))
+
+    @Attribute
+    def dense_table(self):
+        """ The trim quantities interpolated on a dense (C.G. x airspeed) grid spanning the AVL grid.
+
+        :return: Dictionary with the axes 'x_cg' [m] and 'speed' [m/s] and the 2D arrays 'alpha' and 'elevator' [deg]
+        :rtype: dict
+        """
+        x_cg = np.linspace(np.min(self.x_cg_values), np.max(self.x_cg_values), self.dense_resolution)
+        speed = np.linspace(np.min(self.speeds), np.max(self.speeds), self.dense_resolution)
+        alpha, elevator = self.trim(x_cg[:, np.newaxis], speed[np.newaxis, :])
+        return {'x_cg': x_cg, 'speed': speed, 'alpha': alpha, 'elevator': elevator}
+
+    @Attribute
+    def plot_elevator_trim(self):
+        fig = plt.figure('ElevatorTrim')
+        plt.style.use('ggplot')
+        plt.title('Trimmed Elevator Deflection as a Function of True Airspeed')
+
+        table = self.dense_table
+        for x_cg, elevator in zip(self.x_cg_values, self.elevator_table):
+            line = plt.plot(self.speeds, elevator, marker='o', linestyle='None')[0]
+            plt.plot(table['speed'], self.trim(x_cg, table['speed'])[1], color=line.get_color(),
+                     label=r'$x_{\mathrm{cg}}=%1.3f$' % x_cg)
+
+        plt.xlabel(r'$V_{\mathrm{TAS}}$ [m/s]')
+        plt.ylabel(r'Elevator Deflection $\delta_e$ [deg]')
+        plt.legend(loc='best')
+        plt.show()
+        fig.savefig(fname=os.path.join(DIRS['USER_DIR'], 'plots', '%s.pdf' % fig.get_label()), format='pdf')
+        return 'Figure Plotted and Saved'
+
+
+if __name__ == '__main__':
+    from parapy.gui import display
+
+    obj = TrimTable(label='Trim Table')
+    display(obj)
@@ -4,17 +4,50 @@
 # Importing required local packages
 from parapy.core import *
 from math import *
+import numpy as np
 import matplotlib.pyplot as plt
 from directories import *
 from components import EOIR, FlightController
 from definitions import error_window
+from constraintdiagram import ConstraintDiagram, StallSpeed, ClimbGradient
 
 
 __author__ = ["Nelson Johnson", "Şan Kılkış"]
-__all__ = ["WingPowerLoading"]
+__all__ = ["WingPowerLoading", "power_loading_grid"]
 __settable__ = (True if __name__ == '__main__' else False)
 
 
+def power_loading_grid(wing_loading, maximum_lift_coefficient, aspect_ratio, eta_prop=0.7, rho=1.225, rho_cr=0.9091,
+                       zero_lift_drag=0.02, e_factor=0.8, climb_rate=1.524, climb_gradient=0.507):
+    """ Evaluates the climb-rate and climb-gradient power loadings of the loading diagram on a (C_Lmax x AR x W/S)
+    grid with array broadcasting. The last axis of the three grid arguments spans the grid, further leading axes are
+    batch axes (e.g. one per requirement set) to which the remaining arguments broadcast with a shape of
+    batch + (1, 1, 1), such that many diagrams are evaluated in a few array operations.
+
+    :param wing_loading: Wing loadings in SI Newton per meter squared [N/m^2]
+    :param maximum_lift_coefficient: Maximum lift coefficients of the wing [-]
+    :param aspect_ratio: Aspect ratios of the wing [-]
+    :return: Dictionary with the 'climb_rate' and 'climb_gradient' power loadings in SI Newton per Watt [N/W], both of
+             shape batch + (C_Lmax, AR, W/S)
+    :rtype: dict
+    """
+    ws = np.asarray(wing_loading, dtype=float)[..., np.newaxis, np.newaxis, :]
+    cl_max = np.asarray(maximum_lift_coefficient, dtype=float)[..., :, np.newaxis, np.newaxis]
+    ar = np.asarray(aspect_ratio, dtype=float)[..., np.newaxis, :, np.newaxis]
+
+    wp_cr = eta_prop / (climb_rate + np.sqrt(ws * (2.0 / rho_cr) *
+                                             (np.sqrt(zero_lift_drag) / (1.81 * ((ar * e_factor) ** (3.0 / 2.0))))))
+
+    #  The lift coefficient is kept 0.2 below C_Lmax during climb-out, the drag at C_Lmax (see climbcoefs)
+    lift_coef_cg = cl_max - 0.2
+    drag_coef_cg = zero_lift_drag + cl_max ** 2 / (pi * ar * e_factor)
+    wp_cg = eta_prop / (np.sqrt(ws * (2.0 / rho) * (1 / lift_coef_cg)) * climb_gradient + (drag_coef_cg / lift_coef_cg))
+
+    shape = np.broadcast(wp_cr, wp_cg).shape
+    return {'climb_rate': np.broadcast_to(wp_cr, shape),
+            'climb_gradient': np.broadcast_to(wp_cg, shape)}
+
+
 class WingPowerLoading(Base):
     """ This class will construct the wing and power loading plot for the fixed wing UAV based on the input MTOW. The
     requirements are the climb rate and climb gradient. There are assumed values for:  C_lmax, Stall speed,
@@ -72,6 +105,15 @@ class WingPowerLoading(Base):
 
     :param stall_speed: This is the assumed stall speed for the UAV.
     :type stall_speed: float
+
+    :param ws_resolution: Step of the wing loadings of the diagram in [N/m^2], None adapts the step to the range
+    :type ws_resolution: float or NoneType
+
+    :param ws_points: Number of wing loadings of the diagram with an adaptive step
+    :type ws_points: int
+
+    :param additional_constraints: Constraints added to the stall and climb-gradient requirements of the design point
+    :type additional_constraints: list
     """
 
     __icon__ = os.path.join(DIRS['ICON_DIR'], 'designpoint.png')
@@ -121,6 +163,17 @@ class WingPowerLoading(Base):
     #: Assumed Climb Gradient to clear 10m object 17m away.
     climb_gradient = Input(0.507, validator=val.Between(0.1, 0.9))
 
+    #: Step of the wing loadings of the diagram in SI Newton per meter squared [N/m^2], None adapts the step to the
+    #: range such that the diagram has :attr:`ws_points` wing loadings (e.g. for fast batch sizing)
+    ws_resolution = Input(1.0)
+
+    #: Number of wing loadings of the diagram with an adaptive step
+    ws_points = Input(200, validator=val.Instance(int))
+
+    #: Constraints added to the stall and climb-gradient requirements of the design point, e.g. a
+    #: :class:`CruiseSpeed` or :class:`SustainedTurn`, see :mod:`design.constraintdiagram`
+    additional_constraints = Input([], validator=val.Instance(list))
+
     @Input
     def aspect_ratio_range(self):
         """ Derived input that handles defaulting of the aspect_ratio. These values are determined from reference images
@@ -172,6 +225,23 @@ class WingPowerLoading(Base):
         else:
             raise TypeError('The provided input into :param:`maximum_lift_coefficient` is not valid')
 
+    @ws_resolution.on_slot_change
+    def ws_resolution_validator(self):
+        """ Validator for the ws_resolution, None or a positive step """
+        if self.ws_resolution is not None:
+            if isinstance(self.ws_resolution, bool) or not isinstance(self.ws_resolution, (int, float)):
+                raise TypeError('The provided input into :param:`ws_resolution` is not valid, use None or a number')
+            elif self.ws_resolution <= 0:
+                raise ValueError('ws_resolution=%s is not a valid step of the wing loadings, it should be positive'
+                                 % self.ws_resolution)
+
+    @ws_points.on_slot_change
+    def ws_points_validator(self):
+        """ Validator for the ws_points, a positive number of wing loadings """
+        if self.ws_points < 1:
+            raise ValueError('ws_points=%d is not a valid number of wing loadings, it should be positive'
+                             % self.ws_points)
+
     @Attribute
     def wingloading(self):
         """ This attribute calculates the 3 required wing loadings from the lift equation, using the stall speed \
@@ -191,31 +261,32 @@ class WingPowerLoading(Base):
         return {'values': ws, 'flag': ws_string}
 
     @Attribute
-    def powerloading(self):
-        """ Lazy-evaluation of Power Loading due to a Climb Rate Requirement at 3000m for various Aspect Ratios
+    def powerloading_grid(self):
+        """ Power loadings of the climb-rate (at 3000m) and climb-gradient requirements on the full \
+        (C_Lmax x AR x W/S) grid, see :func:`power_loading_grid`.
 
-        :return: Stacked-Array where first dimension corresponds to Aspect Ratio, and sub-dimension contains \
-        an array of floats in order of smallest Wing Loading to Largest. This range is set w/ parameter 'WS_range'
+        :return: Dictionary with a 3D array per requirement
         :rtype: dict
         """
-        wp_cr = []
-        for i in range(len(self.aspect_ratio_range)):
-            wp_cr.append([self.eta_prop / (self.climb_rate + sqrt(
-                num * (2.0 / self.rho_cr) * (sqrt(self.zero_lift_drag) / (1.81 *
-                                                                          ((self.aspect_ratio_range[i] * e) **
-                                                                           (3.0 / 2.0))))))
-                          for num in self.ws_range])
-            # evaluating all values of WS_range w/ list comprehension
-        # Picks the first aspect ratio and proceeds since the climb-gradient requirement is not influenced heavily by AR
-        wp_cg = []
-        for i in range(len(self.maximum_lift_coefficient)):
-            wp_cg.append([self.eta_prop / (sqrt(num * (2.0 / self.rho) * (1 / self.climbcoefs['lift'][i])) *
-                                           self.climb_gradient + (self.climbcoefs['drag'][0][i] /
-                                                                  self.climbcoefs['lift'][i]))
-                          for num in self.ws_range])
+        return power_loading_grid(self.ws_range, self.maximum_lift_coefficient, self.aspect_ratio_range,
+                                  eta_prop=self.eta_prop, rho=self.rho, rho_cr=self.rho_cr,
+                                  zero_lift_drag=self.zero_lift_drag, e_factor=self.e_factor,
+                                  climb_rate=self.climb_rate, climb_gradient=self.climb_gradient)
 
-        return {'climb_rate': wp_cr,
-                'climb_gradient': wp_cg}
+    @Attribute
+    def powerloading(self):
+        """ Lazy-evaluation of Power Loading due to a Climb Rate Requirement at 3000m for various Aspect Ratios and a
+        Climb Gradient Requirement for various C_Lmax's, taken from :attr:`powerloading_grid`.
+
+        :return: Stacked-Arrays where the first dimension corresponds to Aspect Ratio (climb rate) or C_Lmax (climb \
+        gradient), and the second contains the power loadings in order of smallest Wing Loading to Largest. This range \
+        is set w/ parameter 'ws_range'
+        :rtype: dict
+        """
+        # The climb-rate requirement does not depend on C_Lmax, the climb-gradient requirement is evaluated at the first
+        # aspect ratio since it is not influenced heavily by AR
+        return {'climb_rate': self.powerloading_grid['climb_rate'][0, :, :],
+                'climb_gradient': self.powerloading_grid['climb_gradient'][:, 0, :]}
 
     @Attribute
     def plot_loadingdiagram(self):
@@ -258,12 +329,11 @@ class WingPowerLoading(Base):
         return "Plot generated and closed"
 
     @Attribute
-    def designpoint(self):
-        """ An attribute which adds a safety factor to the lift coefficient in order to not stall out \
-        during climb-out. Modifying the lift coefficient changes drag coefficients as well due to induced drag, \
-        the latter part of this code computes the new drag coefficients.
+    def design_choices(self):
+        """ An attribute which chooses the C_Lmax closest to the maximum lift that a clean airfoil typically generates
+        and the aspect ratio closest to the optimal aspect ratio of a hand launched (11) or other (20) UAV.
 
-        :return: Dictionary containing design_point variables ('lift_coefficient') and drag coefficients ('climb_drag')
+        :return: Dictionary containing the chosen 'lift_coefficient' and 'aspect_ratio'
         :rtype: dict
         """
 
@@ -277,15 +347,6 @@ class WingPowerLoading(Base):
         #: in other words idx1 is the index corresponding to the closest user-input value to lift_coef_realistic
         idx1 = error.index(min(error))
 
-        #: ws is the chosen Wing Loading based on idx1
-        ws = self.wingloading['values'][idx1]
-
-        #: Evaluation of the distance (error) between the chosen wing-loading and all values in WS_range
-        error = [abs(num - ws) for num in self.ws_range]
-
-        #: idx2 is the index corresponding to the closest value in WS_range to the chosen design wing-loading
-        idx2 = error.index(min(error))
-
         optimal_ars = [11, 20]
         if self.handlaunch:
             optimal_ar = optimal_ars[0]
@@ -298,19 +359,46 @@ class WingPowerLoading(Base):
         #: idx3 corresponds to the index of the closest value within self.AR to the optimal_ar defined by the rule above
         idx3 = error.index(min(error))
 
-        wp_choices = [self.powerloading['climb_rate'][idx3][idx2],
-                      self.powerloading['climb_gradient'][idx1][idx2]]
-        if self.handlaunch:
-            wp = wp_choices[1]
-        else:
-            wp = wp_choices[1]
-        # Went back to utilizing the climb_gradient requirement for non-hand launched UAV's
-        # as well since climb_rate is not as critical and produced unrealistic motor selection
+        return {'lift_coefficient': self.maximum_lift_coefficient[idx1],
+                'aspect_ratio': self.aspect_ratio_range[idx3]}
 
-        return{'lift_coefficient': self.maximum_lift_coefficient[idx1],
-               'aspect_ratio': self.aspect_ratio_range[idx3],
-               'wing_loading': ws,
-               'power_loading': wp}
+    @Attribute
+    def constraints(self):
+        """ The constraints of the design point: the stall speed at the chosen C_Lmax and the climb-gradient
+        requirement (at the first aspect ratio like in :attr:`powerloading`), followed by the
+        :attr:`additional_constraints`. The climb-rate requirement is not used for the design point since it is not as
+        critical and produced unrealistic motor selection.
+
+        :return: List of constraints
+        :rtype: list
+        """
+        lift_coefficient = self.design_choices['lift_coefficient']
+        return [StallSpeed(speed=self.stall_speed, cl_max=lift_coefficient, rho=self.rho,
+                           label='C_Lmax%s = %.2f' % (self.wingloading['flag'], lift_coefficient)),
+                ClimbGradient(gradient=self.climb_gradient, cl_max=lift_coefficient, rho=self.rho,
+                              zero_lift_drag=self.zero_lift_drag, aspect_ratio=self.aspect_ratio_range[0],
+                              e_factor=self.e_factor, eta_prop=self.eta_prop)] + list(self.additional_constraints)
+
+    @Part
+    def constraint_diagram(self):
+        """ Instantiates the :class:`ConstraintDiagram` of the :attr:`constraints` to find the feasible region """
+        return ConstraintDiagram(constraints=self.constraints,
+                                 label='Constraint Diagram')
+
+    @Attribute
+    def designpoint(self):
+        """ An attribute which chooses the design point: the upper-right corner of the feasible region of the
+        :attr:`constraints`. Without :attr:`additional_constraints` this is the wing loading of the stall requirement
+        and the climb-gradient power loading evaluated directly at this exact wing loading.
+
+        :return: Dictionary containing design_point variables ('lift_coefficient', 'aspect_ratio', 'wing_loading' and \
+        'power_loading')
+        :rtype: dict
+        """
+        return {'lift_coefficient': self.design_choices['lift_coefficient'],
+                'aspect_ratio': self.design_choices['aspect_ratio'],
+                'wing_loading': self.constraint_diagram.optimum['wing_loading'],
+                'power_loading': self.constraint_diagram.optimum['power_loading']}
 
     @Attribute
     def climbcoefs(self):
@@ -334,14 +422,15 @@ class WingPowerLoading(Base):
 
     @Attribute(private=True)
     def ws_range(self):
-        """ This is a dummy list of wing loadings for iterating in the Power Loading Equations.
+        """ This is the array of wing loadings at which the Power Loading Equations are evaluated, from 1 [N/m^2] up to
+        the maximum wing loading rounded up to the next hundred, in steps of :attr:`ws_resolution`.
 
-        :return: List of wing loadings
-        :rtype: List
+        :return: Array of wing loadings
+        :rtype: numpy.ndarray
         """
-        ws_limit = max(self.wingloading['values'])
-        values = [float(i) for i in range(1, int(ceil(ws_limit / 100.0)) * 100)]
-        return values
+        ws_limit = int(ceil(max(self.wingloading['values']) / 100.0)) * 100
+        step = self.ws_resolution if self.ws_resolution is not None else (ws_limit - 1.0) / self.ws_points
+        return np.arange(1.0, ws_limit, step)
 
     @Attribute
     def eta_tot(self):
@@ -16,12 +16,17 @@ from parapy.exchange import STEPWriter
 from components import *
 from directories import *
 from definitions import *
+from components.liftingsurfaces.wing import get_avl_cache
+from components.liftingsurfaces.fidelity import FidelityManager
 from math import sin, radians
 from collections import Iterable
 import copy
 import xlwt
 import matplotlib.pyplot as plt
 
+#  Import AVL wrapper written by Reno El Mendorp. https://github.com/renoelmendorp/AVLWrapper
+from avl import Case, Parameter, EigenmodeSession
+
 
 # TODO (TBD) Visualize performance in the GUI through the addition of bar-charts utilizing ParaPy Boxes
 
@@ -34,6 +39,32 @@ class UAV(DesignInput):
     #: Switch case that handles build location of the single motor
     motor_integration = Input('pusher', validator=val.OneOf(['pusher', 'puller']))
 
+    #: Resolution of the AVL lattice of the wing for the final answer, see :attr:`Wing.lattice_mode`
+    wing_lattice = Input('fixed', validator=val.OneOf(['fixed', 'coarse', 'converged']))
+
+    #: Resolution of the AVL lattice of the wing while the C.G. is converging in :attr:`final_cg`
+    iteration_lattice = Input('coarse', validator=val.OneOf(['fixed', 'coarse', 'converged']))
+
+    #: Fidelity of the wing aerodynamic coefficients for the final answer, see :attr:`Wing.aero_fidelity`
+    wing_fidelity = Input('lattice', validator=val.OneOf(['lattice', 'analytic', 'auto']))
+
+    #: Fidelity of the wing aerodynamic coefficients while the C.G. is converging in :attr:`final_cg`, with 'auto' the
+    #: first iterations use the analytic estimates and later iterations the lattice
+    iteration_fidelity = Input('auto', validator=val.OneOf(['lattice', 'analytic', 'auto']))
+
+    #: Switch to feed the lattice analyses of the tail (HT lift slope and downwash) into the scissor plot, by default
+    #: the thin-airfoil and empirical estimates are used
+    tail_analysis = Input(False, validator=val.Instance(bool))
+
+    @Input
+    def fidelity_manager(self):
+        """ The fidelity manager of the wing, owned by this UAV. It is shared with the copies of the C.G. loop, such
+        that 'auto' compares the wings of consecutive iterations, see :attr:`Wing.aero_fidelity`.
+
+        :rtype: FidelityManager
+        """
+        return FidelityManager()
+
     @Input
     def cg(self):
         """ Computes an initial-guess for the Center of Gravity Location at Run-Time utilizing 'weight_and_balance'
@@ -46,28 +77,47 @@ class UAV(DesignInput):
     def final_cg(self):
         """ This attribute utilizes a loop to find a converged final Center of Gravity that is stable, this step is
         necessary since at run-time the tail is not yet made and the scissor plot only calculates stability for a
-        tail-less aircraft! """
+        tail-less aircraft! The C.G. is first converged with the (cheap) :attr:`iteration_lattice` and
+        :attr:`iteration_fidelity` of the wing, the last iterations use the :attr:`wing_lattice` and
+        :attr:`wing_fidelity` of the final answer. Both stages iterate at most 20 times. """
         old_cg = self.cg
         print 'Run-Time CG = %1.4f \n' % old_cg.x
-        new_cg = self.weight_and_balance()['CG']
+        final_stage = (self.wing_lattice, self.wing_fidelity)
+        iteration_stage = (self.iteration_lattice, self.iteration_fidelity)
+        stages = [iteration_stage, final_stage] if iteration_stage != final_stage else [final_stage]
         loop = 0
         xcg_cache = []
-        while abs(old_cg.x - new_cg.x) > 0.0005 and loop < 20:
-            loop += 1
-            print 'Current Iteration: ' + str(loop)
-
-            new_uav_object = copy.copy(self)  # Large Performance improvement from making a copy of the current object!
-            old_cg = new_uav_object.cg
-            print 'Old CG = %1.6f' % old_cg.x
-
-            new_cg = new_uav_object.weight_and_balance()['CG']
-            print 'New CG = %1.6f' % new_cg.x
-
-            # Adding rounded c.g.x values to cache and cross-referencing to see if convergence behavior is oscillating
-            if round(old_cg.x, 4) and round(new_cg.x, 4) in xcg_cache:
-                new_cg = Point((new_cg.x + old_cg.x)/2.0, new_cg.y, new_cg.z)
-            setattr(self, 'cg', new_cg)
-            xcg_cache = xcg_cache + [round(old_cg.x, 4)] + [round(new_cg.x, 4)]
+        setattr(self, 'fidelity_manager', self.fidelity_manager)  # Set explicitly, such that the copies share it
+        try:
+            for lattice, fidelity in stages:
+                print 'Wing Lattice: %s, Fidelity: %s' % (lattice, fidelity)
+                setattr(self, 'wing_lattice', lattice)
+                setattr(self, 'wing_fidelity', fidelity)
+                old_cg = self.cg
+                new_cg = self.weight_and_balance()['CG']
+                stage_loop = 0  # Every stage has its own budget of iterations
+                while abs(old_cg.x - new_cg.x) > 0.0005 and stage_loop < 20:
+                    stage_loop += 1
+                    loop += 1
+                    print 'Current Iteration: ' + str(loop)
+
+                    new_uav_object = copy.copy(self)  # Large Performance improvement from making a copy of the object!
+                    old_cg = new_uav_object.cg
+                    print 'Old CG = %1.6f' % old_cg.x
+
+                    new_cg = new_uav_object.weight_and_balance()['CG']
+                    print 'New CG = %1.6f' % new_cg.x
+
+                    # Adding rounded c.g.x values to cache and cross-referencing to see if convergence is oscillating
+                    if round(old_cg.x, 4) and round(new_cg.x, 4) in xcg_cache:
+                        new_cg = Point((new_cg.x + old_cg.x)/2.0, new_cg.y, new_cg.z)
+                    setattr(self, 'cg', new_cg)
+                    xcg_cache = xcg_cache + [round(old_cg.x, 4)] + [round(new_cg.x, 4)]
+        finally:
+            # The wing of the final answer is restored, also when an iteration with the cheap wing is interrupted
+            if (self.wing_lattice, self.wing_fidelity) != final_stage:
+                setattr(self, 'wing_lattice', final_stage[0])
+                setattr(self, 'wing_fidelity', final_stage[1])
 
         fig = plt.figure('Convergence Behavior')
         plt.style.use('ggplot')
@@ -158,6 +208,77 @@ class UAV(DesignInput):
     def areas(self):
         return self.sum_area()
 
+    @Attribute
+    def mass_properties(self):
+        """ Mass, C.G. location and inertia tensor about the C.G. of the UAV as AVL case states. All components are
+        treated as point masses at their C.G., except for the mass of the wing which is spread uniformly over its span.
+
+        :return: AVL case states 'mass' [kg], 'X_cg', 'Y_cg', 'Z_cg' [m], 'Ixx', 'Iyy', 'Izz', 'Izx' [kg m^2]
+        :rtype: dict
+        """
+        cg = self.cg
+        properties = {'mass': self.weights['mtow'], 'X_cg': cg.x, 'Y_cg': cg.y, 'Z_cg': cg.z,
+                      'Ixx': 0.0, 'Iyy': 0.0, 'Izz': 0.0, 'Izx': 0.0}
+
+        for _child in self.get_children():
+            if hasattr(_child, 'weight') and hasattr(_child, 'center_of_gravity'):
+                mass = _child.getslot('weight')
+                location = _child.getslot('center_of_gravity')
+                dx, dy, dz = location.x - cg.x, location.y - cg.y, location.z - cg.z
+
+                properties['Ixx'] = properties['Ixx'] + mass * (dy ** 2 + dz ** 2)
+                properties['Iyy'] = properties['Iyy'] + mass * (dx ** 2 + dz ** 2)
+                properties['Izz'] = properties['Izz'] + mass * (dx ** 2 + dy ** 2)
+                properties['Izx'] = properties['Izx'] + mass * dx * dz
+
+                # Uniform bar along the span, which dominates the roll and yaw inertia
+                if _child.getslot('component_type') == 'wing':
+                    spread = mass * (2.0 * _child.semi_span) ** 2 / 12.0
+                    properties['Ixx'] = properties['Ixx'] + spread
+                    properties['Izz'] = properties['Izz'] + spread
+
+        return properties
+
+    @Attribute
+    def dynamic_stability(self):
+        """ Computes the eigenvalues of the trimmed aircraft at the endurance and cruise velocities with AVL, with the
+        mass properties of the UAV. The results are stored in the shared AVL cache. The vortex-lattice solver (see
+        :attr:`Wing.aero_solver`) has no eigenmode analysis, the dynamic stability is then not evaluated.
+
+        :return: Eigenvalues in SI per second [1/s] per flight condition, fieldnames = 'endurance', 'cruise', None with
+                 the vortex-lattice solver
+        :rtype: dict or NoneType
+        """
+        if self.wing.aero_solver != 'avl':
+            return None
+
+        speeds = {'endurance': self.performance.endurance_velocity, 'cruise': self.performance.cruise_velocity}
+        rho = self.wing.rho
+        reference_area = self.wing.s_req
+        cases = [Case(name=name,
+                      alpha=Parameter(name='alpha', constraint='CL',
+                                      value=(2 * 9.81 * self.weights['mtow']) / (rho * speed ** 2 * reference_area)),
+                      elevator=Parameter(name='elevator', constraint='Cm', value=0.0),
+                      velocity=speed,
+                      density=rho,
+                      **self.mass_properties) for name, speed in sorted(speeds.items())]
+
+        session = EigenmodeSession(geometry=self.trim_table.aircraft_geom, cases=cases, cache=get_avl_cache())
+        results = session.get_results()
+        session.reset()
+        return {name: results[name]['Eigenvalues'] for name in speeds}
+
+    @Attribute
+    def dynamically_stable(self):
+        """ The UAV is dynamically stable when all eigenvalues have a negative real part.
+
+        :return: None when the dynamic stability is not evaluated, see :attr:`dynamic_stability`
+        :rtype: bool or NoneType
+        """
+        if self.dynamic_stability is None:
+            return None
+        return all(all(value.real < 0 for value in values) for values in self.dynamic_stability.values())
+
     @Attribute
     def write_excel(self):
         """ Responsible for writing the important parameters generated from the instantiation of myUAV and stores them
@@ -165,7 +286,9 @@ class UAV(DesignInput):
         feel free to collapse for readability of the code """
 
         ignore_list = ['children', 'mesh_deflection', 'browse_airfoils', 'browse_cameras', 'browse_motors',
-                       '_local_bbox_bounds', '_bbox_bounds', 'hidden']
+                       '_local_bbox_bounds', '_bbox_bounds', 'hidden',
+                       'aero_surrogate', 'surrogate_prediction', 'surrogate_error', 'lattice_study', 'aero_tier',
+                       'design_vector', 'analytic_estimates']
         hdr_font = xlwt.Font()
         hdr_font.name = 'Times New Roman'
         hdr_font.bold = True
@@ -306,6 +429,9 @@ class UAV(DesignInput):
                     stall_speed=self.params.stall_speed,
                     rho=self.params.rho,
                     aspect_ratio=self.params.aspect_ratio,
+                    lattice_mode=self.wing_lattice,
+                    aero_fidelity=self.wing_fidelity,
+                    fidelity_manager=self.fidelity_manager,
                     label='Main Wing')
 
     @Part
@@ -322,8 +448,17 @@ class UAV(DesignInput):
                            Cla_w=self.wing.lift_coef_vs_alpha,
                            delta_xcg=0.1,  # Decreasing for a slightly smaller tail
                            configuration=self.configuration,
+                           cla_h_in=self.tail_aero.cla_h if self.tail_analysis else None,
+                           downwash_in=self.tail_aero.downwash_gradient if self.tail_analysis else None,
                            label='Stability Parameters')
 
+    @Part
+    def tail_aero(self):
+        return TailAerodynamics(wing_in=self.wing,
+                                aspect_ratio_h=self.stability.AR_h,
+                                lhc=self.stability.lhc,
+                                label='Tail Aerodynamics')
+
     @Part
     def center_of_gravity(self):
         return VisualCG(vis_cog=self.cg,
@@ -413,8 +548,20 @@ class UAV(DesignInput):
                            parasitic_drag=self.parasite_drag,
                            oswald_factor=self.params.wingpowerloading.e_factor,
                            cg_valid=self.cg_valid,
+                           trim_table_in=self.trim_table if self.wing.aero_solver == 'avl' else None,
+                           x_cg=self.cg.x,
                            label='Performance')
 
+    @Part
+    def trim_table(self):
+        """ The trim table needs constrained AVL cases (with the elevator), with the :attr:`Wing.aero_solver` set to
+        'vlm' it is not passed to the performance module, which then skips the trim prediction """
+        return TrimTable(wing_in=self.wing,
+                         stabilizer_in=self.stabilizer,
+                         weight_mtow=self.weights['mtow'],
+                         z_cg=self.cg.z,
+                         label='Trim Table')
+
     def weight_and_balance(self):
         """ Retrieves all relevant parameters from children with `weight` and `center_of_gravity` attributes and then
         calculates the center of gravity w.r.t the origin Point(0, 0, 0)
@@ -423,6 +570,12 @@ class UAV(DesignInput):
         :rtype: dict
         """
 
+        # Starting the wing and tail AVL analyses in the background, these run while the remaining geometry is built
+        if self.wing.aero_tier == 'lattice':
+            self.wing.avl_future
+        if self.tail_analysis:
+            self.tail_aero.sessions
+
         children = self.get_children()
 
         # Creating dummy lists to store all weights and respective c.g. locations
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Test configuration. The AVL wrapper is imported as the top level package avlwrapper (as in avl/example.py) and runs
+the stand-in avl/fakeavl.py, unless an AVL installation is given by the AVL_EXECUTABLE environment variable.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AVL_DIR = os.path.join(ROOT_DIR, 'avl')
+
+for path in (ROOT_DIR, AVL_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+if not os.environ.get('AVL_EXECUTABLE'):
+    os.environ['AVL_EXECUTABLE'] = os.path.join(AVL_DIR, 'fakeavl.py')
+
+
+@pytest.fixture
+def geometry():
+    """ Straight tapered wing with a horizontal tail carrying an elevator """
+    from avlwrapper import Geometry, Surface, Section, NacaAirfoil, Control, Point, Spacing
+
+    elevator = Control(name='elevator', gain=1.0, x_hinge=0.7, duplicate_sign=1.0)
+    wing = Surface(name='Wing', n_chordwise=8, chord_spacing=Spacing.cosine, n_spanwise=10,
+                   span_spacing=Spacing.neg_sine, y_duplicate=0.0,
+                   sections=[Section(leading_edge_point=Point(0, 0, 0), chord=0.3, airfoil=NacaAirfoil(naca='2412')),
+                             Section(leading_edge_point=Point(0.05, 1.0, 0), chord=0.2,
+                                     airfoil=NacaAirfoil(naca='2412'))])
+    tail = Surface(name='HT', n_chordwise=8, chord_spacing=Spacing.cosine, n_spanwise=6,
+                   span_spacing=Spacing.neg_sine, y_duplicate=0.0,
+                   sections=[Section(leading_edge_point=Point(1.0, 0, 0), chord=0.15,
+                                     airfoil=NacaAirfoil(naca='0012'), controls=[elevator]),
+                             Section(leading_edge_point=Point(1.02, 0.3, 0), chord=0.1,
+                                     airfoil=NacaAirfoil(naca='0012'), controls=[elevator])])
+    return Geometry(name='Aircraft', reference_area=0.5, reference_chord=0.25, reference_span=2.0,
+                    reference_point=Point(0, 0, 0), surfaces=[wing, tail])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the content-addressed result cache of the AVL wrapper """
+
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+import pytest
+
+from avlwrapper import Session, Case, ResultCache
+
+
+@pytest.fixture
+def cache():
+    directory = tempfile.mkdtemp()
+    yield ResultCache(directory, max_size=3000)
+    shutil.rmtree(directory)
+
+
+def test_key_depends_on_cases(geometry):
+    session = Session(geometry=geometry, cases=[Case(name='cruise', alpha=2.0)])
+    same = Session(geometry=geometry, cases=[Case(name='cruise', alpha=2.0)])
+    other = Session(geometry=geometry, cases=[Case(name='cruise', alpha=4.0)])
+    assert ResultCache.get_key(session) == ResultCache.get_key(same)
+    assert ResultCache.get_key(session) != ResultCache.get_key(other)
+
+
+def test_key_depends_on_executable(geometry, tmpdir):
+    session = Session(geometry=geometry, cases=[Case(name='cruise', alpha=2.0)])
+    key = ResultCache.get_key(session)
+
+    executable = tmpdir.join('avl')
+    executable.write('')
+    session.config['avl_bin'] = str(executable)
+    other_key = ResultCache.get_key(session)
+    assert other_key != key
+
+    # a rebuilt executable does not reuse the results of the previous build
+    os.utime(str(executable), (0, 0))
+    assert ResultCache.get_key(session) != other_key
+
+
+def test_round_trip(cache):
+    assert cache.get('missing') is None
+    cache.put('entry', {'cruise': {'Totals': {'CLtot': 0.5}}})
+    assert cache.get('entry') == {'cruise': {'Totals': {'CLtot': 0.5}}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_evicted(cache):
+    # three entries of about 900 bytes fit in the cache, a fourth does not
+    for idx in range(3):
+        cache.put('entry{0}'.format(idx), b'x' * 900)
+        os.utime(cache._get_path('entry{0}'.format(idx)), (idx, idx))
+    cache.get('entry0')  # entry1 is now the least recently used
+
+    cache.put('entry3', b'x' * 900)
+    assert cache.size <= cache.max_size
+    assert cache.get('entry1') is None
+    assert cache.get('entry0') is not None
+    assert cache.get('entry3') is not None
+
+
+def test_foreign_entry_is_miss(cache):
+    with open(cache._get_path('foreign'), 'wb') as cache_file:
+        cache_file.write(b'\x80\x02cnonexistent\nThing\nq\x00.')
+    assert cache.get('foreign') is None
+    assert cache.misses == 1
+
+
+def test_pickle(cache):
+    cache.put('entry', [1.0])
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.get('entry') == [1.0]
+
+
+def test_threads(cache):
+    errors = []
+
+    def run(thread_nr):
+        try:
+            for idx in range(100):
+                cache.put('entry{0}_{1}'.format(thread_nr, idx % 10), list(range(100)))
+                cache.get('entry{0}_{1}'.format(thread_nr, (idx * 7) % 10))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run, args=(thread_nr,)) for thread_nr in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.size <= cache.max_size
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the array-backed case table against lists of Case objects """
+
+import numpy as np
+import pytest
+
+from avlwrapper import Case, CaseTable, Parameter
+from avlwrapper.core import InputError
+
+
+def get_lines(case_input):
+    # the order of the parameter and state lines follows the dict order of Case (arbitrary before Python 3.7)
+    return sorted(case_input.splitlines())
+
+
+def assert_inputs_equal(table, cases):
+    for number, case in enumerate(cases, 1):
+        case.number = number
+    assert len(table) == len(cases)
+    for table_input, case in zip(table.create_inputs(), cases):
+        assert get_lines(table_input) == get_lines(case.create_input())
+
+
+def test_columns():
+    table = CaseTable(alpha=[0.0, 2.5], velocity=12.0, X_cg=[0.1, 0.2], elevator=[-1.0, 1.0])
+    cases = [Case(name='case0', alpha=0.0, velocity=12.0, X_cg=0.1, elevator=-1.0),
+             Case(name='case1', alpha=2.5, velocity=12.0, X_cg=0.2, elevator=1.0)]
+    assert_inputs_equal(table, cases)
+
+
+def test_integer_values():
+    table = CaseTable(names=['cruise'], alpha=5, velocity=12.5)
+    assert table['alpha'].dtype.kind == 'i'
+    assert_inputs_equal(table, [Case(name='cruise', alpha=5, velocity=12.5)])
+    assert " alpha        -> alpha        = 5\n" in table.create_input()
+
+
+def test_constraints():
+    # a constrained column keeps the default of its state, as a Case with a constrained Parameter
+    table = CaseTable(names=['trim'], constraints={'alpha': 'CL', 'elevator': 'Cm'}, alpha=0.5, elevator=0.0,
+                      velocity=15.0)
+    case = Case(name='trim', alpha=Parameter(name='alpha', value=0.5, constraint='CL'),
+                elevator=Parameter(name='elevator', value=0.0, constraint='Cm'), velocity=15.0)
+    assert_inputs_equal(table, [case])
+    assert_inputs_equal(table, table.to_cases())
+
+
+def test_grid():
+    table = CaseTable.from_grid(alpha=np.linspace(-5.0, 10.0, 4), beta=[0.0, 5.0])
+    cases = [Case(name='case{0}'.format(idx), alpha=alpha, beta=beta)
+             for idx, (alpha, beta) in enumerate((alpha, beta) for alpha in np.linspace(-5.0, 10.0, 4).tolist()
+                                                 for beta in [0.0, 5.0])]
+    assert_inputs_equal(table, cases)
+
+
+def test_rows():
+    table = CaseTable(alpha=[0.0, 2.0, 4.0], mass=3.0)
+    for row, case in zip(table, table.to_cases()):
+        case.number = row.number
+        assert row.name == case.name
+        assert get_lines(row.create_input()) == get_lines(case.create_input())
+    assert len(table[1:]) == 2
+    assert table[-1].name == 'case2'
+
+
+def test_invalid_constraint():
+    with pytest.raises(InputError):
+        CaseTable(alpha=[0.0], constraints={'beta': 'CY'})
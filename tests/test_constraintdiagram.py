@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the vectorized feasible region against the constraints evaluated point by point """
+
+import numpy as np
+import pytest
+
+pytest.importorskip('parapy')
+
+from design.constraintdiagram import feasible_region, StallSpeed, HandLaunchSpeed, ClimbGradient, ClimbRate, \
+    CruiseSpeed, SustainedTurn
+
+SPEEDS = [15.0, 20.0, 25.0]
+
+
+def get_constraints(speed):
+    return [StallSpeed(speed=8.0, cl_max=1.25), HandLaunchSpeed(launch_speed=9.0, margin=1.1, cl_max=1.25),
+            ClimbGradient(cl_max=1.25), ClimbRate(), SustainedTurn(speed=12.0), CruiseSpeed(speed=speed)]
+
+
+def get_envelope(constraints, wing_loadings):
+    """ The smallest power loading and the index of its constraint at every wing loading """
+    curves = [constraint for constraint in constraints if constraint.kind == 'power_loading']
+    envelope, active = [], []
+    for wing_loading in wing_loadings:
+        values = [float(constraint.power_loading(np.array([wing_loading]))[0]) for constraint in curves]
+        envelope.append(min(values))
+        active.append(values.index(min(values)))
+    return envelope, active
+
+
+def test_stall_limit():
+    assert float(StallSpeed(speed=8.0, cl_max=1.25, rho=1.225).wing_loading_limit()) == pytest.approx(49.0)
+
+
+@pytest.mark.parametrize('objective', ['wing_loading', 'power_loading'])
+def test_batch(objective):
+    region = feasible_region(get_constraints(SPEEDS), n_points=50, objective=objective)
+    assert region['envelope'].shape == (len(SPEEDS), 50)
+    assert region['polygon'].shape == (len(SPEEDS), 52, 2)
+
+    for idx, speed in enumerate(SPEEDS):
+        constraints = get_constraints(speed)
+        ws_limit = min(float(constraint.wing_loading_limit()) for constraint in constraints
+                       if constraint.kind == 'wing_loading')
+        wing_loadings = [ws_limit * (j + 1) / 50.0 for j in range(50)]
+        envelope, active = get_envelope(constraints, wing_loadings)
+
+        np.testing.assert_allclose(region['wing_loading_limit'], ws_limit)  # the limits are no batch
+        np.testing.assert_allclose(region['wing_loading'][idx], wing_loadings)
+        np.testing.assert_allclose(region['envelope'][idx], envelope, rtol=1e-12)
+        assert list(region['active'][idx]) == active
+
+        best = len(envelope) - 1 if objective == 'wing_loading' else envelope.index(max(envelope))
+        assert region['optimum']['wing_loading'][idx] == pytest.approx(wing_loadings[best])
+        assert region['optimum']['power_loading'][idx] == pytest.approx(envelope[best])
+        assert region['optimum']['active'][idx] == active[best]
+
+
+def test_scalar():
+    region = feasible_region(get_constraints(20.0), n_points=50)
+    assert region['envelope'].shape == (50,)
+    assert region['optimum']['wing_loading'].shape == ()
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        feasible_region([StallSpeed()])
+    with pytest.raises(ValueError):
+        feasible_region([ClimbGradient()])
+    with pytest.raises(ValueError):
+        feasible_region(get_constraints(20.0), objective='range')
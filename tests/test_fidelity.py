@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the tier choice of the fidelity manager """
+
+import pytest
+
+pytest.importorskip('parapy')
+
+from components.liftingsurfaces.fidelity import FidelityManager
+
+
+def test_peek_has_no_side_effect():
+    manager = FidelityManager()
+    design = (8.0, 0.5, 0.0)
+    # the tier does not depend on how often it is queried before a value is recorded
+    assert manager.peek_tier('wing', design, 0.01)[0] == 'analytic'
+    assert manager.peek_tier('wing', design, 0.01)[0] == 'analytic'
+    assert manager.history == {}
+
+
+def test_record_promotes():
+    manager = FidelityManager()
+    manager.record('wing', 'C_L_alpha', 'analytic', 4.5, design=(8.0, 0.5, 0.0))
+    assert manager.peek_tier('wing', (8.0, 0.5, 0.0), 0.01) == ('lattice', 0.0)
+    assert manager.peek_tier('wing', (8.0, 0.6, 0.0), 0.01)[0] == 'analytic'
+    # other keys have their own history
+    assert manager.peek_tier('tail', (8.0, 0.5, 0.0), 0.01)[0] == 'analytic'
+
+    # values without a design are logged only
+    manager.record('wing', 'C_m_control', 'lattice', -0.05)
+    assert manager.peek_tier('wing', (8.0, 0.5, 0.0), 0.01)[0] == 'lattice'
+    assert manager.summary() == {'analytic': 1, 'lattice': 1}
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the streamed per-case results of Session.iter_results() against Session.get_results() """
+
+import shutil
+import tempfile
+
+import pytest
+
+from avlwrapper import Session, Case, ResultCache
+from avlwrapper.core import InputError
+
+
+def get_cases(alphas):
+    return [Case(name='alpha{0}'.format(idx), alpha=alpha, velocity=12.0) for idx, alpha in enumerate(alphas)]
+
+
+@pytest.fixture
+def cache():
+    directory = tempfile.mkdtemp()
+    yield ResultCache(directory)
+    shutil.rmtree(directory)
+
+
+def test_matches_get_results(geometry):
+    alphas = [6.0, -2.0, 0.0, 4.0]
+    expected = Session(geometry=geometry, cases=get_cases(alphas), outputs=['Totals', 'StripForces']).get_results()
+
+    session = Session(geometry=geometry, cases=get_cases(alphas), outputs=['Totals', 'StripForces'])
+    streamed = list(session.iter_results())
+    # in the order of the cases, not sorted by name or angle of attack
+    assert [name for name, _ in streamed] == ['alpha0', 'alpha1', 'alpha2', 'alpha3']
+    assert dict(streamed) == expected
+
+    # the streamed results are stored
+    assert session.get_results() == expected
+
+
+def test_stop_early(geometry):
+    session = Session(geometry=geometry, cases=get_cases([0.0, 2.0, 4.0]))
+    for name, results in session.iter_results():
+        break
+    assert name == 'alpha0'
+    assert results == Session(geometry=geometry, cases=get_cases([0.0])).get_results()['alpha0']
+
+    # nothing is stored of an incomplete run
+    assert session._results is None
+    session.reset()
+    assert len(session.get_results()) == 3
+
+
+def test_cached(geometry, cache):
+    cases = get_cases([0.0, 2.0])
+    streamed = dict(Session(geometry=geometry, cases=cases, cache=cache).iter_results())
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # the second session streams the cached results, which are those of get_results()
+    session = Session(geometry=geometry, cases=get_cases([0.0, 2.0]), cache=cache)
+    assert [name for name, _ in session.iter_results()] == ['alpha0', 'alpha1']
+    assert cache.hits == 1
+    assert session.get_results() == streamed == Session(geometry=geometry, cases=cases).get_results()
+
+
+def test_after_submit(geometry):
+    session = Session(geometry=geometry, cases=get_cases([0.0, 2.0])).submit()
+    assert dict(session.iter_results()) == session.result()
+
+
+def test_run_keys(geometry):
+    session = Session(geometry=geometry, run_keys="quit\n")
+    with pytest.raises(InputError):
+        list(session.iter_results())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the linearized aerodynamic model against direct AVL cases """
+
+import numpy as np
+import pytest
+
+from avlwrapper import Session, Case, LinearAeroModel
+from avlwrapper.core import InputError
+
+
+def get_totals(geometry, alphas):
+    cases = [Case(name='alpha{0}'.format(idx), alpha=alpha, velocity=12.0) for idx, alpha in enumerate(alphas)]
+    results = Session(geometry=geometry, cases=cases, outputs=['Totals']).get_results()
+    return [results[case.name]['Totals'] for case in cases]
+
+
+@pytest.fixture
+def model(geometry):
+    return LinearAeroModel.from_geometry(geometry, alphas=[0.0, 8.0], velocity=12.0)
+
+
+def test_variables(model):
+    assert model.variables == ['alpha', 'beta', 'pb/2V', 'qc/2V', 'rb/2V', 'elevator']
+    assert model.controls == ['elevator']
+    np.testing.assert_allclose(model.references[:, 0], [0.0, 8.0])
+
+
+def test_matches_direct_cases(geometry, model):
+    # perturbed angles of attack, about the nearest reference point; the lift curve of the stand-in AVL is linear
+    alphas = [-3.0, 1.5, 3.0, 5.0, 11.0]
+    prediction = model.predict(alpha=alphas)
+    totals = get_totals(geometry, alphas)
+    np.testing.assert_allclose(prediction['CL'], [f['CLtot'] for f in totals], atol=1e-4)
+    np.testing.assert_allclose(prediction['Cm'], [f['Cmtot'] for f in totals], atol=1e-4)
+
+
+def test_reference_points(geometry, model):
+    # at a reference point the model returns the AVL totals
+    zero, eight = get_totals(geometry, [0.0, 8.0])
+    prediction = model.predict(alpha=[0.0, 8.0])
+    np.testing.assert_allclose(prediction['CL'], [zero['CLtot'], eight['CLtot']])
+    np.testing.assert_allclose(prediction['Cm'], [zero['Cmtot'], eight['Cmtot']])
+
+
+def test_control_derivative(model):
+    reference = model.predict(alpha=2.0)
+    deflected = model.predict(alpha=2.0, elevator=5.0)
+    derivative = model.derivatives[0, list(model.COEFFICIENTS).index('CL'), model.variables.index('elevator')]
+    assert float(deflected['CL'] - reference['CL']) == pytest.approx(5.0 * derivative)
+
+
+def test_broadcasting(model):
+    prediction = model.predict(alpha=np.linspace(-2.0, 8.0, 6)[:, np.newaxis], elevator=[-1.0, 0.0, 1.0])
+    assert all(values.shape == (6, 3) for values in prediction.values())
+    assert model.predict(alpha=2.0)['CL'].shape == ()
+
+
+def test_invalid(model):
+    with pytest.raises(InputError):
+        model.predict(flaps=1.0)
+    with pytest.raises(InputError):
+        LinearAeroModel.from_results({'cruise': {'Totals': {'CLtot': 0.5}}})
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the eigenmode session and batch against plain sessions """
+
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from avlwrapper import Session, Case, EigenmodeSession, EigenmodeBatch, ResultCache
+from avlwrapper.core import InputError
+
+
+def get_cases(velocities=(12.0, 16.0)):
+    return [Case(name='v{0}'.format(idx), alpha=2.0, velocity=velocity, mass=5.0, X_cg=0.1, Ixx=0.8, Iyy=0.6,
+                 Izz=1.3) for idx, velocity in enumerate(velocities)]
+
+
+@pytest.fixture
+def cache():
+    directory = tempfile.mkdtemp()
+    yield ResultCache(directory)
+    shutil.rmtree(directory)
+
+
+def test_session(geometry):
+    results = EigenmodeSession(geometry=geometry, cases=get_cases()).get_results()
+    expected = Session(geometry=geometry, cases=get_cases(), outputs=['Totals']).get_results()
+
+    assert sorted(results.keys()) == ['v0', 'v1']
+    for name in results:
+        # the totals are those of a plain session, with the eigenvalues of the case added
+        assert results[name]['Totals'] == expected[name]['Totals']
+        eigenvalues = results[name]['Eigenvalues']
+        assert eigenvalues.dtype == complex
+        assert len(eigenvalues) == 8
+        assert list(eigenvalues) == sorted(eigenvalues, key=lambda value: (value.imag, value.real))
+
+    # the modes depend on the state of the case, e.g. the phugoid frequency on the airspeed
+    assert not np.allclose(results['v0']['Eigenvalues'], results['v1']['Eigenvalues'])
+
+
+def test_iter_results(geometry):
+    session = EigenmodeSession(geometry=geometry, cases=get_cases())
+    streamed = list(session.iter_results())
+    assert [name for name, _ in streamed] == ['v0', 'v1']
+    expected = EigenmodeSession(geometry=geometry, cases=get_cases()).get_results()
+    for name, results in streamed:
+        np.testing.assert_array_equal(results['Eigenvalues'], expected[name]['Eigenvalues'])
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_batch_matches_sessions(geometry, processes):
+    configurations = [(geometry, get_cases()), (geometry, get_cases((10.0, 14.0, 18.0)))]
+    batch = EigenmodeBatch(configurations, processes=processes)
+    eigenvalues = batch.get_eigenvalues()
+
+    # padded to the largest number of cases
+    assert eigenvalues.shape == (2, 3, 8)
+    assert np.all(np.isnan(eigenvalues[0, 2]))
+    for idx, (_, cases) in enumerate(configurations):
+        expected = EigenmodeSession(geometry=geometry, cases=cases).get_results()
+        for case_idx, case in enumerate(cases):
+            np.testing.assert_array_equal(eigenvalues[idx, case_idx], expected[case.name]['Eigenvalues'])
+
+    # all modes of the stand-in AVL are damped, missing cases are not stable
+    np.testing.assert_array_equal(batch.is_stable(), [[True, True, False], [True, True, True]])
+
+
+def test_batch_cache(geometry, cache):
+    configurations = [(geometry, get_cases()), (geometry, get_cases((20.0,)))]
+    first = EigenmodeBatch(configurations, cache=cache).get_eigenvalues()
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    second = EigenmodeBatch(configurations, cache=cache).get_eigenvalues()
+    assert (cache.hits, cache.misses) == (2, 2)
+    np.testing.assert_array_equal(second, first)
+
+
+def test_batch_case_limit(geometry):
+    with pytest.raises(InputError):
+        EigenmodeBatch([(geometry, get_cases(range(10, 40)))])
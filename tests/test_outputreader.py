@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the table parsing of the AVL output reader """
+
+import numpy as np
+import pytest
+
+from avlwrapper import Session, Case
+from avlwrapper.core import OutputReader, ParseError
+
+STRIP_HEADER = ("    j     Yle    Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4"
+                "    cm_LE  C.P.x/c\n")
+
+
+def write_output(tmpdir, name, lines):
+    output_file = tmpdir.join(name)
+    output_file.write(''.join(lines))
+    return OutputReader(str(output_file))
+
+
+def get_strip_line(strip, values):
+    return "  {0:3d}".format(strip) + "".join(" {0:8.4f}".format(value) for value in values) + "\n"
+
+
+def test_get_table():
+    lines = [get_strip_line(idx + 1, np.arange(12) + idx) for idx in range(3)]
+    table = OutputReader._get_table(lines)
+    assert table.shape == (3, 12)
+    np.testing.assert_allclose(table, [OutputReader._get_line_values(line)[1:] for line in lines])
+    assert OutputReader._get_table([]).shape == (0, 0)
+
+
+def test_get_table_ragged():
+    # an overflowing field is not a number, the row is padded with NaN
+    lines = [get_strip_line(1, np.arange(12.0)),
+             get_strip_line(2, np.arange(12.0))[:-10] + " ********\n"]
+    table = OutputReader._get_table(lines)
+    assert table.shape == (2, 12)
+    np.testing.assert_allclose(table[0], np.arange(12.0))
+    assert np.isnan(table[1, -1])
+    np.testing.assert_allclose(table[1, :-1], np.arange(11.0))
+
+
+def test_strip_table_without_surface(tmpdir):
+    # every strip table belongs to its own surface header
+    table = [" Strip Forces referred to Strip Area, Chord\n", STRIP_HEADER, get_strip_line(1, np.arange(12.0)), "\n"]
+    reader = write_output(tmpdir, 'output.fs', ["  Surface # 1    Wing\n"] + table + table)
+    with pytest.raises(ParseError):
+        reader.get_content()
+
+
+@pytest.mark.parametrize('output', ['StripForces', 'ElementForces'])
+def test_layouts_match(geometry, output):
+    # the dict-of-lists and the columnar layout hold the same values
+    results = Session(geometry=geometry, cases=[Case(name='cruise', alpha=2.0)],
+                      outputs=[output]).get_results()['cruise'][output]
+    arrays = Session(geometry=geometry, cases=[Case(name='cruise', alpha=2.0)], outputs=[output],
+                     as_arrays=True).get_results()['cruise'][output]
+
+    assert sorted(results.keys()) == sorted(arrays.keys()) == ['HT', 'Wing']
+    for name in results.keys():
+        tables = [(results[name], arrays[name])] if output == 'StripForces' else \
+            [(results[name][strip], arrays[name][strip]) for strip in results[name].keys()]
+        for columns, table in tables:
+            assert len(columns) > 0
+            for key, values in columns.items():
+                assert not np.any(np.isnan(values))
+                np.testing.assert_allclose(np.asarray(table[key]), values)
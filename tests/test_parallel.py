@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the sharding of cases over a process pool against a serial session """
+
+import pytest
+
+from avlwrapper import Session, Case, ParallelSession
+from avlwrapper.core import InputError
+
+
+def get_cases(alphas):
+    return [Case(name='alpha{0}'.format(idx), alpha=alpha, velocity=12.0) for idx, alpha in enumerate(alphas)]
+
+
+def get_serial_results(geometry, cases, outputs):
+    # a plain session is limited to 25 cases
+    results = dict()
+    for idx in range(0, len(cases), Session.MAX_CASES):
+        results.update(Session(geometry=geometry, cases=cases[idx:idx + Session.MAX_CASES],
+                               outputs=outputs).get_results())
+    return results
+
+
+@pytest.mark.parametrize('processes, chunk_size', [(1, None), (2, None), (3, 4)])
+def test_matches_serial(geometry, processes, chunk_size):
+    alphas = [-4.0 + 0.5 * idx for idx in range(10)]
+    session = ParallelSession(geometry=geometry, cases=get_cases(alphas), processes=processes, chunk_size=chunk_size,
+                              outputs=['Totals', 'SurfaceForces'])
+    expected = get_serial_results(geometry, get_cases(alphas), ['Totals', 'SurfaceForces'])
+    assert session.get_results() == expected
+
+
+def test_more_than_max_cases(geometry):
+    alphas = [-10.0 + 0.5 * idx for idx in range(40)]
+    session = ParallelSession(geometry=geometry, cases=get_cases(alphas), processes=2, outputs=['Totals'])
+    assert all(len(chunk) <= Session.MAX_CASES for chunk in session.get_chunks())
+
+    results = session.get_results()
+    assert len(results) == 40
+    assert results == get_serial_results(geometry, get_cases(alphas), ['Totals'])
+
+
+def test_chunks(geometry):
+    session = ParallelSession(geometry=geometry, cases=get_cases(range(10)), processes=4)
+    assert [len(chunk) for chunk in session.get_chunks()] == [3, 3, 3, 1]
+    assert [case.name for chunk in session.get_chunks() for case in chunk] == [case.name for case in session.cases]
+
+    session = ParallelSession(geometry=geometry, cases=get_cases(range(60)), processes=1)
+    assert session.chunk_size == Session.MAX_CASES
+
+
+def test_iter_results_order(geometry):
+    alphas = [0.0, 2.0, 4.0, 6.0, 8.0]
+    session = ParallelSession(geometry=geometry, cases=get_cases(alphas), processes=2, outputs=['Totals'])
+    streamed = list(session.iter_results())
+    assert [name for name, _ in streamed] == ['alpha{0}'.format(idx) for idx in range(len(alphas))]
+    assert dict(streamed) == get_serial_results(geometry, get_cases(alphas), ['Totals'])
+
+
+def test_unique_names(geometry):
+    cases = [Case(name='cruise', alpha=0.0), Case(name='cruise', alpha=2.0)]
+    with pytest.raises(InputError):
+        ParallelSession(geometry=geometry, cases=cases)
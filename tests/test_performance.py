@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the vectorized power curves of Performance against the loops over the airspeeds """
+
+import numpy as np
+import pytest
+
+pytest.importorskip('parapy')
+
+from parapy.core import Input
+from scipy.interpolate import interp1d
+
+from design import Performance
+
+
+class CurvePerformance(Performance):
+    """ Performance of given power curves, without the components which produce them """
+
+    stall_speed = Input(8.0)
+    power_available = Input((200.0, 300.0))
+    eta_curve_bounds = Input((1.0, 30.0))
+    propeller_eta_curve = Input(interp1d([1.0, 10.0, 20.0, 30.0], [0.3, 0.7, 0.75, 0.6], kind='cubic'))
+    power_required = Input(None)
+    cg_valid = Input(True)
+
+
+def get_power_required(speed_range, parasite, induced):
+    """ Power required of a parabolic drag polar: a parasite term growing with V^3 and an induced term with 1/V """
+    return parasite * speed_range ** 3 + induced / speed_range
+
+
+def get_velocities(performance):
+    """ The optimum velocities evaluated with a loop over the airspeeds """
+    speeds = list(performance.speed_range)
+    power_required = list(performance.power_required)
+    eta_values = [float(performance.propeller_eta_curve(float(speed))) for speed in performance.prop_speed_range]
+    available_cont = [performance.power_available[0] * eta for eta in eta_values]
+    available_burst = [performance.power_available[1] * eta for eta in eta_values]
+
+    diff = [available_cont[i] - power_required[i] for i in range(len(speeds))]
+    endurance = speeds[diff.index(max(diff))]
+
+    diff = []
+    for i in range(len(speeds) - 1):
+        tangent = power_required[i + 1] / speeds[i + 1]
+        local_tangent = (power_required[i + 1] - power_required[i]) / (speeds[i + 1] - speeds[i])
+        diff.append(abs(tangent - local_tangent))
+    cruise = speeds[diff.index(min(diff))]
+
+    diff = [abs(available_burst[i] - power_required[i]) for i in range(len(speeds))]
+    maximum = speeds[diff.index(min(diff))]
+
+    safe_speed = performance.stall_buffer * performance.stall_speed
+    return eta_values, max(endurance, safe_speed), max(cruise, safe_speed), maximum
+
+
+@pytest.mark.parametrize('parasite, induced, stall_speed', [(0.005, 200.0, 8.0), (0.01, 500.0, 8.0),
+                                                            (0.002, 50.0, 8.0), (0.02, 2000.0, 8.0),
+                                                            (0.005, 200.0, 10.0)])
+def test_velocities(parasite, induced, stall_speed):
+    speed_range = np.linspace(0.1, 30.0, 100)
+    performance = CurvePerformance(power_required=get_power_required(speed_range, parasite, induced),
+                                   stall_speed=stall_speed)
+    eta_values, endurance, cruise, maximum = get_velocities(performance)
+
+    np.testing.assert_allclose(performance.eta_values, eta_values)
+    np.testing.assert_allclose(performance.power_available_cont, performance.power_available[0] * np.array(eta_values))
+    np.testing.assert_allclose(performance.power_available_burst, performance.power_available[1] * np.array(eta_values))
+    assert performance.endurance_velocity == pytest.approx(endurance)
+    assert performance.cruise_velocity == pytest.approx(cruise)
+    assert performance.maximum_velocity == pytest.approx(maximum)
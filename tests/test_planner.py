@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the adaptive angle of attack planner """
+
+from math import radians
+
+import numpy as np
+import pytest
+
+from avlwrapper import Session, Case, VortexLatticeSession, AdaptiveAlphaSession
+
+
+def get_lifts(results):
+    return [results['alpha{0}'.format(idx)]['Totals']['CLtot'] for idx in range(len(results))]
+
+
+def get_coefficients(results, target_cl):
+    """ The lift curve slope and moment at the target lift coefficient, as estimated by Wing.lift_coef_vs_alpha and
+    Wing.moment_coef_control: the slope between the end points and the moment of the case nearest to the target """
+    totals = sorted([case_results['Totals'] for case_results in results.values()], key=lambda f: f['Alpha'])
+    cl_alpha = (totals[-1]['CLtot'] - totals[0]['CLtot']) / radians(totals[-1]['Alpha'] - totals[0]['Alpha'])
+    nearest = min(totals, key=lambda f: abs(f['CLtot'] - target_cl))
+    return cl_alpha, nearest['Cmtot']
+
+
+@pytest.mark.parametrize('session_class', [Session, VortexLatticeSession])
+def test_target_lift(geometry, session_class):
+    session = AdaptiveAlphaSession(geometry=geometry, target_cl=0.6, session_class=session_class, velocity=12.0)
+    results = session.get_results()
+
+    lifts = get_lifts(results)
+    assert min(abs(lift - 0.6) for lift in lifts) <= session.cl_tolerance
+    assert session.alphas == sorted(session.alphas)
+    assert lifts == sorted(lifts)
+    # the lift curves are linear: the range, its middle and the secant estimate of the target
+    assert len(session.alphas) == 4
+    assert session.rounds == 2
+
+
+def test_totals_only(geometry):
+    results = AdaptiveAlphaSession(geometry=geometry, alpha_range=(-5.0, 5.0)).get_results()
+    assert len(results) == 3
+    assert all(list(case_results.keys()) == ['Totals'] for case_results in results.values())
+
+
+def test_target_out_of_range(geometry):
+    # the target is not reached within the range, planning stops at its end
+    session = AdaptiveAlphaSession(geometry=geometry, target_cl=5.0, alpha_range=(-5.0, 5.0))
+    lifts = get_lifts(session.get_results())
+    assert max(session.alphas) == 5.0
+    assert max(lifts) < 5.0
+    assert len(lifts) <= session.max_cases
+
+
+@pytest.mark.parametrize('session_class', [Session, VortexLatticeSession])
+def test_matches_full_sweep(geometry, session_class):
+    # the 25-case sweep of Wing.alpha_cases
+    states = {'velocity': 12.0, 'X_cg': 0.1}
+    cases = [Case(name='alpha{0}'.format(idx), alpha=alpha, **states)
+             for idx, alpha in enumerate(np.linspace(-10, 20, 25))]
+    if session_class is Session:
+        full = Session(geometry=geometry, cases=cases, outputs=['Totals']).get_results()
+    else:
+        full = VortexLatticeSession(geometry=geometry, cases=cases).get_results()
+    planned = AdaptiveAlphaSession(geometry=geometry, target_cl=0.6, session_class=session_class,
+                                   **states).get_results()
+
+    cl_alpha, cm = get_coefficients(planned, 0.6)
+    full_cl_alpha, full_cm = get_coefficients(full, 0.6)
+    assert cl_alpha == pytest.approx(full_cl_alpha, rel=0.01)
+    # the full sweep has a case within half a step (1.25 deg) of the target, the planner within cl_tolerance
+    cm_slope = (full['alpha24']['Totals']['Cmtot'] - full['alpha0']['Totals']['Cmtot']) / 30.0
+    assert cm == pytest.approx(full_cm, abs=abs(cm_slope) * 1.25 + 1e-6)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the columnar strip and element force containers """
+
+import numpy as np
+import pytest
+
+from avlwrapper import Session, Case, ElementForces, ElementTable, ForceTable, StripForces
+
+
+@pytest.fixture
+def forces(geometry):
+    return Session(geometry=geometry, cases=[Case(name='cruise', alpha=2.0)], outputs=['StripForces', 'ElementForces'],
+                   as_arrays=True).get_results()['cruise']
+
+
+def test_force_table():
+    table = ForceTable.from_rows(['j', 'cl'], np.array([[1.0, 0.5], [2.0, 0.4], [3.0, 0.2]]))
+    assert len(table) == 3
+    assert table.keys() == ['j', 'cl']
+    np.testing.assert_allclose(table['cl'], [0.5, 0.4, 0.2])
+    assert table[1] == {'j': 2.0, 'cl': 0.4}
+    assert table.as_dict() == {'j': [1.0, 2.0, 3.0], 'cl': [0.5, 0.4, 0.2]}
+
+    # slices are views on the columns
+    rows = table[1:]
+    np.testing.assert_allclose(rows['cl'], [0.4, 0.2])
+    assert np.shares_memory(rows['cl'], table['cl'])
+    assert len(ForceTable.from_rows(['j', 'cl'], np.zeros((0, 0)))) == 0
+
+
+def test_element_table():
+    strips = [(4, np.array([[1.0, 0.1], [2.0, 0.2]])), (5, np.array([[3.0, 0.3]]))]
+    table = ElementTable.from_strips(['I', 'dCp'], strips)
+    assert table.keys() == [4, 5]
+    assert 5 in table and 6 not in table
+    np.testing.assert_allclose(table[4]['dCp'], [0.1, 0.2])
+    np.testing.assert_allclose(table[5]['I'], [3.0])
+    assert table.as_dict() == {4: {'I': [1.0, 2.0], 'dCp': [0.1, 0.2]}, 5: {'I': [3.0], 'dCp': [0.3]}}
+
+
+def test_strip_forces_round_trip(forces, tmpdir):
+    strips = forces['StripForces']
+    assert isinstance(strips, StripForces)
+
+    file_path = str(tmpdir.join('strips.npz'))
+    strips.save(file_path)
+    loaded = StripForces.load(file_path)
+    assert sorted(loaded.keys()) == sorted(strips.keys())
+    for name in strips:
+        assert loaded[name].columns == strips[name].columns
+        np.testing.assert_array_equal(loaded[name].values, strips[name].values)
+    assert loaded.as_dict() == strips.as_dict()
+
+
+def test_element_forces_round_trip(forces, tmpdir):
+    elements = forces['ElementForces']
+    assert isinstance(elements, ElementForces)
+
+    file_path = str(tmpdir.join('elements.npz'))
+    elements.save(file_path)
+    loaded = ElementForces.load(file_path)
+    assert sorted(loaded.keys()) == sorted(elements.keys())
+    for name in elements:
+        assert loaded[name].keys() == elements[name].keys()
+        np.testing.assert_array_equal(loaded[name].table.values, elements[name].table.values)
+        np.testing.assert_array_equal(loaded[name].offsets, elements[name].offsets)
+    assert loaded.as_dict() == elements.as_dict()
+
+
+def test_matches_dict_layout(geometry, forces):
+    # the containers hold the values of the dict-of-lists layout of a plain session
+    results = Session(geometry=geometry, cases=[Case(name='cruise', alpha=2.0)],
+                      outputs=['StripForces', 'ElementForces']).get_results()['cruise']
+    for output in ('StripForces', 'ElementForces'):
+        expected = results[output]
+        arrays = forces[output].as_dict()
+        assert sorted(arrays.keys()) == sorted(expected.keys())
+        for name in expected:
+            tables = [(expected[name], arrays[name])] if output == 'StripForces' else \
+                [(expected[name][strip], arrays[name][strip]) for strip in expected[name]]
+            for columns, table in tables:
+                for key, values in columns.items():
+                    np.testing.assert_allclose(table[key], values)
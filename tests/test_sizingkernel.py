@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the geometry-free sizing kernel against the ParaPy chain of the parameter generator """
+
+import numpy as np
+import pytest
+
+pytest.importorskip('parapy')
+
+from design import ParameterGenerator, sizing_kernel
+
+#: Requirement sets (performance goal, goal value, weight target, target value, hand launch)
+REQUIREMENTS = [('endurance', 1.0, 'payload', 0.25, True),
+                ('range', 100.0, 'payload', 1.0, False),
+                ('endurance', 2.0, 'mtow', 5.0, False),
+                ('range', 50.0, 'mtow', 3.0, True)]
+
+
+def get_chain(performance_goal, goal_value, weight_target, target_value, handlaunch):
+    params = ParameterGenerator(performance_goal=performance_goal, goal_value=goal_value, weight_target=weight_target,
+                                target_value=target_value, handlaunch=handlaunch)
+    return {'weight_mtow': params.weight_mtow,
+            'weight_payload': params.weight_payload,
+            'lift_coefficient': params.lift_coef_max,
+            'aspect_ratio': params.aspect_ratio,
+            'wing_loading': params.wing_loading,
+            'power_loading': params.power_loading,
+            'stall_speed': params.stall_speed,
+            'design_speed': params.design_speed,
+            'motor_power': params.motor_power,
+            'battery_capacity': params.wingpowerloading.battery_capacity}
+
+
+def test_chain():
+    sizing = sizing_kernel(*[list(column) for column in zip(*REQUIREMENTS)])
+    for idx, requirements in enumerate(REQUIREMENTS):
+        for key, value in get_chain(*requirements).items():
+            assert sizing[key][idx] == pytest.approx(value, rel=1e-9), key
+
+
+def test_broadcast():
+    # scalar requirements broadcast against arrays
+    sizing = sizing_kernel('endurance', [1.0, 2.0, 3.0], 'payload', 0.25, True)
+    assert sizing['battery_capacity'].shape == (3,)
+    assert np.all(np.diff(sizing['battery_capacity']) > 0)
+    np.testing.assert_allclose(sizing['weight_mtow'], 4.7551 * 0.25 + 0.59962)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the non-blocking submit()/result() API of the AVL session """
+
+import threading
+
+import pytest
+
+from avlwrapper import Session, Case
+from avlwrapper.core import InputError, ResultTimeoutError
+
+
+def get_cases():
+    return [Case(name='cruise', alpha=2.0, velocity=12.0), Case(name='climb', alpha=6.0, velocity=10.0)]
+
+
+def test_matches_get_results(geometry):
+    expected = Session(geometry=geometry, cases=get_cases()).get_results()
+
+    session = Session(geometry=geometry, cases=get_cases())
+    assert session.submit() is session
+    assert session.result() == expected
+    assert session.done()
+    # get_results() of a submitted session waits for the same results
+    assert session.get_results() is session.result()
+
+
+def test_result_submits(geometry):
+    expected = Session(geometry=geometry, cases=get_cases()).get_results()
+    session = Session(geometry=geometry, cases=get_cases())
+    assert not session.done()
+    assert session.result(timeout=30.0) == expected
+
+
+def test_concurrent_sessions(geometry):
+    alphas = [0.0, 2.0, 4.0, 6.0]
+    sessions = [Session(geometry=geometry, cases=[Case(name='alpha', alpha=alpha)]).submit() for alpha in alphas]
+    for alpha, session in zip(alphas, sessions):
+        expected = Session(geometry=geometry, cases=[Case(name='alpha', alpha=alpha)]).get_results()
+        assert session.result() == expected
+
+
+def test_timeout(geometry, monkeypatch):
+    # an analysis which only finishes once it is released
+    release = threading.Event()
+    session = Session(geometry=geometry, cases=get_cases())
+    monkeypatch.setattr(session, '_get_results', lambda: release.wait(10.0) and {'released': True})
+
+    session.submit()
+    with pytest.raises(ResultTimeoutError):
+        session.result(timeout=0.05)
+    assert not session.done()
+
+    release.set()
+    assert session.result(timeout=10.0) == {'released': True}
+
+
+def test_error_raised_by_result(geometry):
+    # more cases than AVL supports, the error of the background analysis is raised by result()
+    session = Session(geometry=geometry, cases=[Case(name='case{0}'.format(idx)) for idx in range(30)])
+    session.submit()
+    with pytest.raises(InputError):
+        session.result()
+
+    # a reset session can be run again
+    session.reset()
+    session.cases = get_cases()
+    assert session.result() == Session(geometry=geometry, cases=get_cases()).get_results()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the interpolation of the trim table. The trim cases need the constraints of a real AVL (the fakeavl.py
+stand-in does not trim), thus the AVL tables are replaced by known tables which are bilinear in C.G. location and
+required lift coefficient, which the interpolation should reproduce exactly.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('parapy')
+
+from parapy.core import Input, Attribute
+
+from design import TrimTable
+
+
+def get_alpha(x_cg, lift_coefficient):
+    return 1.0 + 9.0 * lift_coefficient + 4.0 * x_cg * lift_coefficient
+
+
+def get_elevator(x_cg, lift_coefficient):
+    return -3.0 + 20.0 * x_cg - 4.0 * lift_coefficient + 30.0 * x_cg * lift_coefficient
+
+
+class BilinearTrimTable(TrimTable):
+    """ Trim table of which the AVL tables follow from get_alpha and get_elevator """
+
+    x_cg_values = Input(np.array([0.05, 0.1, 0.15]))
+    speeds = Input(np.array([10.0, 14.0, 18.0, 22.0]))
+
+    @Attribute
+    def alpha_table(self):
+        return get_alpha(self.x_cg_values[:, np.newaxis], self.required_lift_coefficients[np.newaxis, :])
+
+    @Attribute
+    def elevator_table(self):
+        return get_elevator(self.x_cg_values[:, np.newaxis], self.required_lift_coefficients[np.newaxis, :])
+
+
+def get_lift_coefficient(table, speed):
+    return (2 * 9.81 * table.weight_mtow) / (table.wing_in.rho * np.asarray(speed) ** 2 * table.wing_in.s_req)
+
+
+def test_trim_cases():
+    table = BilinearTrimTable()
+    cases = table.trim_cases
+    assert len(cases) == 12
+    assert cases.constraints == {'alpha': 'CL', 'elevator': 'Cm'}
+    # the airspeed varies fastest
+    np.testing.assert_allclose(cases['X_cg'], np.repeat(table.x_cg_values, 4))
+    np.testing.assert_allclose(cases['velocity'], np.tile(table.speeds, 3))
+    np.testing.assert_allclose(cases['alpha'], get_lift_coefficient(table, cases['velocity']))
+
+
+def test_trim():
+    table = BilinearTrimTable()
+    x_cg = np.array([0.06, 0.12, 0.149])
+    speed = np.array([11.0, 15.5, 21.0])
+    alpha, elevator = table.trim(x_cg[:, np.newaxis], speed[np.newaxis, :])
+
+    lift_coefficient = get_lift_coefficient(table, speed)[np.newaxis, :]
+    assert alpha.shape == elevator.shape == (3, 3)
+    np.testing.assert_allclose(alpha, get_alpha(x_cg[:, np.newaxis], lift_coefficient))
+    np.testing.assert_allclose(elevator, get_elevator(x_cg[:, np.newaxis], lift_coefficient))
+
+    # scalar queries, and linear extrapolation outside of the grid
+    alpha, elevator = table.trim(0.2, 25.0)
+    assert float(alpha) == pytest.approx(get_alpha(0.2, get_lift_coefficient(table, 25.0)))
+    assert float(elevator) == pytest.approx(get_elevator(0.2, get_lift_coefficient(table, 25.0)))
+
+
+def test_dense_table():
+    table = BilinearTrimTable(dense_resolution=7)
+    dense = table.dense_table
+    assert dense['alpha'].shape == dense['elevator'].shape == (7, 7)
+    assert dense['x_cg'][[0, -1]].tolist() == [0.05, 0.15]
+    assert dense['speed'][[0, -1]].tolist() == [10.0, 22.0]
+    np.testing.assert_allclose(dense['alpha'][[0, -1]][:, [0, -1]], table.alpha_table[[0, -1]][:, [0, -1]])
+
+
+@pytest.mark.parametrize('slot', ['n_cg', 'n_speed'])
+def test_grid_size_validated(slot):
+    table = TrimTable()
+    setattr(table, slot, 2)
+    with pytest.raises(ValueError):
+        setattr(table, slot, 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the native vortex-lattice solver against known planforms """
+
+from math import pi, sqrt, radians
+
+import numpy as np
+import pytest
+
+from avlwrapper import Geometry, Surface, Section, NacaAirfoil, Point, Spacing, Case, VortexLatticeSession
+from avlwrapper.core import InputError
+from avlwrapper.vlm import get_spacing
+
+
+def get_rectangular_wing(aspect_ratio, naca='0012'):
+    semi_span = aspect_ratio / 2.0
+    wing = Surface(name='Wing', n_chordwise=8, chord_spacing=Spacing.cosine, n_spanwise=24,
+                   span_spacing=Spacing.cosine, y_duplicate=0.0,
+                   sections=[Section(leading_edge_point=Point(0, 0, 0), chord=1.0, airfoil=NacaAirfoil(naca=naca)),
+                             Section(leading_edge_point=Point(0, semi_span, 0), chord=1.0,
+                                     airfoil=NacaAirfoil(naca=naca))])
+    return Geometry(name='Rectangular wing', reference_area=aspect_ratio, reference_chord=1.0,
+                    reference_span=aspect_ratio, reference_point=Point(0.25, 0, 0), surfaces=[wing])
+
+
+def get_totals(geometry, alphas):
+    cases = [Case(name='alpha{0}'.format(idx), alpha=alpha) for idx, alpha in enumerate(alphas)]
+    results = VortexLatticeSession(geometry=geometry, cases=cases).get_results()
+    return [results[case.name]['Totals'] for case in cases]
+
+
+def get_lift_slope(aspect_ratio):
+    zero, two = get_totals(get_rectangular_wing(aspect_ratio), [0.0, 2.0])
+    assert abs(zero['CLtot']) < 1e-9
+    return (two['CLtot'] - zero['CLtot']) / radians(2.0)
+
+
+def test_slender_wing():
+    # slender wing theory is exact in the limit of a vanishing aspect ratio
+    assert get_lift_slope(0.25) == pytest.approx(pi * 0.25 / 2, rel=0.03)
+
+
+@pytest.mark.parametrize('aspect_ratio', [4.0, 6.0, 10.0])
+def test_lift_slope(aspect_ratio):
+    # the Helmbold equation (lifting-line based) lies a few percent above lifting-surface theory
+    helmbold = 2 * pi * aspect_ratio / (2 + sqrt(aspect_ratio ** 2 + 4))
+    assert get_lift_slope(aspect_ratio) == pytest.approx(0.95 * helmbold, rel=0.03)
+
+
+def test_induced_drag():
+    # a rectangular wing has an Oswald factor close to one
+    totals, = get_totals(get_rectangular_wing(6.0), [5.0])
+    oswald = totals['CLtot'] ** 2 / (pi * 6.0 * totals['CDind'])
+    assert oswald == pytest.approx(1.0, abs=0.03)
+
+
+def test_camber():
+    # a cambered wing has a negative zero-lift angle, close to -2 degrees for the NACA 2412
+    zero, five = get_totals(get_rectangular_wing(6.0, naca='2412'), [0.0, 5.0])
+    zero_lift_angle = -5.0 * zero['CLtot'] / (five['CLtot'] - zero['CLtot'])
+    assert zero_lift_angle == pytest.approx(-2.1, abs=0.3)
+
+
+def test_spacing():
+    t = np.linspace(0.0, 1.0, 11)
+    cosine = 0.5 * (1.0 - np.cos(pi * t))
+    sine = 1.0 - np.cos(0.5 * pi * t)
+    neg_sine = np.sin(0.5 * pi * t)
+    np.testing.assert_allclose(get_spacing(10, Spacing.equal.value), t)
+    np.testing.assert_allclose(get_spacing(10, Spacing.cosine.value), cosine)
+    np.testing.assert_allclose(get_spacing(10, Spacing.sine.value), sine)
+    np.testing.assert_allclose(get_spacing(10, Spacing.neg_sine.value), neg_sine)
+    np.testing.assert_allclose(get_spacing(10, 3.0), t)
+    np.testing.assert_allclose(get_spacing(10, -1.0), cosine)
+
+    # fractional parameters blend the neighbouring distributions, as in AVL
+    np.testing.assert_allclose(get_spacing(10, 0.5), 0.5 * (t + cosine))
+    np.testing.assert_allclose(get_spacing(10, 1.5), 0.5 * (cosine + sine))
+    np.testing.assert_allclose(get_spacing(10, -2.8), 0.8 * t + 0.2 * neg_sine)
+    with pytest.raises(InputError):
+        get_spacing(10, 3.5)
+
+
+def test_show_geometry(monkeypatch):
+    matplotlib = pytest.importorskip('matplotlib')
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    monkeypatch.setattr(plt, 'show', lambda: None)
+
+    session = VortexLatticeSession(geometry=get_rectangular_wing(6.0), cases=[Case(name='cruise')])
+    figure = session.show_geometry()
+    # one line per horseshoe vortex, and the control points
+    assert len(figure.axes[0].lines) == len(session.lattice.a) + 1
+    plt.close(figure)
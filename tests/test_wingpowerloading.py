@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the vectorized loading diagram against the scalar loops of the power loading equations """
+
+from math import sqrt, pi
+
+import numpy as np
+import pytest
+
+pytest.importorskip('parapy')
+
+from design.wingpowerloading import power_loading_grid
+
+WING_LOADINGS = np.arange(1.0, 300.0, 7.0)
+LIFT_COEFFICIENTS = [1.0, 1.25, 1.5]
+ASPECT_RATIOS = [10.0, 12.0]
+
+
+def get_power_loadings(wing_loadings, lift_coefficients, aspect_ratios, eta_prop=0.7, rho=1.225, rho_cr=0.9091,
+                       zero_lift_drag=0.02, e_factor=0.8, climb_rate=1.524, climb_gradient=0.507):
+    """ The power loadings of one diagram, evaluated point by point """
+    wp_cr = [[eta_prop / (climb_rate + sqrt(ws * (2.0 / rho_cr) * (sqrt(zero_lift_drag) /
+                                                                   (1.81 * ((ar * e_factor) ** (3.0 / 2.0))))))
+              for ws in wing_loadings] for ar in aspect_ratios]
+    wp_cg = [[[eta_prop / (sqrt(ws * (2.0 / rho) * (1 / (cl_max - 0.2))) * climb_gradient +
+                           (zero_lift_drag + cl_max ** 2 / (pi * ar * e_factor)) / (cl_max - 0.2))
+               for ws in wing_loadings] for ar in aspect_ratios] for cl_max in lift_coefficients]
+    return wp_cr, wp_cg
+
+
+def test_grid():
+    grid = power_loading_grid(WING_LOADINGS, LIFT_COEFFICIENTS, ASPECT_RATIOS)
+    wp_cr, wp_cg = get_power_loadings(WING_LOADINGS, LIFT_COEFFICIENTS, ASPECT_RATIOS)
+
+    shape = (len(LIFT_COEFFICIENTS), len(ASPECT_RATIOS), len(WING_LOADINGS))
+    assert grid['climb_rate'].shape == grid['climb_gradient'].shape == shape
+    for i in range(len(LIFT_COEFFICIENTS)):  # the climb rate requirement does not depend on C_Lmax
+        np.testing.assert_allclose(grid['climb_rate'][i], wp_cr, rtol=1e-12)
+    np.testing.assert_allclose(grid['climb_gradient'], wp_cg, rtol=1e-12)
+
+
+def test_batch():
+    # one diagram per requirement set, with batch parameters of shape batch + (1, 1, 1)
+    aspect_ratios = np.array([[10.0, 12.0], [12.0, 20.0]])
+    eta_prop = np.array([0.6, 0.8])
+    grid = power_loading_grid(np.tile(WING_LOADINGS, (2, 1)), np.tile(LIFT_COEFFICIENTS, (2, 1)), aspect_ratios,
+                              eta_prop=eta_prop[:, np.newaxis, np.newaxis, np.newaxis])
+
+    for idx in range(2):
+        wp_cr, wp_cg = get_power_loadings(WING_LOADINGS, LIFT_COEFFICIENTS, aspect_ratios[idx],
+                                          eta_prop=eta_prop[idx])
+        np.testing.assert_allclose(grid['climb_rate'][idx, 0], wp_cr, rtol=1e-12)
+        np.testing.assert_allclose(grid['climb_gradient'][idx], wp_cg, rtol=1e-12)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the persistent AVL worker backend against sessions which start a fresh AVL process """
+
+import gc
+import weakref
+
+import pytest
+
+from avlwrapper import Session, Case, Worker
+from avlwrapper.core import InputError
+
+
+def get_cases(alphas):
+    return [Case(name='alpha{0}'.format(idx), alpha=alpha, velocity=12.0) for idx, alpha in enumerate(alphas)]
+
+
+@pytest.fixture
+def worker():
+    worker = Worker(timeout=30.0)
+    yield worker
+    worker.close()
+
+
+def test_matches_fresh_process(geometry, worker):
+    cases = get_cases([-2.0, 0.0, 4.0])
+    expected = Session(geometry=geometry, cases=cases, outputs=['Totals', 'StripForces']).get_results()
+    results = Session(geometry=geometry, cases=get_cases([-2.0, 0.0, 4.0]), outputs=['Totals', 'StripForces'],
+                      worker=worker).get_results()
+    assert results == expected
+    assert worker.is_alive
+
+
+def test_reused_for_new_cases_and_geometry(geometry, worker):
+    Session(geometry=geometry, cases=get_cases([0.0]), worker=worker).get_results()
+    process = worker._process
+
+    # new cases are run by the same process
+    results = Session(geometry=geometry, cases=get_cases([1.0, 3.0]), worker=worker).get_results()
+    expected = Session(geometry=geometry, cases=get_cases([1.0, 3.0])).get_results()
+    assert results == expected
+    assert worker._process is process
+
+    # a changed geometry is loaded again
+    previous = results['alpha0']['Totals']['CLtot']
+    geometry.area = 0.8
+    results = Session(geometry=geometry, cases=get_cases([1.0]), worker=worker).get_results()
+    expected = Session(geometry=geometry, cases=get_cases([1.0])).get_results()
+    assert results == expected
+    assert results['alpha0']['Totals']['CLtot'] != previous
+    assert worker._process is process
+
+
+def test_restarts_after_close(geometry, worker):
+    Session(geometry=geometry, cases=get_cases([0.0]), worker=worker).get_results()
+    worker.close()
+    assert not worker.is_alive
+
+    results = Session(geometry=geometry, cases=get_cases([2.0]), worker=worker).get_results()
+    assert results == Session(geometry=geometry, cases=get_cases([2.0])).get_results()
+
+
+def test_run_keys_rejected(geometry, worker):
+    with pytest.raises(InputError):
+        Session(geometry=geometry, run_keys="quit\n", worker=worker)
+
+
+def test_closed_worker_collected(geometry):
+    worker = Worker()
+    Session(geometry=geometry, cases=get_cases([0.0]), worker=worker).get_results()
+    worker.close()
+
+    reference = weakref.ref(worker)
+    del worker
+    gc.collect()
+    assert reference() is None
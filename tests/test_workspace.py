@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tests of the pool of reusable scratch directories of the AVL wrapper """
+
+import os
+
+import pytest
+
+from avlwrapper import Session, Case, WorkspacePool
+from avlwrapper import workspace
+
+
+@pytest.fixture
+def pool(tmpdir):
+    pool = WorkspacePool(root=str(tmpdir), max_idle=2)
+    yield pool
+    pool.close()
+
+
+def test_released_directory_reused_empty(pool):
+    first = pool.acquire()
+    with open(os.path.join(first.name, 'wing.avl'), 'w') as avl_file:
+        avl_file.write('Wing\n')
+    os.mkdir(os.path.join(first.name, 'airfoils'))
+    first.cleanup()
+    first.cleanup()  # a second cleanup does not release the directory twice
+
+    second = pool.acquire()
+    assert second.name == first.name
+    assert os.listdir(second.name) == []
+    assert pool.acquire().name != second.name
+
+
+def test_idle_directories_bounded(pool):
+    workspaces = [pool.acquire() for _ in range(4)]
+    for scratch in workspaces:
+        scratch.cleanup()
+    assert len(pool._idle) == 2
+    assert sorted(os.listdir(pool.root)) == sorted(os.path.basename(name) for name in pool._idle)
+
+
+def test_close_removes_directories(pool):
+    names = [pool.acquire().name for _ in range(3)]
+    pool.close()
+    assert not any(os.path.exists(name) for name in names)
+
+
+def test_stale_directories_removed(tmpdir):
+    # a directory of a process which no longer exists, and one of this process
+    stale = tmpdir.mkdir('avl_999999999_stale')
+    alive = tmpdir.mkdir('avl_{0}_alive'.format(os.getpid()))
+    pool = WorkspacePool(root=str(tmpdir))
+    if os.name == 'posix':
+        assert not stale.check()
+    assert alive.check()
+    pool.close()
+
+
+def test_link_file(tmpdir):
+    source = tmpdir.join('naca2412.dat')
+    source.write('NACA 2412\n')
+    target = tmpdir.mkdir('target')
+    destination = workspace.link_file(str(source), str(target))
+    assert open(destination).read() == 'NACA 2412\n'
+
+    # an existing file is replaced
+    assert workspace.link_file(str(source), str(target)) == destination
+
+
+def test_results_match_default_pool(geometry, tmpdir, monkeypatch):
+    cases = [Case(name='cruise', alpha=2.0, velocity=12.0), Case(name='climb', alpha=6.0, velocity=10.0)]
+    expected = Session(geometry=geometry, cases=cases, outputs=['Totals', 'StripForces']).get_results()
+
+    pool = WorkspacePool(root=str(tmpdir))
+    monkeypatch.setattr(workspace, '_DEFAULT_POOL', pool)
+    session = Session(geometry=geometry, cases=cases, outputs=['Totals', 'StripForces'])
+    assert session.get_results() == expected
+    assert os.path.dirname(session.temp_dir.name) == str(tmpdir)
+
+    # the directory is handed back and reused by the next session
+    name = session.temp_dir.name
+    session.reset()
+    other = Session(geometry=geometry, cases=cases, outputs=['Totals', 'StripForces'])
+    assert other.get_results() == expected
+    assert other.temp_dir.name == name
+    other.reset()
+    pool.close()